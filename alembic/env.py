@@ -3,6 +3,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
+from app.core.config import settings
 from app.models.database import Base
 from app.models import market_data  
 
@@ -17,6 +18,9 @@ from alembic import context
 # access to the values within the .ini file in use.
 config = context.config
 
+# Use the same database as the application
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -0,0 +1,37 @@
+"""Add price_bars
+
+Revision ID: 44a7f7a762ff
+Revises: afbd29af16c6
+Create Date: 2026-10-19 12:41:09.254817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44a7f7a762ff'
+down_revision: Union[str, None] = 'afbd29af16c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('price_bars',
+    sa.Column('symbol', sa.String(length=10), nullable=False),
+    sa.Column('interval', sa.String(length=10), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('open', sa.Float(), nullable=False),
+    sa.Column('high', sa.Float(), nullable=False),
+    sa.Column('low', sa.Float(), nullable=False),
+    sa.Column('close', sa.Float(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=True),
+    sa.Column('provider', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('symbol', 'interval', 'timestamp')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('price_bars')
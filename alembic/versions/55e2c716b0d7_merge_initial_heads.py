@@ -0,0 +1,26 @@
+"""Merge initial schema heads
+
+Revision ID: 55e2c716b0d7
+Revises: 48d9d682e1e3, eb1b17a7767f
+Create Date: 2026-10-19 09:12:04.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '55e2c716b0d7'
+down_revision: Union[str, None] = ('48d9d682e1e3', 'eb1b17a7767f')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
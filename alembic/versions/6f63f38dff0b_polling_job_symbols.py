@@ -0,0 +1,71 @@
+"""Move polling job symbols into polling_job_symbols with shards
+
+Revision ID: 6f63f38dff0b
+Revises: e7b5201f9a90
+Create Date: 2026-10-19 16:18:05.402771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f63f38dff0b'
+down_revision: Union[str, None] = 'e7b5201f9a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('polling_job_symbols',
+    sa.Column('job_id', sa.UUID(), nullable=False),
+    sa.Column('symbol_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('last_polled_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['polling_jobs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['symbol_id'], ['symbols.id'], ),
+    sa.PrimaryKeyConstraint('job_id', 'symbol_id')
+    )
+    op.create_index('idx_polling_job_symbols_shard', 'polling_job_symbols', ['job_id', 'shard'], unique=False)
+
+    # Existing jobs hold at most 10 symbols, so each fits in a single shard
+    op.add_column('polling_jobs', sa.Column('shard_size', sa.Integer(), nullable=True))
+    op.execute("UPDATE polling_jobs SET shard_size = 50")
+    op.alter_column('polling_jobs', 'shard_size', nullable=False)
+    op.execute(
+        """
+        INSERT INTO symbols (ticker)
+        SELECT DISTINCT upper(s.ticker)
+        FROM polling_jobs j, json_array_elements_text(CAST(j.symbols AS json)) AS s(ticker)
+        ON CONFLICT (ticker) DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO polling_job_symbols (job_id, symbol_id, shard)
+        SELECT DISTINCT j.id, sy.id, 0
+        FROM polling_jobs j, json_array_elements_text(CAST(j.symbols AS json)) AS s(ticker)
+        JOIN symbols sy ON sy.ticker = upper(s.ticker)
+        """
+    )
+    op.drop_column('polling_jobs', 'symbols')
+
+
+def downgrade() -> None:
+    op.add_column('polling_jobs', sa.Column('symbols', sa.Text(), nullable=True))
+    op.execute(
+        """
+        UPDATE polling_jobs j SET symbols = COALESCE((
+            SELECT json_agg(sy.ticker ORDER BY sy.ticker)::text
+            FROM polling_job_symbols p JOIN symbols sy ON sy.id = p.symbol_id
+            WHERE p.job_id = j.id
+        ), '[]')
+        """
+    )
+    op.alter_column('polling_jobs', 'symbols', nullable=False)
+    op.drop_column('polling_jobs', 'shard_size')
+    op.drop_index('idx_polling_job_symbols_shard', table_name='polling_job_symbols')
+    op.drop_table('polling_job_symbols')
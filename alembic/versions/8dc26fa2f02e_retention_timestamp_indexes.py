@@ -0,0 +1,29 @@
+"""Add timestamp indexes used by the retention compactor
+
+Revision ID: 8dc26fa2f02e
+Revises: 6f63f38dff0b
+Create Date: 2026-10-19 17:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8dc26fa2f02e'
+down_revision: Union[str, None] = '6f63f38dff0b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_price_timestamp', 'price_points', ['timestamp'], unique=False)
+    op.create_index('idx_raw_timestamp', 'raw_market_responses', ['timestamp'], unique=False)
+    op.create_index('idx_bars_interval_timestamp', 'price_bars', ['interval', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_bars_interval_timestamp', table_name='price_bars')
+    op.drop_index('idx_raw_timestamp', table_name='raw_market_responses')
+    op.drop_index('idx_price_timestamp', table_name='price_points')
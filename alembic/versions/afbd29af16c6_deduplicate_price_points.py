@@ -0,0 +1,41 @@
+"""Deduplicate price points and key moving averages by event id
+
+Revision ID: afbd29af16c6
+Revises: f450b01ffb89
+Create Date: 2026-10-19 11:20:33.671904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'afbd29af16c6'
+down_revision: Union[str, None] = 'f450b01ffb89'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop existing duplicates, keeping the first physical row of each quote
+    op.execute(
+        """
+        DELETE FROM price_points a
+        USING price_points b
+        WHERE a.symbol = b.symbol
+          AND a.provider = b.provider
+          AND a.timestamp = b.timestamp
+          AND a.ctid > b.ctid
+        """
+    )
+    op.create_unique_constraint('uq_price_symbol_provider_timestamp', 'price_points', ['symbol', 'provider', 'timestamp'])
+    op.add_column('moving_averages', sa.Column('event_id', sa.UUID(), nullable=True))
+    op.create_unique_constraint('moving_averages_event_id_key', 'moving_averages', ['event_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('moving_averages_event_id_key', 'moving_averages', type_='unique')
+    op.drop_column('moving_averages', 'event_id')
+    op.drop_constraint('uq_price_symbol_provider_timestamp', 'price_points', type_='unique')
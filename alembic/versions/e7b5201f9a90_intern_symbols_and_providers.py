@@ -0,0 +1,108 @@
+"""Intern symbols and providers as integer dictionary ids
+
+Revision ID: e7b5201f9a90
+Revises: 44a7f7a762ff
+Create Date: 2026-10-19 15:02:47.118340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b5201f9a90'
+down_revision: Union[str, None] = '44a7f7a762ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Hot tables and whether they carry a provider column
+HOT_TABLES = {
+    'price_points': True,
+    'raw_market_responses': True,
+    'moving_averages': False,
+}
+
+
+def upgrade() -> None:
+    op.create_table('symbols',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ticker', sa.String(length=10), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ticker')
+    )
+    op.create_table('providers',
+    sa.Column('id', sa.SmallInteger(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.execute(
+        """
+        INSERT INTO symbols (ticker)
+        SELECT symbol FROM price_points
+        UNION SELECT symbol FROM raw_market_responses
+        UNION SELECT symbol FROM moving_averages
+        ORDER BY 1
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO providers (name)
+        SELECT provider FROM price_points
+        UNION SELECT provider FROM raw_market_responses
+        ORDER BY 1
+        """
+    )
+
+    # Drop string indexes first so the backfill UPDATEs don't maintain them
+    op.drop_constraint('uq_price_symbol_provider_timestamp', 'price_points', type_='unique')
+    op.drop_index('idx_price_symbol_timestamp', table_name='price_points')
+    op.drop_index('idx_raw_symbol_timestamp', table_name='raw_market_responses')
+    op.drop_index('idx_ma_symbol_period_timestamp', table_name='moving_averages')
+
+    for table, has_provider in HOT_TABLES.items():
+        op.add_column(table, sa.Column('symbol_id', sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} t SET symbol_id = s.id FROM symbols s WHERE s.ticker = t.symbol")
+        op.alter_column(table, 'symbol_id', nullable=False)
+        op.create_foreign_key(f'{table}_symbol_id_fkey', table, 'symbols', ['symbol_id'], ['id'])
+        op.drop_column(table, 'symbol')
+        if has_provider:
+            op.add_column(table, sa.Column('provider_id', sa.SmallInteger(), nullable=True))
+            op.execute(f"UPDATE {table} t SET provider_id = p.id FROM providers p WHERE p.name = t.provider")
+            op.alter_column(table, 'provider_id', nullable=False)
+            op.create_foreign_key(f'{table}_provider_id_fkey', table, 'providers', ['provider_id'], ['id'])
+            op.drop_column(table, 'provider')
+
+    op.create_index('idx_price_symbol_timestamp', 'price_points', ['symbol_id', 'timestamp'], unique=False)
+    op.create_unique_constraint('uq_price_symbol_provider_timestamp', 'price_points', ['symbol_id', 'provider_id', 'timestamp'])
+    op.create_index('idx_raw_symbol_timestamp', 'raw_market_responses', ['symbol_id', 'timestamp'], unique=False)
+    op.create_index('idx_ma_symbol_period_timestamp', 'moving_averages', ['symbol_id', 'period', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_price_symbol_provider_timestamp', 'price_points', type_='unique')
+    op.drop_index('idx_price_symbol_timestamp', table_name='price_points')
+    op.drop_index('idx_raw_symbol_timestamp', table_name='raw_market_responses')
+    op.drop_index('idx_ma_symbol_period_timestamp', table_name='moving_averages')
+
+    for table, has_provider in HOT_TABLES.items():
+        op.add_column(table, sa.Column('symbol', sa.String(length=10), nullable=True))
+        op.execute(f"UPDATE {table} t SET symbol = s.ticker FROM symbols s WHERE s.id = t.symbol_id")
+        op.alter_column(table, 'symbol', nullable=False)
+        op.drop_constraint(f'{table}_symbol_id_fkey', table, type_='foreignkey')
+        op.drop_column(table, 'symbol_id')
+        if has_provider:
+            op.add_column(table, sa.Column('provider', sa.String(length=50), nullable=True))
+            op.execute(f"UPDATE {table} t SET provider = p.name FROM providers p WHERE p.id = t.provider_id")
+            op.alter_column(table, 'provider', nullable=False)
+            op.drop_constraint(f'{table}_provider_id_fkey', table, type_='foreignkey')
+            op.drop_column(table, 'provider_id')
+
+    op.create_index('idx_price_symbol_timestamp', 'price_points', ['symbol', 'timestamp'], unique=False)
+    op.create_unique_constraint('uq_price_symbol_provider_timestamp', 'price_points', ['symbol', 'provider', 'timestamp'])
+    op.create_index('idx_raw_symbol_timestamp', 'raw_market_responses', ['symbol', 'timestamp'], unique=False)
+    op.create_index('idx_ma_symbol_period_timestamp', 'moving_averages', ['symbol', 'period', 'timestamp'], unique=False)
+    op.drop_table('providers')
+    op.drop_table('symbols')
@@ -0,0 +1,47 @@
+"""Add latest_moving_averages and (symbol, period, timestamp) index
+
+Revision ID: f450b01ffb89
+Revises: 55e2c716b0d7
+Create Date: 2026-10-19 10:02:47.503112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f450b01ffb89'
+down_revision: Union[str, None] = '55e2c716b0d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('latest_moving_averages',
+    sa.Column('symbol', sa.String(length=10), nullable=False),
+    sa.Column('period', sa.Integer(), nullable=False),
+    sa.Column('average_value', sa.Float(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('symbol', 'period')
+    )
+    op.create_index('idx_ma_symbol_period_timestamp', 'moving_averages', ['symbol', 'period', 'timestamp'], unique=False)
+    op.drop_index('idx_ma_symbol_timestamp', table_name='moving_averages')
+
+    # Seed the latest-value table from existing history
+    op.execute(
+        """
+        INSERT INTO latest_moving_averages (symbol, period, average_value, timestamp)
+        SELECT DISTINCT ON (symbol, period) symbol, period, average_value, timestamp
+        FROM moving_averages
+        WHERE timestamp IS NOT NULL
+        ORDER BY symbol, period, timestamp DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.create_index('idx_ma_symbol_timestamp', 'moving_averages', ['symbol', 'timestamp'], unique=False)
+    op.drop_index('idx_ma_symbol_period_timestamp', table_name='moving_averages')
+    op.drop_table('latest_moving_averages')
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 from app.api.endpoints.health import router as health_router
 from app.api.endpoints.prices import router as prices_router
+from app.api.endpoints.export import router as export_router
+from app.api.endpoints.analytics import router as analytics_router
 
 api_router = APIRouter()
 
 # Include routers
 api_router.include_router(health_router, tags=["health"])
 api_router.include_router(prices_router, prefix="/prices", tags=["prices"])
+api_router.include_router(export_router, prefix="/export", tags=["export"])
+api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
@@ -1,17 +1,59 @@
-from fastapi import Depends
+from typing import List, Optional
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.models.database import get_db
+from app.core.config import settings
+from app.models.database import engine, get_db, get_read_db, get_replica_router
+from app.services.health_prober import PROVIDER_ENDPOINTS, HealthProber
 from app.services.kafka_service import KafkaService
 from app.services.market_service import MarketService
 
-# Global Kafka service instance
-kafka_service = KafkaService()
+# Global Kafka service instance, created on first request rather than at import
+kafka_service: Optional[KafkaService] = None
 
 def get_kafka_service() -> KafkaService:
+    global kafka_service
+    if kafka_service is None:
+        kafka_service = KafkaService()
     return kafka_service
 
+async def close_kafka_service() -> None:
+    """Flush and close the shared Kafka service if it was ever created."""
+    global kafka_service
+    if kafka_service is not None:
+        await kafka_service.flush()  # Publish any conflated events still queued
+        kafka_service.close()
+        kafka_service = None
+
+# Global health prober, started and stopped by the application lifespan
+health_prober: Optional[HealthProber] = None
+
+def get_health_prober() -> HealthProber:
+    global health_prober
+    if health_prober is None:
+        health_prober = HealthProber(
+            engine=engine,
+            kafka_service=get_kafka_service(),
+            redis_url=settings.REDIS_URL,
+            provider_endpoints=PROVIDER_ENDPOINTS if settings.HEALTH_PROBE_PROVIDERS else None,
+            replica_router=get_replica_router(),
+        )
+    return health_prober
+
 def get_market_service(
     db: Session = Depends(get_db),
     kafka_service: KafkaService = Depends(get_kafka_service)
 ) -> MarketService:
-    return MarketService(db, kafka_service)
\ No newline at end of file
+    return MarketService(db, kafka_service)
+
+def get_read_market_service(db: Session = Depends(get_read_db)) -> MarketService:
+    """Market service for read-only endpoints, backed by a replica when one is fresh."""
+    return MarketService(db, None)
+
+def get_symbols(
+    symbols: str = Query(..., description="Comma-separated stock symbols (e.g., AAPL,MSFT)")
+) -> List[str]:
+    """Parse a comma-separated symbols query parameter into unique uppercase tickers."""
+    parsed = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="At least one symbol is required")
+    return parsed
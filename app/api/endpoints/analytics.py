@@ -0,0 +1,29 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api.dependencies import get_symbols
+from app.core.config import settings
+from app.models.database import get_read_db
+from app.schemas.market_data import CorrelationResponse
+from app.services.correlation_service import BAR_SECONDS, CorrelationService
+
+router = APIRouter()
+
+@router.get("/correlation", response_model=CorrelationResponse, response_model_exclude_none=True)
+async def get_correlation(
+    symbols: List[str] = Depends(get_symbols),
+    window: int = Query(
+        60, ge=2, le=settings.CORRELATION_MAX_WINDOW, description="Number of bar returns"
+    ),
+    bar: str = Query("1m", pattern=f"^({'|'.join(BAR_SECONDS)})$", description="Bar size"),
+    include_returns: bool = Query(False, description="Also return the log returns matrix"),
+    db: Session = Depends(get_read_db)
+):
+    """Correlation matrix of log returns over the last `window` closed bars"""
+    if len(symbols) > settings.CORRELATION_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.CORRELATION_MAX_SYMBOLS} symbols per request",
+        )
+    result = CorrelationService(db).correlation(symbols, window, bar, include_returns)
+    return CorrelationResponse(**result)
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.api.dependencies import get_symbols
+from app.models.database import get_read_db
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+
+router = APIRouter()
+
+@router.get("/prices")
+async def export_prices(
+    symbols: List[str] = Depends(get_symbols),
+    start: Optional[datetime] = Query(None, description="Inclusive start time (UTC)"),
+    end: Optional[datetime] = Query(None, description="Exclusive end time (UTC)"),
+    format: str = Query("parquet", pattern="^(parquet|arrow)$", description="parquet or arrow"),
+    db: Session = Depends(get_read_db)
+):
+    """Stream price history as a Parquet file or Arrow IPC stream"""
+    export_service = ExportService(db.get_bind())
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        export_service.stream(symbols, start, end, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="prices.{extension}"'},
+    )
@@ -1,39 +1,45 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from datetime import datetime
-from app.schemas.market_data import HealthResponse
-from app.models.database import get_db
-from app.services.kafka_service import KafkaService
-from app.api.dependencies import get_kafka_service
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from app.schemas.market_data import HealthDetailsResponse, HealthResponse
+from app.services.health_prober import HealthProber
+from app.api.dependencies import get_health_prober
 
 router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(
-    db: Session = Depends(get_db),
-    kafka_service: KafkaService = Depends(get_kafka_service)
-):
-    """Health check endpoint"""
-    # Check database
-    try:
-        result = db.execute(text("SELECT 1"))
-        result.fetchone()
-        db_status = "healthy"
-    except Exception as e:
-        print(f"Database health check failed: {e}")
-        db_status = "unhealthy"
-    
-    # Check Kafka (simplified check)
-    kafka_status = "healthy"
-    
-    # Check Redis
-    redis_status = "not_configured"
-    
+async def health_check(prober: HealthProber = Depends(get_health_prober)):
+    """Health summary served from the background prober's cached snapshot"""
+    snapshot = prober.snapshot
     return HealthResponse(
-        status="healthy" if db_status == "healthy" else "degraded",
-        timestamp=datetime.utcnow(),
-        database=db_status,
-        kafka=kafka_status,
-        redis=redis_status
+        status=snapshot.get("status", "starting"),
+        timestamp=snapshot.get("checked_at") or datetime.utcnow(),
+        database=prober.dependency_status("database"),
+        kafka=prober.dependency_status("kafka"),
+        redis=prober.dependency_status("redis")
+    )
+
+@router.get("/health/live")
+async def liveness(prober: HealthProber = Depends(get_health_prober)):
+    """Liveness probe: the process is serving and the probe loop is progressing"""
+    if not prober.is_live():
+        return JSONResponse(status_code=503, content={"status": "stalled"})
+    return {"status": "alive"}
+
+@router.get("/health/ready")
+async def readiness(prober: HealthProber = Depends(get_health_prober)):
+    """Readiness probe: a probe has completed and the database is reachable"""
+    if not prober.is_ready():
+        return JSONResponse(status_code=503, content={"status": "not_ready"})
+    return {"status": "ready"}
+
+@router.get("/health/details", response_model=HealthDetailsResponse)
+async def health_details(prober: HealthProber = Depends(get_health_prober)):
+    """Per-dependency status, latency and last error from the cached snapshot"""
+    snapshot = prober.snapshot
+    return HealthDetailsResponse(
+        status=snapshot.get("status", "starting"),
+        checked_at=snapshot.get("checked_at"),
+        ready=prober.is_ready(),
+        dependencies=snapshot.get("dependencies", {})
     )
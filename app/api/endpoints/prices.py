@@ -1,26 +1,150 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional
-from app.schemas.market_data import PriceResponse, PollRequest, PollResponse
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.core.config import settings
+from app.schemas.market_data import (
+    PriceResponse,
+    PollRequest,
+    PollResponse,
+    PollJobUpdate,
+    PollJobIds,
+    PollJobStatus,
+    MovingAverageResponse,
+)
+from app.models.database import get_db, get_read_db
+from app.services.admission import DeadlineExceeded, Overloaded, admit
 from app.services.market_service import MarketService
-from app.api.dependencies import get_market_service
+from app.services.polling_service import JobNotFound, PollingService
+from app.services.quote_table import fresh_quote
+from app.services.response_cache import (
+    CachedResponse,
+    encode,
+    encode_quote,
+    etag_matches,
+    get_response_cache,
+)
+from app.services.tick_store import get_tick_store, to_micros
+from app.api.dependencies import get_market_service, get_read_market_service, get_symbols
 
 router = APIRouter()
 
+def _shed_response(symbol: str, status_code: int, detail: str, retry_after: int):
+    """
+    Answer a request that could not be served in time or at all.
+
+    In "stale" overload mode the last cached quote is returned (marked with
+    a Warning header) if it is recent enough; otherwise the request fails
+    fast with Retry-After so clients back off.
+    """
+    if settings.ADMISSION_OVERLOAD_MODE == "stale":
+        quote = get_tick_store().latest(symbol.upper())
+        if quote and datetime.utcnow() - quote[0] <= timedelta(seconds=settings.ADMISSION_STALE_MAX_AGE):
+            stale = PriceResponse(symbol=symbol.upper(), price=quote[1], timestamp=quote[0], provider="cache")
+            return JSONResponse(
+                content=stale.model_dump(mode="json"),
+                headers={"Warning": '110 - "Response is Stale"'},
+            )
+    raise HTTPException(
+        status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)}
+    )
+
+def _cached_response(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """
+    Send a pre-encoded body, or 304 Not Modified if the client already has it.
+
+    The body bytes are sent as they are, without validating through the
+    response model again.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": f"max-age={cached.max_age()}"}
+    if cached.last_modified:
+        headers["Last-Modified"] = cached.last_modified
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
 @router.get("/latest", response_model=PriceResponse)
 async def get_latest_price(
     symbol: str = Query(..., description="Stock symbol (e.g., AAPL)"),
     provider: Optional[str] = Query("yfinance", description="Data provider"),
+    if_none_match: Optional[str] = Header(None),
     market_service: MarketService = Depends(get_market_service)
 ):
-    """Get latest price for a symbol"""
+    """
+    Get latest price for a symbol (subject to admission control)
+
+    Responses carry an ETag and Last-Modified derived from the quote and a
+    Cache-Control max-age per provider (HTTP_CACHE_MAX_AGES). Until it
+    expires, the encoded response is served from memory, and a matching
+    If-None-Match gets 304 without calling the provider or the database.
+    """
+    cache = get_response_cache()
+    cached = cache.get(symbol, provider)
+    if cached is None:
+        # A quote another worker fetched moments ago needs no provider call
+        quote = fresh_quote(symbol, provider)
+        if quote is not None:
+            cached = encode_quote(quote.symbol, quote.price, quote.timestamp, quote.provider)
+            cache.put(symbol, provider, cached)
+    if cached is not None:
+        return _cached_response(cached, if_none_match)
+
     try:
-        price_data = await market_service.get_latest_price(symbol, provider)
-        return PriceResponse(**price_data)
+        async with admit("/prices/latest") as deadline:
+            price_data = await market_service.get_latest_price(symbol, provider, deadline=deadline)
+    except Overloaded as e:
+        return _shed_response(symbol, 503, "Service overloaded, retry later", e.retry_after)
+    except DeadlineExceeded as e:
+        return _shed_response(symbol, 504, str(e), settings.ADMISSION_RETRY_AFTER)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    cached = encode_quote(
+        price_data["symbol"], price_data["price"], price_data["timestamp"], price_data["provider"]
+    )
+    cache.put(symbol, provider, cached)
+    return _cached_response(cached, if_none_match)
+
+@router.get("/moving-average", response_model=MovingAverageResponse)
+async def get_moving_average(
+    symbol: str = Query(..., description="Stock symbol (e.g., AAPL)"),
+    period: int = Query(5, ge=1, description="Moving average period"),
+    if_none_match: Optional[str] = Header(None),
+    market_service: MarketService = Depends(get_read_market_service)
+):
+    """Get latest moving average for a symbol (revalidate with If-None-Match)"""
+    moving_avg = await market_service.get_moving_average(symbol, period)
+    if moving_avg is None:
+        raise HTTPException(
+            status_code=404, detail=f"No {period}-period moving average for {symbol.upper()}"
+        )
+    # The consumer updates averages at any time, so clients revalidate
+    # against the stored row rather than a provider max-age
+    cached = encode(
+        moving_avg,
+        (moving_avg["symbol"], period, to_micros(moving_avg["timestamp"]), moving_avg["average_value"]),
+        moving_avg["timestamp"],
+    )
+    return _cached_response(cached, if_none_match)
+
+@router.get("/moving-average/batch", response_model=List[MovingAverageResponse])
+async def get_moving_averages(
+    symbols: List[str] = Depends(get_symbols),
+    period: int = Query(5, ge=1, description="Moving average period"),
+    if_none_match: Optional[str] = Header(None),
+    market_service: MarketService = Depends(get_read_market_service)
+):
+    """Get latest moving averages for several symbols (missing symbols are omitted)"""
+    moving_avgs = await market_service.get_moving_averages(symbols, period)
+    parts = [period]
+    for m in moving_avgs:
+        parts += [m["symbol"], to_micros(m["timestamp"]), m["average_value"]]
+    newest = max((m["timestamp"] for m in moving_avgs), default=None)
+    return _cached_response(encode(moving_avgs, parts, newest), if_none_match)
+
 @router.post("/poll", response_model=PollResponse, status_code=202)
 async def create_polling_job(
     poll_request: PollRequest,
@@ -35,4 +159,47 @@ async def create_polling_job(
         )
         return PollResponse(**job_data)
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/poll/bulk", response_model=List[PollResponse], status_code=202)
+async def create_polling_jobs(
+    poll_requests: List[PollRequest] = Body(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db)
+):
+    """Create several polling jobs at once"""
+    return PollingService(db).create_jobs([r.model_dump() for r in poll_requests])
+
+@router.patch("/poll/bulk", response_model=List[PollJobStatus])
+async def update_polling_jobs(
+    updates: List[PollJobUpdate] = Body(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db)
+):
+    """Update symbols, interval, provider or status of several jobs (all or nothing)"""
+    try:
+        return PollingService(db).update_jobs([u.model_dump() for u in updates])
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/poll/pause", response_model=List[PollJobStatus])
+async def pause_polling_jobs(job_ids: PollJobIds, db: Session = Depends(get_db)):
+    """Pause several polling jobs"""
+    try:
+        return PollingService(db).set_status(job_ids.job_ids, "paused")
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/poll/resume", response_model=List[PollJobStatus])
+async def resume_polling_jobs(job_ids: PollJobIds, db: Session = Depends(get_db)):
+    """Resume several paused polling jobs"""
+    try:
+        return PollingService(db).set_status(job_ids.job_ids, "active")
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/poll/{job_id}", response_model=PollJobStatus)
+async def get_polling_job(job_id: str, db: Session = Depends(get_read_db)):
+    """Get a polling job with per-shard progress and status"""
+    status = PollingService(db).get_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown polling job: {job_id}")
+    return status
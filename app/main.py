@@ -3,8 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.api import api_router  # Simplified import
 from app.core.config import settings
-from app.models.database import engine
-from app.models import market_data
+from app.api.dependencies import close_kafka_service, get_health_prober, get_kafka_service
+from app.models.database import check_schema_version
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,9 +14,31 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Market Data Service starting up...")
-    market_data.Base.metadata.create_all(bind=engine)
+    # Schema is managed by Alembic; only confirm the revision here
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        check_schema_version()
+    # Dependency checks run in the background; health endpoints read the cache
+    get_health_prober().start()
+    # The in-memory bus only reaches consumers in this process, so run one here
+    consumer_task = None
+    if settings.EVENT_BUS_BACKEND == "memory":
+        from app.services.moving_average_consumer import MovingAverageConsumer
+
+        consumer_task = asyncio.create_task(MovingAverageConsumer().start_consuming())
+    polling_scheduler = None
+    if settings.POLL_SCHEDULER_ENABLED:
+        from app.services.polling_scheduler import PollingScheduler
+
+        polling_scheduler = PollingScheduler(kafka_service=get_kafka_service())
+        polling_scheduler.start()
     yield
     logger.info("Market Data Service shutting down...")
+    if consumer_task is not None:
+        consumer_task.cancel()
+    if polling_scheduler is not None:
+        await polling_scheduler.stop()
+    await get_health_prober().stop()
+    await close_kafka_service()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
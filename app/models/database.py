@@ -1,13 +1,26 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Alembic scripts live at the repository root next to alembic.ini
+ALEMBIC_SCRIPT_LOCATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic"
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -15,3 +28,207 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def replica_lag(replica_engine) -> float:
+    """
+    Seconds a streaming replica is behind its primary.
+
+    A replica whose WAL receiver is streaming and has replayed everything
+    it received counts as current, since on an idle primary the last
+    replayed transaction can be old without any data missing. Without a
+    streaming receiver (disconnected from the primary) nothing proves the
+    replica is current, so lag is the age of the last replayed transaction,
+    and infinite if it never replayed one. Non-replica Postgres servers
+    report 0, as do other databases.
+
+    Args:
+        replica_engine: Engine connected to the replica
+
+    Returns:
+        Replication delay in seconds
+    """
+    if replica_engine.dialect.name != "postgresql":
+        return 0.0
+    with replica_engine.connect() as conn:
+        lag = conn.execute(
+            text(
+                "SELECT CASE "
+                "WHEN NOT pg_is_in_recovery() THEN 0 "
+                "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                "AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+        ).scalar()
+    return float("inf") if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read-only sessions.
+
+    Reads go round-robin to replicas whose replication lag is within
+    max_lag seconds and fall back to the primary when every replica is too
+    far behind or unreachable. Lag is measured at most once per
+    check_interval per replica, so routing adds no query to most requests.
+    """
+
+    def __init__(
+        self,
+        primary,
+        replicas: List,
+        max_lag: Optional[float] = None,
+        check_interval: Optional[float] = None,
+        lag_probe: Callable = replica_lag,
+    ):
+        """
+        Initialize router.
+
+        Args:
+            primary: Engine for writes and fallback reads
+            replicas: Replica engines (may be empty)
+            max_lag: Staleness bound in seconds
+            check_interval: Seconds a lag measurement is reused
+            lag_probe: Function measuring an engine's lag in seconds
+        """
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = settings.REPLICA_MAX_LAG_SECONDS if max_lag is None else max_lag
+        self.check_interval = (
+            settings.REPLICA_LAG_CHECK_INTERVAL if check_interval is None else check_interval
+        )
+        self.lag_probe = lag_probe
+
+        self._lags: Dict[int, tuple] = {}  # replica index -> (lag, measured_at)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._sessionmakers = {}
+
+    def lag(self, index: int) -> float:
+        """Cached lag of one replica (infinite if it cannot be measured)."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._lags.get(index)
+        if cached is not None and now - cached[1] < self.check_interval:
+            return cached[0]
+        try:
+            lag = self.lag_probe(self.replicas[index])
+        except Exception as e:
+            logger.warning(f"Replica {index} lag check failed: {e}")
+            lag = float("inf")
+        with self._lock:
+            self._lags[index] = (lag, now)
+        return lag
+
+    def read_engine(self):
+        """Engine to serve the next read from."""
+        if not self.replicas:
+            return self.primary
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self.lag(index) <= self.max_lag:
+                return self.replicas[index]
+        logger.warning(f"All replicas exceed {self.max_lag}s lag; reading from primary")
+        return self.primary
+
+    def session(self):
+        """New session bound to the engine chosen for this read."""
+        bind = self.read_engine()
+        if bind not in self._sessionmakers:
+            self._sessionmakers[bind] = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+        return self._sessionmakers[bind]()
+
+
+_replica_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    """Return the process-wide router built from DATABASE_REPLICA_URLS."""
+    global _replica_router
+    if _replica_router is None:
+        urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+        _replica_router = ReplicaRouter(engine, [create_engine(url) for url in urls])
+    return _replica_router
+
+
+def get_read_db():
+    """Session for read-only endpoints: a fresh-enough replica, else the primary."""
+    db = get_replica_router().session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def dialect_insert(db, table):
+    """
+    Build an INSERT for the session's dialect that supports ON CONFLICT.
+
+    Args:
+        db: Session (or connection) the statement will run on
+        table: Mapped class or Table to insert into
+
+    Returns:
+        Dialect-specific Insert construct
+    """
+    dialect = db.get_bind().dialect.name if hasattr(db, "get_bind") else db.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts not supported on {dialect}")
+    return insert(table)
+
+
+def set_statement_timeout(db, seconds: Optional[float]) -> None:
+    """
+    Bound statements in the current transaction to a request's remaining time.
+
+    Uses SET LOCAL statement_timeout, so the limit ends with the transaction;
+    a no-op on databases without statement timeouts.
+
+    Args:
+        db: Session the statements will run on
+        seconds: Time left, or None for no limit
+    """
+    if seconds is None or db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text(f"SET LOCAL statement_timeout = {max(int(seconds * 1000), 1)}"))
+
+
+def is_statement_timeout(error: Exception) -> bool:
+    """Check whether a DBAPI error was Postgres cancelling a statement (57014)."""
+    return getattr(getattr(error, "orig", None), "pgcode", None) == "57014"
+
+
+def check_schema_version(bind=None) -> Optional[str]:
+    """
+    Verify the database is migrated to the latest Alembic revision.
+
+    Schema changes are applied with `alembic upgrade head`; the application
+    only reads the single-row alembic_version table on startup instead of
+    issuing CREATE TABLE checks for every model.
+
+    Args:
+        bind: Engine or connection to check (defaults to the app engine)
+
+    Returns:
+        Current database revision, or None if it could not be determined
+    """
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory(ALEMBIC_SCRIPT_LOCATION).get_current_head()
+    try:
+        with (bind or engine).connect() as conn:
+            current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception as e:
+        logger.warning(f"Could not read schema version (run 'alembic upgrade head'): {e}")
+        return None
+
+    if current != head:
+        logger.warning(
+            f"Database schema at revision {current}, expected {head}; run 'alembic upgrade head'"
+        )
+    return current
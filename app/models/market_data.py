@@ -1,45 +1,109 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Float, DateTime, Text, Index, UniqueConstraint, ForeignKey
+)
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 from .database import Base
 
 
+class Symbol(Base):
+    """Dictionary of tickers; hot tables reference them by small integer ID."""
+
+    __tablename__ = "symbols"
+
+    id = Column(Integer, primary_key=True)
+    ticker = Column(String(10), nullable=False, unique=True)
+
+
+class Provider(Base):
+    """Dictionary of provider names; hot tables reference them by small integer ID."""
+
+    __tablename__ = "providers"
+
+    # SQLite only autoincrements an INTEGER PRIMARY KEY
+    id = Column(SmallInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+
 class RawMarketResponse(Base):
     __tablename__ = "raw_market_responses"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    symbol = Column(String(10), nullable=False)
-    provider = Column(String(50), nullable=False)
+    symbol_id = Column(Integer, ForeignKey("symbols.id"), nullable=False)
+    provider_id = Column(SmallInteger, ForeignKey("providers.id"), nullable=False)
     raw_response = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
-    __table_args__ = (Index("idx_raw_symbol_timestamp", "symbol", "timestamp"),)
+    __table_args__ = (
+        Index("idx_raw_symbol_timestamp", "symbol_id", "timestamp"),
+        Index("idx_raw_timestamp", "timestamp"),  # Retention scans by age
+    )
 
 
 class PricePoint(Base):
     __tablename__ = "price_points"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    symbol = Column(String(10), nullable=False)
+    symbol_id = Column(Integer, ForeignKey("symbols.id"), nullable=False)
     price = Column(Float, nullable=False)
     timestamp = Column(DateTime, nullable=False)
-    provider = Column(String(50), nullable=False)
+    provider_id = Column(SmallInteger, ForeignKey("providers.id"), nullable=False)
     raw_response_id = Column(UUID(as_uuid=True), nullable=True)
 
-    __table_args__ = (Index("idx_price_symbol_timestamp", "symbol", "timestamp"),)
+    __table_args__ = (
+        Index("idx_price_symbol_timestamp", "symbol_id", "timestamp"),
+        Index("idx_price_timestamp", "timestamp"),  # Retention scans by age
+        # One row per quote: repeated fetches of the same quote are dropped
+        UniqueConstraint(
+            "symbol_id", "provider_id", "timestamp", name="uq_price_symbol_provider_timestamp"
+        ),
+    )
+
+
+class PriceBar(Base):
+    """OHLCV bar for a symbol at a fixed interval (e.g. "1m", "1d")."""
+
+    __tablename__ = "price_bars"
+
+    symbol = Column(String(10), primary_key=True)
+    interval = Column(String(10), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)  # Bar open time (UTC)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=True)
+    provider = Column(String(50), nullable=False)
+
+    __table_args__ = (Index("idx_bars_interval_timestamp", "interval", "timestamp"),)
 
 
 class MovingAverage(Base):
     __tablename__ = "moving_averages"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    symbol = Column(String(10), nullable=False)
+    symbol_id = Column(Integer, ForeignKey("symbols.id"), nullable=False)
     period = Column(Integer, nullable=False, default=5)
     average_value = Column(Float, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
+    # Price event that triggered the calculation; makes redelivery a no-op
+    event_id = Column(UUID(as_uuid=True), nullable=True, unique=True)
+
+    __table_args__ = (
+        Index("idx_ma_symbol_period_timestamp", "symbol_id", "period", "timestamp"),
+    )
 
-    __table_args__ = (Index("idx_ma_symbol_timestamp", "symbol", "timestamp"),)
+
+class LatestMovingAverage(Base):
+    """Most recent moving average per (symbol, period), upserted by the consumer."""
+
+    __tablename__ = "latest_moving_averages"
+
+    symbol = Column(String(10), primary_key=True)
+    period = Column(Integer, primary_key=True)
+    average_value = Column(Float, nullable=False)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
 
 
 class PollingJob(Base):
@@ -47,9 +111,26 @@ class PollingJob(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_id = Column(String(100), unique=True, nullable=False)
-    symbols = Column(Text, nullable=False)
     interval = Column(Integer, nullable=False)
     provider = Column(String(50), nullable=False)
+    # Symbols per shard; shards are spread evenly across the interval
+    shard_size = Column(Integer, nullable=False)
     status = Column(String(20), default="active")
     created_at = Column(DateTime, default=datetime.utcnow)
-    last_run = Column(DateTime, nullable=True)
\ No newline at end of file
+    last_run = Column(DateTime, nullable=True)
+
+
+class PollingJobSymbol(Base):
+    """One symbol of a polling job, with its shard and last poll outcome."""
+
+    __tablename__ = "polling_job_symbols"
+
+    job_id = Column(
+        UUID(as_uuid=True), ForeignKey("polling_jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    symbol_id = Column(Integer, ForeignKey("symbols.id"), primary_key=True)
+    shard = Column(Integer, nullable=False)
+    last_polled_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (Index("idx_polling_job_symbols_shard", "job_id", "shard"),)
\ No newline at end of file
@@ -1,7 +1,14 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
+from app.core.config import settings
+
+def _require_symbol(symbols: Optional[List[str]]) -> Optional[List[str]]:
+    """Reject symbol lists with nothing but blank entries."""
+    if symbols is not None and not any(s.strip() for s in symbols):
+        raise ValueError("at least one non-blank symbol is required")
+    return symbols
 
 class PriceResponse(BaseModel):
     symbol: str
@@ -10,15 +17,55 @@ class PriceResponse(BaseModel):
     provider: str
 
 class PollRequest(BaseModel):
-    symbols: List[str] = Field(..., min_length=1, max_length=10)
+    symbols: List[str] = Field(..., min_length=1, max_length=settings.POLL_MAX_SYMBOLS)
     interval: int = Field(60, ge=30, le=3600)
     provider: str = "yfinance"
 
+    @field_validator("symbols")
+    @classmethod
+    def symbols_not_blank(cls, symbols):
+        return _require_symbol(symbols)
+
 class PollResponse(BaseModel):
     job_id: str
     status: str = "accepted"
     config: dict
 
+class PollJobUpdate(BaseModel):
+    job_id: str
+    symbols: Optional[List[str]] = Field(None, min_length=1, max_length=settings.POLL_MAX_SYMBOLS)
+    interval: Optional[int] = Field(None, ge=30, le=3600)
+    provider: Optional[str] = None
+    status: Optional[Literal["active", "paused"]] = None
+
+    @field_validator("symbols")
+    @classmethod
+    def symbols_not_blank(cls, symbols):
+        return _require_symbol(symbols)
+
+class PollJobIds(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+class PollShardStatus(BaseModel):
+    shard: int
+    symbols: int
+    offset_seconds: float
+    progress: float
+    errors: int
+    last_polled_at: Optional[datetime] = None
+    status: str
+
+class PollJobStatus(BaseModel):
+    job_id: str
+    status: str
+    interval: int
+    provider: str
+    shard_size: int
+    symbols: int
+    created_at: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+    shards: List[PollShardStatus]
+
 class MovingAverageResponse(BaseModel):
     symbol: str
     period: int
@@ -31,3 +78,22 @@ class HealthResponse(BaseModel):
     database: str
     kafka: str
     redis: str
+
+class DependencyHealth(BaseModel):
+    status: str
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+class HealthDetailsResponse(BaseModel):
+    status: str
+    checked_at: Optional[datetime] = None
+    ready: bool
+    dependencies: Dict[str, DependencyHealth]
+
+class CorrelationResponse(BaseModel):
+    symbols: List[str]
+    window: int
+    bar: str
+    as_of: datetime
+    matrix: List[List[Optional[float]]]
+    returns: Optional[List[List[float]]] = None
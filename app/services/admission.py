@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Overloaded(Exception):
+    """Raised when a concurrency limit is full and the request is shed."""
+
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"{scope} is at its concurrency limit")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs past its deadline."""
+
+
+class ConcurrencyLimiter:
+    """
+    Fail-fast concurrency limit for one route or provider.
+
+    Requests beyond the limit are rejected immediately instead of queueing,
+    so a slow upstream cannot pile up unbounded in-flight work.
+    """
+
+    def __init__(self, scope: str, limit: int):
+        """
+        Initialize limiter.
+
+        Args:
+            scope: Name used in logs and errors (e.g. "route:/prices/latest")
+            limit: Maximum requests in flight
+        """
+        self.scope = scope
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            Overloaded: If every slot is taken
+        """
+        self._take()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def run(self, call: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """
+        Start call() as a task that holds a slot until it finishes.
+
+        Unlike acquire(), the slot outlives a caller that stops waiting (a
+        deadline, a disconnected client): a provider call running on an
+        executor thread cannot be interrupted, so it keeps counting against
+        the limit until it actually returns.
+
+        Args:
+            call: Returns the awaitable to run
+
+        Returns:
+            The task; shield it when awaiting with a timeout
+
+        Raises:
+            Overloaded: If every slot is taken
+        """
+        self._take()
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(self._release)
+        return task
+
+    def _take(self) -> None:
+        """Claim a slot or shed the request."""
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            logger.warning(f"Shedding request: {self.scope} at limit {self.limit}")
+            raise Overloaded(self.scope, settings.ADMISSION_RETRY_AFTER)
+        self.in_flight += 1
+
+    def _release(self, task: asyncio.Future) -> None:
+        """Free the slot of a finished run() task."""
+        self.in_flight -= 1
+        if not task.cancelled():
+            task.exception()  # Retrieved here so an abandoned failure is not reported as unhandled
+
+
+# Limiters by scope, created on first use from settings
+_limiters: Dict[str, ConcurrencyLimiter] = {}
+
+
+def _provider_limits() -> Dict[str, int]:
+    """Parse ADMISSION_PROVIDER_LIMITS ("name=limit,...") overrides."""
+    limits = {}
+    for item in settings.ADMISSION_PROVIDER_LIMITS.split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+def get_route_limiter(route: str) -> ConcurrencyLimiter:
+    """Return the concurrency limiter for an API route."""
+    scope = f"route:{route}"
+    if scope not in _limiters:
+        _limiters[scope] = ConcurrencyLimiter(scope, settings.ADMISSION_ROUTE_LIMIT)
+    return _limiters[scope]
+
+
+def get_provider_limiter(provider: str) -> ConcurrencyLimiter:
+    """Return the concurrency limiter for a market data provider."""
+    scope = f"provider:{provider}"
+    if scope not in _limiters:
+        limit = _provider_limits().get(provider, settings.ADMISSION_PROVIDER_LIMIT)
+        _limiters[scope] = ConcurrencyLimiter(scope, limit)
+    return _limiters[scope]
+
+
+@asynccontextmanager
+async def admit(route: str, timeout: Optional[float] = None) -> AsyncIterator[float]:
+    """
+    Admit a request to a route and give it a deadline.
+
+    Args:
+        route: Route being served
+        timeout: Seconds the request may take (defaults to ADMISSION_REQUEST_TIMEOUT)
+
+    Yields:
+        Absolute deadline on the time.monotonic() clock
+
+    Raises:
+        Overloaded: If the route is at its concurrency limit
+    """
+    async with get_route_limiter(route).acquire():
+        yield time.monotonic() + (timeout or settings.ADMISSION_REQUEST_TIMEOUT)
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """
+    Seconds left before a deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Tuple
+
+# Message field carrying the (timestamp, price) ticks a conflated event replaced
+CONFLATED_TICKS = "conflated_ticks"
+
+
+def conflate_batch(messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split a consumed batch into the newest event per symbol and the rest.
+
+    A moving average only needs computing for the newest tick of each
+    symbol; earlier ticks in the same batch still belong in its window but
+    need no calculation or history row of their own.
+
+    Args:
+        messages: Decoded price events in consumption order
+
+    Returns:
+        (latest, superseded): newest event per symbol in consumption order,
+        and every earlier event, also in order
+    """
+    last_index = {message.get("symbol"): i for i, message in enumerate(messages)}
+    latest, superseded = [], []
+    for i, message in enumerate(messages):
+        (latest if last_index[message.get("symbol")] == i else superseded).append(message)
+    return latest, superseded
+
+
+def message_ticks(message: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """
+    Ticks an event carries: ones it conflated, then its own.
+
+    Returns:
+        (isoformat timestamp, price) pairs, oldest first
+    """
+    ticks = [tuple(tick) for tick in message.get(CONFLATED_TICKS, [])]
+    if message.get("price") is not None and message.get("timestamp"):
+        ticks.append((message["timestamp"], message["price"]))
+    return ticks
+
+
+class ProducerConflator:
+    """
+    Coalesces outgoing price events per symbol between flushes.
+
+    Only the newest event per symbol is published; the ticks of events it
+    replaced ride along in its "conflated_ticks" field so consumers can
+    still fill their windows without extra messages.
+    """
+
+    def __init__(self):
+        """Initialize with nothing pending."""
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.conflated = 0
+
+    def add(self, message: Dict[str, Any]) -> None:
+        """Queue an event, replacing any pending event for the same symbol."""
+        symbol = message.get("symbol", "")
+        previous = self.pending.get(symbol)
+        if previous is not None:
+            message = dict(message)
+            message[CONFLATED_TICKS] = [list(tick) for tick in message_ticks(previous)]
+            self.conflated += 1
+        self.pending[symbol] = message
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every pending event for publishing."""
+        messages, self.pending = list(self.pending.values()), {}
+        return messages
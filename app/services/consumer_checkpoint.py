@@ -0,0 +1,138 @@
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from app.services.tick_store import SymbolSeries, TickStore
+
+logger = logging.getLogger(__name__)
+
+# File layout (little-endian):
+#   header     magic, version, created_at, partition count, symbol count
+#   partitions (partition, next position) pairs
+#   symbols    symbol length, symbol bytes, complete_from, tick count,
+#              then the raw timestamp array and the raw price array
+MAGIC = b"MACK"
+VERSION = 1
+HEADER = struct.Struct("<4sHdII")
+PARTITION = struct.Struct("<iq")
+SYMBOL_HEADER = struct.Struct("<H")
+SERIES_HEADER = struct.Struct("<qI")
+
+# complete_from value for series whose completeness is unknown
+UNKNOWN = -(2 ** 63) + 1
+
+
+class Checkpoint(NamedTuple):
+    """Consumer state restored from a snapshot file."""
+
+    created_at: float
+    positions: Dict[int, int]
+    series: Dict[str, SymbolSeries]
+
+
+def save_checkpoint(path: str, store: TickStore, positions: Dict[int, int], max_ticks: int) -> int:
+    """
+    Atomically write a snapshot of the tick store and transport positions.
+
+    Only the newest max_ticks ticks of each symbol are kept; that is enough
+    for the indicator windows and keeps the file small. The file is written
+    beside its destination, fsynced, then renamed over it, so readers only
+    ever see a complete snapshot.
+
+    Args:
+        path: Snapshot file path
+        store: Tick store to snapshot
+        positions: Next position to read per partition
+        max_ticks: Ticks kept per symbol
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    snapshot = store.snapshot(max_ticks)
+    chunks = [HEADER.pack(MAGIC, VERSION, time.time(), len(positions), len(snapshot))]
+    chunks.extend(PARTITION.pack(p, pos) for p, pos in sorted(positions.items()))
+
+    for symbol, complete_from, timestamps, prices in snapshot:
+        encoded = symbol.encode("utf-8")
+        chunks.append(SYMBOL_HEADER.pack(len(encoded)) + encoded)
+        chunks.append(SERIES_HEADER.pack(UNKNOWN if complete_from is None else complete_from, len(timestamps)))
+        chunks.append(timestamps.tobytes())
+        chunks.append(prices.tobytes())
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return sum(len(chunk) for chunk in chunks)
+
+
+def load_checkpoint(path: str, capacity: int) -> Optional[Checkpoint]:
+    """
+    Read a snapshot written by save_checkpoint.
+
+    Args:
+        path: Snapshot file path
+        capacity: Tick capacity for the restored series
+
+    Returns:
+        The checkpoint, or None if the file is missing or unreadable
+    """
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        return None
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        magic, version, created_at, partition_count, symbol_count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            logger.warning(f"Ignoring checkpoint {path}: unsupported format")
+            return None
+
+        try:
+            positions, series_by_symbol = _read_body(view, partition_count, symbol_count, capacity)
+        except (struct.error, ValueError) as e:
+            # A crash while an older writer was mid-file, or a damaged disk
+            logger.warning(f"Ignoring checkpoint {path}: unreadable ({e})")
+            return None
+
+    return Checkpoint(created_at, positions, series_by_symbol)
+
+
+def _read_body(
+    view: mmap.mmap, partition_count: int, symbol_count: int, capacity: int
+) -> Tuple[Dict[int, int], Dict[str, SymbolSeries]]:
+    """
+    Parse the partitions and series following the header.
+
+    Raises:
+        struct.error: If a header runs past the end of the file
+        ValueError: If a tick array is cut short or a symbol is not UTF-8
+    """
+    offset = HEADER.size
+    positions = {}
+    for _ in range(partition_count):
+        partition, position = PARTITION.unpack_from(view, offset)
+        positions[partition] = position
+        offset += PARTITION.size
+
+    series_by_symbol = {}
+    for _ in range(symbol_count):
+        (length,) = SYMBOL_HEADER.unpack_from(view, offset)
+        offset += SYMBOL_HEADER.size
+        symbol = view[offset:offset + length].decode("utf-8")
+        offset += length
+        complete_from, count = SERIES_HEADER.unpack_from(view, offset)
+        offset += SERIES_HEADER.size
+        if offset + count * 16 > len(view):
+            raise ValueError(f"tick arrays of {symbol} are truncated")
+
+        series = SymbolSeries(capacity)
+        series.timestamps.frombytes(view[offset:offset + count * 8])
+        offset += count * 8
+        series.prices.frombytes(view[offset:offset + count * 8])
+        offset += count * 8
+        series.complete_from = None if complete_from == UNKNOWN else complete_from
+        series_by_symbol[symbol] = series
+    return positions, series_by_symbol
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Dict, Any, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(worker_id: int, stats_queue, report_interval: float) -> None:
+    """
+    Entry point for a consumer worker process.
+
+    Runs a MovingAverageConsumer in the shared consumer group and pushes
+    its counters to the supervisor on a background thread, since the
+    consume loop itself blocks while polling.
+
+    Args:
+        worker_id: Index of this worker within the supervisor
+        stats_queue: Queue shared with the supervisor for stats reports
+        report_interval: Seconds between stats reports
+    """
+    # Imported here so the parent process never loads the consumer stack
+    from app.services.moving_average_consumer import MovingAverageConsumer
+
+    logging.basicConfig(level=logging.INFO)
+    # Let the supervisor handle Ctrl+C and shut workers down with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Each worker snapshots its own partitions' state
+    checkpoint_path = settings.CONSUMER_CHECKPOINT_PATH
+    consumer = MovingAverageConsumer(
+        checkpoint_path=f"{checkpoint_path}.{worker_id}" if checkpoint_path else None
+    )
+
+    def report():
+        """Periodically send this worker's stats to the supervisor."""
+        while True:
+            try:
+                stats = consumer.get_stats()
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed to collect stats: {e}")
+                stats = {}
+            stats.update(worker_id=worker_id, pid=os.getpid(), reported_at=time.time())
+            stats_queue.put(stats)
+            time.sleep(report_interval)
+
+    threading.Thread(target=report, name="stats-reporter", daemon=True).start()
+    asyncio.run(consumer.start_consuming())
+
+
+def _raise_keyboard_interrupt(signum, frame) -> None:
+    """Signal handler that unwinds the supervisor loop like Ctrl+C."""
+    raise KeyboardInterrupt
+
+
+class ConsumerSupervisor:
+    """
+    Runs several moving average consumers as separate processes.
+
+    Every worker joins the same Kafka consumer group, so partitions (and the
+    symbols keyed onto them) are split across processes by the broker while
+    per-symbol ordering is preserved. The supervisor restarts workers that
+    exit and aggregates their health and lag reports.
+
+    Only the Kafka backend splits partitions between processes. The memory
+    bus is process-local and the log backend keeps a single set of offsets
+    per topic, so with either of them several workers would miss or
+    double-process events.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        report_interval: Optional[float] = None,
+        status_file: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        """
+        Initialize supervisor configuration.
+
+        Args:
+            workers: Number of worker processes to run
+            report_interval: Seconds between worker stats reports
+            status_file: Optional path where aggregated health is written
+            backend: Event bus backend the workers use (defaults to EVENT_BUS_BACKEND)
+
+        Raises:
+            ValueError: If several workers are requested on a backend without consumer groups
+        """
+        backend = backend or settings.EVENT_BUS_BACKEND
+        if workers > 1 and backend != "kafka":
+            raise ValueError(
+                f"Event bus backend '{backend}' does not support multiple consumer workers; "
+                f"use EVENT_BUS_BACKEND=kafka or run a single worker"
+            )
+
+        self.workers = workers
+        self.report_interval = report_interval or settings.CONSUMER_REPORT_INTERVAL
+        self.status_file = status_file or settings.CONSUMER_STATUS_FILE
+
+        # Spawn avoids inheriting librdkafka threads/sockets from the parent
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stats_queue = self._ctx.Queue()
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._reports: Dict[int, Dict[str, Any]] = {}
+        self._restarts = 0
+        self._stopping = False
+
+    def _start_worker(self, worker_id: int) -> None:
+        """Spawn (or respawn) a single worker process."""
+        process = self._ctx.Process(
+            target=run_worker,
+            args=(worker_id, self._stats_queue, self.report_interval),
+            name=f"ma-consumer-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = process
+        logger.info(f"Started consumer worker {worker_id} (pid {process.pid})")
+
+    def start(self) -> None:
+        """Spawn all worker processes."""
+        for worker_id in range(self.workers):
+            self._start_worker(worker_id)
+
+    def stop(self) -> None:
+        """Terminate all worker processes and wait for them to exit."""
+        self._stopping = True
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes.values():
+            process.join(timeout=10)
+
+    def collect_reports(self, timeout: float = 0.0) -> None:
+        """
+        Drain pending stats reports from workers.
+
+        Args:
+            timeout: Seconds to wait for the first report
+        """
+        try:
+            while True:
+                report = self._stats_queue.get(timeout=timeout)
+                self._reports[report["worker_id"]] = report
+                timeout = 0.0  # Only block for the first report
+        except queue.Empty:
+            pass
+
+    def check_workers(self) -> None:
+        """Restart any worker process that has exited unexpectedly."""
+        if self._stopping:
+            return
+        for worker_id, process in list(self._processes.items()):
+            if not process.is_alive():
+                logger.warning(
+                    f"Consumer worker {worker_id} exited with code {process.exitcode}, restarting"
+                )
+                self._restarts += 1
+                self._reports.pop(worker_id, None)
+                self._start_worker(worker_id)
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Aggregate health and lag across workers.
+
+        A worker is considered stale if it has not reported within three
+        report intervals.
+
+        Returns:
+            Dict with overall status, totals and per-worker reports
+        """
+        now = time.time()
+        alive = sum(1 for p in self._processes.values() if p.is_alive())
+        stale = [
+            worker_id
+            for worker_id in self._processes
+            if now - self._reports.get(worker_id, {}).get("reported_at", 0)
+            > 3 * self.report_interval
+        ]
+        lags = [r["lag"] for r in self._reports.values() if r.get("lag") is not None]
+
+        return {
+            "status": "healthy" if alive == self.workers and not stale else "degraded",
+            "workers": self.workers,
+            "alive": alive,
+            "stale": stale,
+            "restarts": self._restarts,
+            "processed": sum(r.get("processed", 0) for r in self._reports.values()),
+            "errors": sum(r.get("errors", 0) for r in self._reports.values()),
+            "conflated": sum(r.get("conflated", 0) for r in self._reports.values()),
+            "lag_saved_seconds": sum(r.get("lag_saved_seconds", 0) for r in self._reports.values()),
+            "retried": sum(r.get("retried", 0) for r in self._reports.values()),
+            "dead_lettered": sum(r.get("dead_lettered", 0) for r in self._reports.values()),
+            "throughput": sum(r.get("throughput", 0) for r in self._reports.values()),
+            "lag": sum(lags) if lags else None,
+            "per_worker": [self._reports[k] for k in sorted(self._reports)],
+        }
+
+    def _write_status(self, health: Dict[str, Any]) -> None:
+        """Atomically write aggregated health to the status file."""
+        tmp_path = f"{self.status_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(health, f)
+        os.replace(tmp_path, self.status_file)
+
+    def run(self) -> None:
+        """Start workers and supervise them until interrupted."""
+        logging.basicConfig(level=logging.INFO)
+        # Route SIGTERM through the same shutdown path as Ctrl+C
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+        logger.info(f"Starting consumer supervisor with {self.workers} workers...")
+        self.start()
+        try:
+            while True:
+                self.collect_reports(timeout=self.report_interval)
+                self.check_workers()
+                health = self.health()
+                logger.info(
+                    f"Consumers {health['status']}: {health['alive']}/{health['workers']} alive, "
+                    f"processed={health['processed']} errors={health['errors']} lag={health['lag']} "
+                    f"retried={health['retried']} dead_lettered={health['dead_lettered']} "
+                    f"throughput={health['throughput']:.1f}/s"
+                )
+                if self.status_file:
+                    self._write_status(health)
+        except KeyboardInterrupt:
+            logger.info("Stopping consumer supervisor...")
+        finally:
+            self.stop()
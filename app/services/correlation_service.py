@@ -0,0 +1,317 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from sqlalchemy import select
+from app.core.config import settings
+from app.models.market_data import PricePoint
+from app.services.symbol_registry import get_symbol_registry
+from app.services.tick_store import EPOCH
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Supported bar sizes in seconds
+BAR_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+class CorrelationState:
+    """
+    Rolling log-return window and running sums for one (symbols, window, bar).
+
+    Keeps the last `window` bar returns as a dense (window x symbols) matrix
+    plus the column sums and the X^T X cross-product matrix, from which the
+    correlation matrix follows directly. A new bar adds its return row to the
+    sums and subtracts the row that falls out of the window, so an update
+    costs O(symbols^2) per bar instead of a full reload and recompute.
+    """
+
+    def __init__(self, last_bar: int, last_prices: "np.ndarray", returns: "np.ndarray"):
+        """
+        Initialize state from a fully computed window.
+
+        Args:
+            last_bar: Index (since epoch, in bars) of the newest closed bar
+            last_prices: Forward-filled close of that bar per symbol (NaN if never seen)
+            returns: (window x symbols) log returns, oldest first
+        """
+        self.last_bar = last_bar
+        self.last_prices = last_prices
+        self.returns = returns
+        self._resum()
+
+    def _resum(self) -> None:
+        """Recompute the running sums from the window (bounds float drift)."""
+        self.sums = self.returns.sum(axis=0)
+        self.cross = self.returns.T @ self.returns
+        self.updates = 0
+
+    def advance(self, last_bar: int, last_prices: "np.ndarray", new_returns: "np.ndarray") -> None:
+        """
+        Slide the window forward by len(new_returns) bars.
+
+        Args:
+            last_bar: Index of the new newest closed bar
+            last_prices: Forward-filled closes of that bar
+            new_returns: Return rows for the bars added, oldest first
+        """
+        import numpy as np
+
+        k = len(new_returns)
+        dropped = self.returns[:k]
+        self.sums += new_returns.sum(axis=0) - dropped.sum(axis=0)
+        self.cross += new_returns.T @ new_returns - dropped.T @ dropped
+        self.returns = np.concatenate([self.returns[k:], new_returns])
+        self.last_bar = last_bar
+        self.last_prices = last_prices
+
+        self.updates += k
+        if self.updates >= len(self.returns):
+            self._resum()
+
+    def correlation(self) -> "np.ndarray":
+        """Pearson correlation matrix of the window (NaN for flat or unseen symbols)."""
+        import numpy as np
+
+        n = len(self.returns)
+        cov = (self.cross - np.outer(self.sums, self.sums) / n) / (n - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return np.clip(corr, -1.0, 1.0)
+
+
+def forward_fill(prices: "np.ndarray", seed: Optional["np.ndarray"] = None) -> "np.ndarray":
+    """
+    Fill NaN gaps in a (bars x symbols) price matrix with the previous close.
+
+    Leading gaps take the seed (the close before the matrix starts) when
+    known, otherwise the symbol's first close in the matrix, which makes
+    their returns zero instead of undefined.
+
+    Args:
+        prices: Bar closes with NaN where a symbol had no tick in a bar
+        seed: Close per symbol before the first row
+
+    Returns:
+        Filled copy of prices
+    """
+    import numpy as np
+
+    if seed is not None:
+        prices = np.vstack([seed, prices])
+    rows = np.arange(len(prices))[:, None]
+    last_seen = np.maximum.accumulate(np.where(np.isnan(prices), 0, rows), axis=0)
+    filled = prices[last_seen, np.arange(prices.shape[1])]
+
+    # Back-fill leading gaps from each symbol's first close
+    first_valid = np.argmax(~np.isnan(filled), axis=0)
+    first_close = filled[first_valid, np.arange(filled.shape[1])]
+    filled = np.where(np.isnan(filled), first_close, filled)
+    return filled[1:] if seed is not None else filled
+
+
+def log_returns(prices: "np.ndarray") -> "np.ndarray":
+    """Bar-to-bar log returns of a filled price matrix (0 where undefined)."""
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(prices), axis=0)
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class CorrelationCache:
+    """Bounded LRU of CorrelationState keyed by (symbols, window, bar)."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Number of (symbols, window, bar) states kept
+        """
+        self.max_entries = max_entries or settings.CORRELATION_CACHE_SIZE
+        self._states: "OrderedDict[tuple, CorrelationState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.updates = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[CorrelationState]:
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+            return state
+
+    def put(self, key: tuple, state: CorrelationState) -> None:
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+_cache: Optional[CorrelationCache] = None
+
+
+def get_correlation_cache() -> CorrelationCache:
+    """Return the process-wide correlation cache."""
+    global _cache
+    if _cache is None:
+        _cache = CorrelationCache()
+    return _cache
+
+
+class CorrelationService:
+    """
+    Cross-symbol log-return correlation over stored price_points.
+
+    Ticks are aligned into a dense (bars x symbols) matrix of bar closes, so
+    returns and the correlation matrix come out of a few vectorized NumPy
+    operations. Only closed bars are used, which makes the newest closed bar
+    a stable cache version: repeated requests within a bar are served from
+    the cache and a new bar only loads and folds in the bars since the last
+    computation.
+    """
+
+    def __init__(self, db, cache: Optional[CorrelationCache] = None):
+        """
+        Initialize service.
+
+        Args:
+            db: Database session
+            cache: Correlation cache (defaults to the process-wide one)
+        """
+        self.db = db
+        self.cache = cache if cache is not None else get_correlation_cache()
+
+    def _bar_matrix(
+        self, symbol_ids: List[Optional[int]], first_bar: int, bars: int, bar_seconds: int
+    ) -> "np.ndarray":
+        """
+        Load ticks for [first_bar, first_bar + bars) as a matrix of bar closes.
+
+        Args:
+            symbol_ids: Dictionary ID per column (None for unknown symbols)
+            first_bar: Index of the first bar since epoch
+            bars: Number of bars
+            bar_seconds: Bar size
+
+        Returns:
+            (bars x symbols) closes, NaN where a symbol had no tick in a bar
+        """
+        import numpy as np
+
+        matrix = np.full((bars, len(symbol_ids)), np.nan)
+        columns = {symbol_id: i for i, symbol_id in enumerate(symbol_ids) if symbol_id is not None}
+        if not columns or bars <= 0:
+            return matrix
+
+        start = EPOCH + timedelta(seconds=first_bar * bar_seconds)
+        end = start + timedelta(seconds=bars * bar_seconds)
+        rows = self.db.execute(
+            select(PricePoint.symbol_id, PricePoint.timestamp, PricePoint.price)
+            .where(
+                PricePoint.symbol_id.in_(list(columns)),
+                PricePoint.timestamp >= start,
+                PricePoint.timestamp < end,
+            )
+            .order_by(PricePoint.timestamp)
+        ).all()
+        if not rows:
+            return matrix
+
+        ids, timestamps, prices = zip(*rows)
+        seconds = (np.array(timestamps, dtype="datetime64[us]") - np.datetime64(start, "us")) // np.timedelta64(1, "s")
+        bar_index = seconds // bar_seconds
+        column = np.fromiter((columns[i] for i in ids), dtype=np.int64, count=len(ids))
+
+        # Rows are time ordered; keep the last tick of each (bar, symbol) cell
+        cells = bar_index * len(symbol_ids) + column
+        _, last = np.unique(cells[::-1], return_index=True)
+        last = len(cells) - 1 - last
+        matrix[bar_index[last], column[last]] = np.asarray(prices)[last]
+        return matrix
+
+    def correlation(
+        self,
+        symbols: List[str],
+        window: int,
+        bar: str = "1m",
+        include_returns: bool = False,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Correlation matrix of bar log returns for a set of symbols.
+
+        Args:
+            symbols: Uppercase tickers (order defines matrix order)
+            window: Number of returns (bars) in the window
+            bar: Bar size, a key of BAR_SECONDS
+            include_returns: Also return the (window x symbols) returns matrix
+            now: Current time (defaults to utcnow); only bars closed by now count
+
+        Returns:
+            Dict with symbols, window, bar, as_of (start of the newest closed
+            bar), the correlation matrix (None where undefined) and optionally
+            the returns
+        """
+        import numpy as np
+
+        bar_seconds = BAR_SECONDS[bar]
+        now = now or datetime.utcnow()
+        last_bar = int((now - EPOCH).total_seconds()) // bar_seconds - 1
+        key = (tuple(symbols), window, bar)
+
+        state = self.cache.get(key)
+        if state is not None and state.last_bar == last_bar:
+            self.cache.hits += 1
+        else:
+            symbol_ids = get_symbol_registry().symbol_ids(self.db, symbols, create=False)
+            ids = [symbol_ids.get(symbol) for symbol in symbols]
+            new_bars = last_bar - state.last_bar if state is not None else 0
+
+            if state is not None and 0 < new_bars < window:
+                # Fold in only the bars closed since the last computation
+                closes = self._bar_matrix(ids, state.last_bar + 1, new_bars, bar_seconds)
+                filled = forward_fill(closes, seed=state.last_prices)
+                # Symbols first seen in this update get a zero first return
+                returns = log_returns(np.vstack([state.last_prices, filled]))
+                state.advance(last_bar, filled[-1], returns)
+                self.cache.updates += 1
+            else:
+                closes = self._bar_matrix(ids, last_bar - window, window + 1, bar_seconds)
+                filled = forward_fill(closes)
+                state = CorrelationState(last_bar, filled[-1], log_returns(filled))
+                self.cache.misses += 1
+            self.cache.put(key, state)
+
+        corr = state.correlation()
+        result = {
+            "symbols": list(symbols),
+            "window": window,
+            "bar": bar,
+            "as_of": EPOCH + timedelta(seconds=state.last_bar * bar_seconds),
+            "matrix": _to_lists(corr),
+        }
+        if include_returns:
+            result["returns"] = _to_lists(state.returns)
+        return result
+
+
+def _to_lists(matrix: "np.ndarray") -> List[List[Optional[float]]]:
+    """Convert a float matrix to nested lists with None in place of NaN."""
+    import numpy as np
+
+    return np.where(np.isnan(matrix), None, matrix).tolist()
@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Iterator, List, Optional, TYPE_CHECKING
+from sqlalchemy import select
+from app.core.config import settings
+from app.models.market_data import PricePoint, Provider, Symbol
+from app.services.symbol_registry import get_symbol_registry
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Wire formats supported by the export, mapped to their media types
+EXPORT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def price_schema() -> "pa.Schema":
+    """Arrow schema of exported price rows."""
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("symbol", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("price", pa.float64()),
+            ("provider", pa.string()),
+        ]
+    )
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes back in chunks.
+
+    Arrow/Parquet writers record absolute offsets, so tell() reports the
+    total bytes written even after buffered chunks have been drained.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """Return and clear everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """
+    Streams price history out of the database as Arrow record batches.
+
+    Rows are read with a server-side cursor in fixed-size chunks and turned
+    into columns directly, without building ORM objects, so memory stays
+    bounded by the chunk size regardless of the requested range.
+    """
+
+    def __init__(self, engine, chunk_size: Optional[int] = None):
+        """
+        Initialize export service.
+
+        Args:
+            engine: Engine to read from (a dedicated connection is opened per export)
+            chunk_size: Rows fetched per round trip and per record batch
+        """
+        self.engine = engine
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+
+    def iter_record_batches(
+        self,
+        symbols: List[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator["pa.RecordBatch"]:
+        """
+        Read price points for symbols in [start, end) as record batches.
+
+        Args:
+            symbols: Stock symbols to export
+            start: Inclusive lower timestamp bound
+            end: Exclusive upper timestamp bound
+
+        Yields:
+            Arrow record batches of at most chunk_size rows
+        """
+        import pyarrow as pa
+
+        schema = price_schema()
+        symbol_ids = get_symbol_registry().symbol_ids(
+            self.engine, [s.upper() for s in symbols], create=False
+        )
+        # Tickers and provider names come back from the small dictionary tables
+        query = (
+            select(Symbol.ticker, PricePoint.timestamp, PricePoint.price, Provider.name)
+            .join(Symbol, Symbol.id == PricePoint.symbol_id)
+            .join(Provider, Provider.id == PricePoint.provider_id)
+            .where(PricePoint.symbol_id.in_(symbol_ids.values()))
+            .order_by(Symbol.ticker, PricePoint.timestamp)
+        )
+        if start:
+            query = query.where(PricePoint.timestamp >= start)
+        if end:
+            query = query.where(PricePoint.timestamp < end)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=self.chunk_size
+            ).execute(query)
+            for rows in result.partitions():
+                # Transpose row tuples into columns in one pass
+                columns = list(zip(*rows))
+                yield pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                )
+
+    def stream(
+        self,
+        symbols: List[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        format: str = "parquet",
+    ) -> Iterator[bytes]:
+        """
+        Encode the export as a Parquet file or Arrow IPC stream, chunk by chunk.
+
+        Each record batch becomes one Parquet row group (or IPC message) and
+        its bytes are yielded as soon as they are written.
+
+        Args:
+            symbols: Stock symbols to export
+            start: Inclusive lower timestamp bound
+            end: Exclusive upper timestamp bound
+            format: "parquet" or "arrow"
+
+        Yields:
+            Encoded file bytes
+        """
+        import pyarrow as pa
+
+        if format not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported export format: {format}")
+
+        sink = _ChunkSink()
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), price_schema())
+        else:
+            writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), price_schema())
+
+        try:
+            for batch in self.iter_record_batches(symbols, start, end):
+                writer.write_batch(batch)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()  # Footer / end-of-stream marker
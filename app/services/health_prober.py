@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.services.kafka_service import KafkaService
+
+logger = logging.getLogger(__name__)
+
+# Upstream endpoints used to check that providers are reachable
+PROVIDER_ENDPOINTS = {
+    "yfinance": "https://query1.finance.yahoo.com",
+    "alpha_vantage": "https://www.alphavantage.co",
+}
+
+
+class HealthProber:
+    """
+    Background dependency checker serving a cached health snapshot.
+
+    Probes the database pool, Kafka metadata, Redis and provider endpoints
+    on a fixed interval so health endpoints only read the latest snapshot
+    instead of hitting dependencies on every liveness/readiness probe.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        kafka_service: Optional[KafkaService] = None,
+        redis_url: Optional[str] = None,
+        provider_endpoints: Optional[Dict[str, str]] = None,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        replica_router=None,
+    ):
+        """
+        Initialize prober configuration.
+
+        Args:
+            engine: Database engine to check (None skips the check)
+            kafka_service: Kafka service to check (None skips the check)
+            redis_url: Redis URL to ping (None or empty skips the check)
+            provider_endpoints: Provider name -> URL to check reachability of
+            interval: Seconds between probe rounds
+            timeout: Per-dependency timeout in seconds
+            replica_router: ReplicaRouter whose replicas' lag is checked
+        """
+        self.engine = engine
+        self.kafka_service = kafka_service
+        self.redis_url = redis_url
+        self.provider_endpoints = provider_endpoints or {}
+        self.interval = interval or settings.HEALTH_PROBE_INTERVAL
+        self.timeout = timeout or settings.HEALTH_PROBE_TIMEOUT
+        self.replica_router = replica_router
+
+        self.snapshot: Dict[str, Any] = {}
+        self.last_probe_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _check_database(self) -> None:
+        """Run SELECT 1 on a pooled connection."""
+        def _select_one():
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1")).fetchone()
+
+        await asyncio.to_thread(_select_one)
+
+    def _check_replica(self, index: int) -> Callable[[], Awaitable[None]]:
+        """Build a check that a read replica is within the staleness bound."""
+        async def _check():
+            router = self.replica_router
+            lag = await asyncio.to_thread(router.lag_probe, router.replicas[index])
+            if lag > router.max_lag:
+                raise RuntimeError(f"Replica lag {lag:.1f}s exceeds {router.max_lag}s")
+
+        return _check
+
+    async def _check_kafka(self) -> None:
+        """Fetch topic metadata from the broker."""
+        await asyncio.to_thread(self.kafka_service.check_connection, self.timeout)
+
+    async def _check_redis(self) -> None:
+        """PING the Redis server."""
+        import redis.asyncio as redis
+
+        client = redis.from_url(self.redis_url, socket_timeout=self.timeout)
+        try:
+            await client.ping()
+        finally:
+            await client.close()
+
+    def _check_provider(self, url: str) -> Callable[[], Awaitable[None]]:
+        """Build a check that a provider endpoint answers HTTP at all."""
+        async def _check():
+            import httpx
+
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                await client.head(url)
+
+        return _check
+
+    def _checks(self) -> Dict[str, Callable[[], Awaitable[None]]]:
+        """Checks to run this round, keyed by dependency name."""
+        checks = {}
+        if self.engine is not None:
+            checks["database"] = self._check_database
+        if self.replica_router is not None:
+            for index in range(len(self.replica_router.replicas)):
+                checks[f"replica:{index}"] = self._check_replica(index)
+        if self.kafka_service is not None:
+            checks["kafka"] = self._check_kafka
+        if self.redis_url:
+            checks["redis"] = self._check_redis
+        for name, url in self.provider_endpoints.items():
+            checks[f"provider:{name}"] = self._check_provider(url)
+        return checks
+
+    async def _run_check(self, check: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+        """Run one check with a timeout and measure its latency."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            status, error = "healthy", None
+        except Exception as e:
+            status, error = "unhealthy", str(e) or type(e).__name__
+        return {
+            "status": status,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            "error": error,
+        }
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """
+        Check every dependency concurrently and replace the cached snapshot.
+
+        Returns:
+            The new snapshot
+        """
+        checks = self._checks()
+        results = await asyncio.gather(*(self._run_check(c) for c in checks.values()))
+        dependencies = dict(zip(checks, results))
+
+        database_ok = dependencies.get("database", {}).get("status") == "healthy"
+        all_ok = all(d["status"] == "healthy" for d in dependencies.values())
+
+        self.snapshot = {
+            "status": "healthy" if all_ok else ("degraded" if database_ok else "unhealthy"),
+            "checked_at": datetime.utcnow(),
+            "ready": database_ok,
+            "dependencies": dependencies,
+        }
+        self.last_probe_at = time.monotonic()
+        return self.snapshot
+
+    def dependency_status(self, name: str) -> str:
+        """Cached status of one dependency ("not_configured" if never checked)."""
+        return self.snapshot.get("dependencies", {}).get(name, {}).get("status", "not_configured")
+
+    def is_ready(self) -> bool:
+        """Ready once a probe has completed and the database is reachable."""
+        return bool(self.snapshot.get("ready"))
+
+    def is_live(self) -> bool:
+        """Live unless the probe loop has stopped making progress."""
+        if self._task is None or self.last_probe_at is None:
+            return True  # Not started (or first round still running)
+        if self._task.done():
+            return False
+        return time.monotonic() - self.last_probe_at < 3 * self.interval + self.timeout
+
+    async def run(self) -> None:
+        """Probe forever on the configured interval."""
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background probe loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background probe loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,126 +1,401 @@
 import json
 import asyncio
-from typing import Dict, Any, Optional, Callable, Awaitable
-from confluent_kafka import Producer, Consumer, KafkaError
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from app.core.config import settings
+from app.services.conflation import ProducerConflator
+from app.services.transports import BaseTransport, get_transport
+from app.services.transports.base import Event
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Body fields carrying failure metadata through the retry and dead-letter topics
+RETRY_FIELD = "retry"
+DEAD_LETTER_FIELD = "dead_letter"
+
+
+def retry_delays() -> List[float]:
+    """Backoff before each retry, in seconds (EVENT_RETRY_DELAYS)."""
+    return [float(delay) for delay in settings.EVENT_RETRY_DELAYS.split(",") if delay.strip()]
+
+
+def retry_topic(lane: int) -> str:
+    """Topic holding events waiting for their lane-th retry (1-based)."""
+    return f"{settings.KAFKA_TOPIC_PRICE_EVENTS}.retry.{lane}"
+
 
 class KafkaService:
     """
-    Kafka messaging service for producing and consuming price events.
+    Messaging service for producing and consuming price events.
     
     Handles real-time message streaming between API and background processors.
-    Uses lazy initialization for producer/consumer instances.
+    The wire transport is pluggable (EVENT_BUS_BACKEND): a Kafka cluster, an
+    in-process asyncio bus, or an append-only log on local disk. Backends are
+    imported on first use, so confluent_kafka is only loaded for "kafka".
     """
     
-    def __init__(self):
-        """Initialize Kafka configurations for producer and consumer."""
-        # Producer configuration for publishing price events
-        self.producer_config = {
-            "bootstrap.servers": settings.KAFKA_BOOTSTRAP_SERVERS,
-            "client.id": "market-data-producer",
-        }
-        
-        # Consumer configuration for processing price events
-        self.consumer_config = {
-            "bootstrap.servers": settings.KAFKA_BOOTSTRAP_SERVERS,
-            "group.id": "market-data-consumers",
-            "auto.offset.reset": "earliest",  # Start from beginning if no offset
-        }
-        
-        # Lazy initialization - created when first needed
-        self.producer: Optional[Producer] = None
-        self.consumer: Optional[Consumer] = None
-
-    def get_producer(self) -> Producer:
-        """Get or create Kafka producer instance (lazy initialization)."""
-        if not self.producer:
-            self.producer = Producer(self.producer_config)
-        return self.producer
-
-    def get_consumer(self) -> Consumer:
-        """Get or create Kafka consumer instance (lazy initialization)."""
-        if not self.consumer:
-            self.consumer = Consumer(self.consumer_config)
-        return self.consumer
+    def __init__(self, transport: Optional[BaseTransport] = None):
+        """
+        Initialize messaging service.
+
+        Args:
+            transport: Transport to use (defaults to EVENT_BUS_BACKEND)
+        """
+        self.transport = transport or get_transport(settings.EVENT_BUS_BACKEND)
+        # Producer-side conflation (PRODUCER_CONFLATE_INTERVAL > 0)
+        self.conflator: Optional[ProducerConflator] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        if settings.PRODUCER_CONFLATE_INTERVAL > 0:
+            self.conflator = ProducerConflator()
+
+        # Consumption counters (see get_consume_stats)
+        self.stats = {"consumed": 0, "failed": 0, "retried": 0, "dead_lettered": 0, "transport_errors": 0}
+        self._throughput_mark = (0, time.monotonic())
+        self._poll_failures: Dict[int, int] = {}
 
     async def produce_price_event(self, message: Dict[str, Any]) -> None:
         """
-        Publish price event to Kafka topic.
+        Publish price event to the price events topic.
+
+        With producer conflation enabled the event is queued instead and
+        published by a periodic flush, superseding any queued event for the
+        same symbol.
         
         Args:
             message: Price data containing symbol, price, timestamp, etc.
         """
-        producer = self.get_producer()
-        
-        def delivery_callback(err, msg):
-            """Callback to handle message delivery confirmation."""
-            if err:
-                logger.error(f"Failed to deliver message: {err}")
-            else:
-                logger.info(f"Message delivered to {msg.topic()} [{msg.partition()}]")
+        if self.conflator is not None:
+            self.conflator.add(message)
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_periodically())
+            return
+        await self._publish(message)
+
+    async def _flush_periodically(self) -> None:
+        """Publish conflated events every PRODUCER_CONFLATE_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(settings.PRODUCER_CONFLATE_INTERVAL)
+            await self.flush()
 
+    async def flush(self) -> None:
+        """Publish every queued conflated event now."""
+        if self.conflator is None:
+            return
+        for message in self.conflator.drain():
+            try:
+                await self._publish(message)
+            except Exception:
+                pass  # Already logged; the next tick for the symbol supersedes it
+
+    async def _publish(self, message: Dict[str, Any], topic: Optional[str] = None) -> None:
+        """Serialize and publish one event (to the price events topic by default)."""
         try:
             # Publish message to price-events topic
-            producer.produce(
-                topic=settings.KAFKA_TOPIC_PRICE_EVENTS,
-                key=message.get("symbol", "").encode("utf-8"),     # Use symbol as key for partitioning
-                value=json.dumps(message, default=str).encode("utf-8"),  # JSON serialize message
-                callback=delivery_callback,
+            await self.transport.publish(
+                topic or settings.KAFKA_TOPIC_PRICE_EVENTS,
+                message.get("symbol", "").encode("utf-8"),     # Use symbol as key for partitioning
+                json.dumps(message, default=str).encode("utf-8"),  # JSON serialize message
             )
-            # Wait for message to be delivered
-            producer.flush(timeout=1.0)
         except Exception as e:
             logger.error(f"Error producing message: {e}")
             raise
 
     async def consume_price_events(
-        self, callback: Callable[[Dict[str, Any]], Awaitable[None]]
+        self,
+        callback: Callable[[Dict[str, Any]], Awaitable[None]],
+        start_positions: Optional[Dict[int, int]] = None,
     ) -> None:
         """
-        Consume price events from Kafka topic.
+        Consume price events from the price events topic.
+
+        An event whose callback raises is moved to the first retry topic and
+        the main topic moves on; retry topics are consumed alongside it (see
+        _consume_retry_lane). Transport errors are logged and polling resumes
+        after a backoff instead of ending the loop.
         
         Args:
             callback: Async function to process each message
+            start_positions: Next position to read per partition, overriding
+                the group's committed positions
         """
-        consumer = self.get_consumer()
         # Subscribe to price events topic
-        consumer.subscribe([settings.KAFKA_TOPIC_PRICE_EVENTS])
+        self.transport.subscribe(settings.KAFKA_TOPIC_PRICE_EVENTS, start_positions)
 
-        try:
+        async def consume():
             while True:
-                # Poll for new messages
-                msg = consumer.poll(timeout=1.0)
+                for event in await self._poll(self.transport):
+                    message = await self._decode(event)
+                    if message is not None:
+                        await self._process(callback, message)
 
-                if msg is None:
-                    continue  # No message available
+        await self._run_with_retry_lanes(consume(), callback)
+
+    async def consume_price_event_batches(
+        self,
+        callback: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_batch: Optional[int] = None,
+        start_positions: Optional[Dict[int, int]] = None,
+    ) -> None:
+        """
+        Consume price events in batches of whatever has already arrived.
+
+        If a batch fails, its events are processed again one at a time so
+        only the failing ones go to the retry topics.
+
+        Args:
+            callback: Async function to process each batch of messages
+            max_batch: Largest batch (defaults to CONSUMER_BATCH_SIZE)
+            start_positions: Next position to read per partition, overriding
+                the group's committed positions
+        """
+        self.transport.subscribe(settings.KAFKA_TOPIC_PRICE_EVENTS, start_positions)
 
-                # Check for consumer errors
-                if msg.error():
-                    if msg.error().code() == KafkaError._PARTITION_EOF:
-                        continue  # End of partition, not an error
-                    else:
-                        logger.error(f"Consumer error: {msg.error()}")
-                        break
+        async def process_one(message: Dict[str, Any]) -> None:
+            await callback([message])
 
+        async def consume():
+            while True:
+                events = await self._poll(self.transport, max_batch or settings.CONSUMER_BATCH_SIZE)
+                batch = [m for m in [await self._decode(event) for event in events] if m is not None]
+                if not batch:
+                    continue  # No message available
                 try:
-                    # Deserialize and process message
-                    message_data = json.loads(msg.value().decode("utf-8"))
-                    await callback(message_data)  # Call async callback
+                    await callback(batch)
                 except Exception as e:
-                    logger.error(f"Error processing message: {e}")
+                    logger.warning(f"Batch of {len(batch)} events failed ({e}), processing them one by one")
+                    for message in batch:
+                        await self._process(process_one, message)
+
+        await self._run_with_retry_lanes(consume(), process_one)
+
+    async def _run_with_retry_lanes(
+        self, consume: Awaitable[None], callback: Callable[[Dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """Run a main consume loop with one task per retry topic; close everything after."""
+        lanes = [
+            asyncio.create_task(self._consume_retry_lane(lane, callback))
+            for lane in range(1, len(retry_delays()) + 1)
+        ]
+        try:
+            await consume
+        finally:
+            for task in lanes:
+                task.cancel()
+            await asyncio.gather(*lanes, return_exceptions=True)
+            self.transport.close()
+
+    async def _consume_retry_lane(
+        self, lane: int, callback: Callable[[Dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        """
+        Process events waiting in one retry topic once their delay has passed.
+
+        Every event in a lane was delayed by the same amount, so they come
+        due in the order they were published and the lane can simply sleep
+        until its head is due without holding back anything that is ready.
+        """
+        transport = self.transport.sibling(f"retry.{lane}")
+        transport.subscribe(retry_topic(lane))
+        try:
+            while True:
+                for event in await self._poll(transport):
+                    message = await self._decode(event)
+                    if message is None:
+                        continue
+                    wait = message.get(RETRY_FIELD, {}).get("not_before", 0) - time.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    await self._process(callback, message, attempt=lane)
+        finally:
+            transport.close()
+
+    async def _poll(self, transport: BaseTransport, max_messages: Optional[int] = None) -> List[Event]:
+        """
+        Next event (or batch) from a transport.
 
+        Transport errors are counted and logged, then polling backs off
+        exponentially (up to 5 seconds) rather than stopping the consumer.
+        """
+        try:
+            if max_messages:
+                events = await transport.poll_batch(max_messages, timeout=1.0)
+            else:
+                event = await transport.poll(timeout=1.0)
+                events = [event] if event is not None else []
+        except Exception as e:
+            failures = self._poll_failures.get(id(transport), 0) + 1
+            self._poll_failures[id(transport)] = failures
+            self.stats["transport_errors"] += 1
+            logger.error(f"Consumer error (attempt {failures}): {e}")
+            await asyncio.sleep(min(0.1 * 2 ** failures, 5.0))
+            return []
+        self._poll_failures.pop(id(transport), None)
+        self.stats["consumed"] += len(events)
+        return events
+
+    async def _decode(self, event: Event) -> Optional[Dict[str, Any]]:
+        """Deserialize an event; undecodable ones go straight to the dead-letter topic."""
+        try:
+            return json.loads(event.value.decode("utf-8"))
         except Exception as e:
-            logger.error(f"Consumer error: {e}")
+            logger.error(f"Error decoding message: {e}")
+            raw = {
+                "symbol": bytes(event.key).decode("utf-8", "replace"),
+                "raw": bytes(event.value).decode("utf-8", "replace"),
+            }
+            await self.dead_letter(raw, f"Undecodable message: {e}", attempts=0)
+            return None
+
+    async def _process(
+        self,
+        callback: Callable[[Dict[str, Any]], Awaitable[None]],
+        message: Dict[str, Any],
+        attempt: int = 0,
+    ) -> None:
+        """Run the callback; on failure schedule the next retry or dead-letter the event."""
+        try:
+            await callback(message)
+        except Exception as e:
+            self.stats["failed"] += 1
+            reason = f"{type(e).__name__}: {e}"
+            delays = retry_delays()
+            message = {k: v for k, v in message.items() if k != RETRY_FIELD}
+            if attempt >= len(delays):
+                await self.dead_letter(message, reason, attempts=attempt)
+                return
+            message[RETRY_FIELD] = {
+                "attempt": attempt + 1,
+                "not_before": time.time() + delays[attempt],
+                "error": reason,
+            }
+            try:
+                await self._publish(message, retry_topic(attempt + 1))
+            except Exception:
+                logger.error(f"Event for {message.get('symbol')} lost: could not schedule retry")
+                return
+            self.stats["retried"] += 1
+            logger.warning(
+                f"Event for {message.get('symbol')} failed ({reason}), retry {attempt + 1} in {delays[attempt]}s"
+            )
+
+    async def dead_letter(self, message: Dict[str, Any], reason: str, attempts: int) -> None:
+        """
+        Park an event on the dead-letter topic with the reason it failed.
+
+        Args:
+            message: Event body (retry metadata already removed)
+            reason: Last error
+            attempts: Retries made before giving up
+        """
+        message = {
+            **message,
+            DEAD_LETTER_FIELD: {
+                "reason": reason,
+                "attempts": attempts,
+                "failed_at": datetime.utcnow().isoformat(),
+            },
+        }
+        try:
+            await self._publish(message, settings.KAFKA_TOPIC_DEAD_LETTER)
+        except Exception:
+            logger.error(f"Event for {message.get('symbol')} lost: could not dead-letter it ({reason})")
+            return
+        self.stats["dead_lettered"] += 1
+        logger.error(f"Event for {message.get('symbol')} dead-lettered after {attempts} retries: {reason}")
+
+    async def replay_dead_letters(self, limit: Optional[int] = None, idle: float = 5.0) -> Dict[str, int]:
+        """
+        Move dead-lettered events back onto the price events topic.
+
+        Failure metadata is stripped, so replayed events get the full set of
+        retries again. Undecodable events are republished as their original
+        bytes.
+
+        Args:
+            limit: Most events to replay (None for all)
+            idle: Stop after this many seconds without a dead-lettered event
+
+        Returns:
+            Number of replayed events per failure reason
+        """
+        reader = self.transport.sibling("dlq-replay")
+        reader.subscribe(settings.KAFKA_TOPIC_DEAD_LETTER)
+        replayed: Dict[str, int] = {}
+        try:
+            while limit is None or sum(replayed.values()) < limit:
+                event = await reader.poll(timeout=idle)
+                if event is None:
+                    break
+                message = json.loads(event.value.decode("utf-8"))
+                reason = message.pop(DEAD_LETTER_FIELD, {}).get("reason", "unknown")
+                message.pop(RETRY_FIELD, None)
+                if set(message) == {"symbol", "raw"}:
+                    await self.transport.publish(
+                        settings.KAFKA_TOPIC_PRICE_EVENTS,
+                        message["symbol"].encode("utf-8"),
+                        message["raw"].encode("utf-8"),
+                    )
+                else:
+                    await self._publish(message)
+                replayed[reason] = replayed.get(reason, 0) + 1
         finally:
-            consumer.close()
+            reader.close()
+        return replayed
+
+    def get_consume_stats(self) -> Dict[str, Any]:
+        """
+        Consumption counters and throughput since the previous call.
+
+        Returns:
+            Dict with consumed, failed, retried, dead_lettered and
+            transport_errors counts, and throughput in events per second
+        """
+        now = time.monotonic()
+        consumed, since = self._throughput_mark
+        elapsed = now - since
+        self._throughput_mark = (self.stats["consumed"], now)
+        return {
+            **self.stats,
+            "throughput": round((self.stats["consumed"] - consumed) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def get_consumer_lag(self) -> Optional[int]:
+        """
+        Total lag of this consumer across its partitions.
+
+        Cheap enough to call from a reporting thread while the consume loop
+        is polling.
+
+        Returns:
+            Number of messages behind the log end, or None if not consuming
+        """
+        return self.transport.lag()
+
+    def get_consumer_positions(self) -> Dict[int, int]:
+        """
+        Next position to read per partition, for events processed so far.
+
+        Returns:
+            Mapping of partition to position
+        """
+        return self.transport.positions()
+
+    def check_connection(self, timeout: float) -> None:
+        """
+        Confirm the event bus is reachable.
+
+        Args:
+            timeout: Seconds to wait for the backend
+
+        Raises:
+            Exception: If the backend does not answer within the timeout
+        """
+        self.transport.check_connection(timeout)
 
     def close(self):
-        """Clean up producer and consumer connections."""
-        if self.producer:
-            self.producer.flush()  # Ensure all messages are sent
-        if self.consumer:
-            self.consumer.close()
\ No newline at end of file
+        """Flush pending messages and close transport connections."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        self.transport.close()
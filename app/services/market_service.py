@@ -1,17 +1,46 @@
+import asyncio
 import json
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import desc
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from app.models.database import dialect_insert, is_statement_timeout, set_statement_timeout
 from app.models.market_data import (
     PricePoint,
     RawMarketResponse,
     MovingAverage,
-    PollingJob,
+    LatestMovingAverage,
 )
+from app.services.admission import DeadlineExceeded, get_provider_limiter, remaining
 from app.services.providers import get_provider
 from app.services.kafka_service import KafkaService
+from app.services.polling_service import PollingService
+from app.services.quote_table import get_quote_table
+from app.services.symbol_registry import get_symbol_registry
+from app.services.tick_store import get_tick_store
 import uuid
 
+# Namespace for deterministic price event IDs
+PRICE_EVENT_NAMESPACE = uuid.UUID("6f1c1a52-3b7e-4f0e-9d43-8a1f2c5e7b90")
+
+
+def price_event_id(symbol: str, provider: str, timestamp: datetime) -> uuid.UUID:
+    """
+    Derive the stable ID of a quote from its natural key.
+
+    Args:
+        symbol: Stock symbol
+        provider: Provider that supplied the quote
+        timestamp: Source quote time
+
+    Returns:
+        UUID shared by the price point row and its Kafka event
+    """
+    return uuid.uuid5(
+        PRICE_EVENT_NAMESPACE, f"{symbol.upper()}|{provider}|{timestamp.isoformat()}"
+    )
+
 
 class MarketService:
     """
@@ -26,59 +55,217 @@ class MarketService:
         self.db = db
         self.kafka_service = kafka_service
 
-    async def get_latest_price(self, symbol: str, provider: str = "yfinance") -> dict:
+    async def get_latest_price(
+        self, symbol: str, provider: str = "yfinance", deadline: Optional[float] = None
+    ) -> dict:
         """
         Fetch, store, and return latest price for a stock symbol.
         
         Args:
             symbol: Stock symbol to fetch (e.g., "AAPL")
-            provider: Data provider to use ("yfinance", "alpha_vantage")
+            provider: Data provider to use ("yfinance", "alpha_vantage", "smart")
+            deadline: time.monotonic() by which the call must finish; bounds
+                both the provider request and the database statements
             
         Returns:
             Dict with symbol, price, timestamp, and provider
+
+        Raises:
+            Overloaded: If the provider is at its concurrency limit
+            DeadlineExceeded: If the provider or database outlasts the deadline
         """
-        # Fetch price data from external provider
+        # Fetch price data from external provider, within its concurrency limit.
+        # The slot is held until the provider call returns, even past the deadline
         provider_instance = get_provider(provider)
-        price_data = await provider_instance.get_latest_price(symbol)
+        timeout = remaining(deadline)
+        fetch = get_provider_limiter(provider).run(lambda: provider_instance.get_latest_price(symbol))
+        try:
+            price_data = await asyncio.wait_for(asyncio.shield(fetch), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Provider {provider} did not answer before the deadline")
+        return await self._store_price(symbol, price_data, provider, deadline)
 
-        # Store complete raw API response for audit trail
-        raw_response = RawMarketResponse(
-            symbol=symbol.upper(),
-            provider=provider,
-            raw_response=json.dumps(price_data["raw_data"]),
-        )
-        self.db.add(raw_response)
-        self.db.flush()  # Get ID without committing transaction
-
-        # Store processed price point for fast queries
-        price_point = PricePoint(
-            symbol=symbol.upper(),
-            price=price_data["price"],
-            timestamp=price_data["timestamp"],
-            provider=provider,
-            raw_response_id=raw_response.id,
+    async def get_latest_prices(self, symbols: List[str], provider: str = "yfinance") -> Dict[str, Any]:
+        """
+        Fetch, store, and return latest prices for several symbols.
+
+        The provider is asked for all symbols at once (one bulk request
+        where it has one) within a single slot of its concurrency limit;
+        each quote is then stored and published as in get_latest_price.
+
+        Args:
+            symbols: Stock symbols to fetch
+            provider: Data provider to use
+
+        Returns:
+            Dict mapping each uppercase symbol to its price dict or to the
+            exception raised fetching or storing it
+
+        Raises:
+            Overloaded: If the provider is at its concurrency limit
+        """
+        provider_instance = get_provider(provider)
+        fetched = await asyncio.shield(
+            get_provider_limiter(provider).run(lambda: provider_instance.get_latest_prices(symbols))
         )
-        self.db.add(price_point)
-        self.db.commit()  # Commit both records
 
-        # Publish price event to Kafka for real-time processing
-        kafka_message = {
-            "symbol": symbol.upper(),
-            "price": price_data["price"],
-            "timestamp": price_data["timestamp"].isoformat(),
-            "source": provider,
-            "raw_response_id": str(raw_response.id),
-        }
-        await self.kafka_service.produce_price_event(kafka_message)
+        results = {}
+        for symbol, price_data in fetched.items():
+            if isinstance(price_data, Exception):
+                results[symbol] = price_data
+                continue
+            try:
+                results[symbol] = await self._store_price(symbol, price_data, provider)
+            except Exception as e:
+                self.db.rollback()
+                results[symbol] = e
+        return results
+
+    async def _store_price(
+        self, symbol: str, price_data: dict, provider: str, deadline: Optional[float] = None
+    ) -> dict:
+        """Store a fetched quote, share it and publish its event; returns the API dict."""
+        # Routing providers report which underlying source actually answered
+        provider = price_data.get("provider", provider)
+
+        symbol = symbol.upper()
+        # Deterministic ID: the same quote always maps to the same row/event
+        event_id = price_event_id(symbol, provider, price_data["timestamp"])
+        raw_response_id = uuid.uuid4()
+        registry = get_symbol_registry()
+        symbol_id = registry.symbol_id(self.db, symbol)
+        provider_id = registry.provider_id(self.db, provider)
+
+        try:
+            set_statement_timeout(self.db, remaining(deadline))
+            # Store processed price point; a quote we already have is skipped
+            stmt = (
+                dialect_insert(self.db, PricePoint)
+                .values(
+                    id=event_id,
+                    symbol_id=symbol_id,
+                    price=price_data["price"],
+                    timestamp=price_data["timestamp"],
+                    provider_id=provider_id,
+                    raw_response_id=raw_response_id,
+                )
+                .on_conflict_do_nothing(index_elements=["symbol_id", "provider_id", "timestamp"])
+                .returning(PricePoint.id)
+            )
+            inserted = self.db.execute(stmt).scalar() is not None
+
+            if inserted:
+                # Store complete raw API response for audit trail
+                self.db.add(
+                    RawMarketResponse(
+                        id=raw_response_id,
+                        symbol_id=symbol_id,
+                        provider_id=provider_id,
+                        raw_response=json.dumps(price_data["raw_data"]),
+                    )
+                )
+            self.db.commit()
+        except OperationalError as e:
+            self.db.rollback()
+            if is_statement_timeout(e):
+                raise DeadlineExceeded("Database did not answer before the deadline") from e
+            raise
+
+        if inserted:
+            get_tick_store().add(symbol, price_data["timestamp"], price_data["price"])
+        # Share the quote with the other workers even if it is a duplicate:
+        # the provider just confirmed it is still the latest
+        quote_table = get_quote_table()
+        if quote_table is not None:
+            quote_table.put(symbol, provider, price_data["price"], price_data["timestamp"])
+
+        # Publish price event only for new quotes; duplicates need no downstream work
+        if inserted:
+            kafka_message = {
+                "event_id": str(event_id),
+                "symbol": symbol,
+                "price": price_data["price"],
+                "timestamp": price_data["timestamp"].isoformat(),
+                "source": provider,
+                "raw_response_id": str(raw_response_id),
+            }
+            await self.kafka_service.produce_price_event(kafka_message)
 
         # Return clean response to client
         return {
-            "symbol": symbol.upper(),
+            "symbol": symbol,
             "price": price_data["price"],
             "timestamp": price_data["timestamp"],
             "provider": provider,
         }
 
+    def get_recent_prices(self, symbol: str, n: int) -> List[Tuple[datetime, float]]:
+        """
+        Newest n ticks for a symbol, served from the tick store when possible.
+
+        Misses read price_points and seed the store, so the next call for the
+        same symbol stays in memory.
+
+        Args:
+            symbol: Stock symbol
+            n: Number of ticks
+
+        Returns:
+            (timestamp, price) pairs, oldest first
+        """
+        store = get_tick_store()
+        ticks = store.last(symbol, n)
+        if ticks is not None:
+            return ticks
+
+        symbol_id = get_symbol_registry().symbol_id(self.db, symbol, create=False)
+        rows = []
+        if symbol_id is not None:
+            rows = (
+                self.db.query(PricePoint.timestamp, PricePoint.price)
+                .filter(PricePoint.symbol_id == symbol_id)
+                .order_by(desc(PricePoint.timestamp))  # Most recent first
+                .limit(n)
+                .all()
+            )
+        ticks = [(row.timestamp, row.price) for row in reversed(rows)]
+        # A short result is the symbol's whole history
+        store.load(symbol, ticks, complete_from=ticks[0][0] if len(ticks) == n else None)
+        return ticks
+
+    def get_price_range(
+        self, symbol: str, start: datetime, end: Optional[datetime] = None
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Ticks for a symbol in a time range, served from the tick store when possible.
+
+        Args:
+            symbol: Stock symbol
+            start: Range start (inclusive)
+            end: Range end (inclusive); None means up to now
+
+        Returns:
+            (timestamp, price) pairs, oldest first
+        """
+        store = get_tick_store()
+        ticks = store.range(symbol, start, end or datetime.max)
+        if ticks is not None:
+            return ticks
+
+        ticks = []
+        symbol_id = get_symbol_registry().symbol_id(self.db, symbol, create=False)
+        if symbol_id is not None:
+            query = self.db.query(PricePoint.timestamp, PricePoint.price).filter(
+                PricePoint.symbol_id == symbol_id, PricePoint.timestamp >= start
+            )
+            if end is not None:
+                query = query.filter(PricePoint.timestamp <= end)
+            ticks = [(row.timestamp, row.price) for row in query.order_by(PricePoint.timestamp)]
+        if end is None:
+            # Open-ended reads hold every tick since start, so they can seed the store
+            store.load(symbol, ticks, complete_from=start)
+        return ticks
+
     def create_polling_job(
         self, symbols: List[str], interval: int, provider: str
     ) -> dict:
@@ -93,24 +280,8 @@ class MarketService:
         Returns:
             Dict with job_id, status, and configuration
         """
-        # Generate unique job identifier
-        job_id = f"poll_{uuid.uuid4().hex[:8]}"
-
-        # Store job configuration in database
-        polling_job = PollingJob(
-            job_id=job_id,
-            symbols=json.dumps(symbols),  # Store symbols as JSON array
-            interval=interval,
-            provider=provider,
-        )
-        self.db.add(polling_job)
-        self.db.commit()
-
-        return {
-            "job_id": job_id,
-            "status": "accepted",
-            "config": {"symbols": symbols, "interval": interval, "provider": provider},
-        }
+        spec = {"symbols": symbols, "interval": interval, "provider": provider}
+        return PollingService(self.db).create_jobs([spec])[0]
 
     def calculate_moving_average(self, prices: List[float], period: int = 5) -> float:
         """
@@ -130,6 +301,64 @@ class MarketService:
         # Calculate moving average using last N periods
         return sum(prices[-period:]) / period
 
+    def record_moving_average(
+        self,
+        symbol: str,
+        period: int,
+        value: float,
+        timestamp: Optional[datetime] = None,
+        event_id: Optional[uuid.UUID] = None,
+    ) -> bool:
+        """
+        Store a calculated moving average.
+
+        Appends to the moving_averages history and upserts the single
+        latest row for (symbol, period) that the API reads from. When an
+        event_id is given and was already recorded, nothing is written.
+
+        Args:
+            symbol: Stock symbol
+            period: Moving average period
+            value: Calculated moving average
+            timestamp: Calculation time (defaults to now)
+            event_id: Price event that triggered the calculation
+
+        Returns:
+            True if stored, False if the event was already processed
+        """
+        timestamp = timestamp or datetime.utcnow()
+        symbol = symbol.upper()
+        symbol_id = get_symbol_registry().symbol_id(self.db, symbol)
+
+        history = (
+            dialect_insert(self.db, MovingAverage)
+            .values(
+                id=uuid.uuid4(),
+                symbol_id=symbol_id,
+                period=period,
+                average_value=value,
+                timestamp=timestamp,
+                event_id=event_id,
+            )
+            .on_conflict_do_nothing(index_elements=["event_id"])
+            .returning(MovingAverage.id)
+        )
+        if self.db.execute(history).scalar() is None:
+            self.db.rollback()
+            return False
+
+        stmt = dialect_insert(self.db, LatestMovingAverage).values(
+            symbol=symbol, period=period, average_value=value, timestamp=timestamp
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["symbol", "period"],
+                set_={"average_value": value, "timestamp": timestamp},
+            )
+        )
+        self.db.commit()
+        return True
+
     async def get_moving_average(self, symbol: str, period: int = 5) -> Optional[dict]:
         """
         Retrieve latest moving average for a symbol.
@@ -141,23 +370,47 @@ class MarketService:
         Returns:
             Moving average data or None if not found
         """
-        # Query latest moving average from database
-        moving_avg = (
-            self.db.query(MovingAverage)
-            .filter(
-                MovingAverage.symbol == symbol.upper(), 
-                MovingAverage.period == period
-            )
-            .order_by(MovingAverage.timestamp.desc())
-            .first()
-        )
+        # Primary key lookup, independent of how much history is stored
+        moving_avg = self.db.get(LatestMovingAverage, (symbol.upper(), period))
 
         if not moving_avg:
             return None
 
+        return self._moving_average_to_dict(moving_avg)
+
+    async def get_moving_averages(self, symbols: List[str], period: int = 5) -> List[dict]:
+        """
+        Retrieve latest moving averages for several symbols.
+
+        Args:
+            symbols: Stock symbols
+            period: Moving average period
+
+        Returns:
+            Moving average data for symbols that have one, in request order
+        """
+        symbols = [s.upper() for s in symbols]
+        rows = (
+            self.db.query(LatestMovingAverage)
+            .filter(
+                LatestMovingAverage.symbol.in_(symbols),
+                LatestMovingAverage.period == period,
+            )
+            .all()
+        )
+        by_symbol = {row.symbol: row for row in rows}
+        return [
+            self._moving_average_to_dict(by_symbol[symbol])
+            for symbol in symbols
+            if symbol in by_symbol
+        ]
+
+    @staticmethod
+    def _moving_average_to_dict(moving_avg) -> dict:
+        """Convert a moving average row to its API representation."""
         return {
             "symbol": moving_avg.symbol,
             "period": moving_avg.period,
             "average_value": moving_avg.average_value,
             "timestamp": moving_avg.timestamp,
-        }
\ No newline at end of file
+        }
@@ -1,12 +1,19 @@
+import argparse
 import asyncio
 import json
-from typing import Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from app.core.config import settings
 from app.models.database import SessionLocal
-from app.models.market_data import PricePoint, MovingAverage
+from app.services.conflation import conflate_batch, message_ticks
+from app.services.consumer_checkpoint import load_checkpoint, save_checkpoint
 from app.services.kafka_service import KafkaService
 from app.services.market_service import MarketService
+from app.services.quote_table import get_quote_table
+from app.services.tick_store import get_tick_store
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,21 +27,68 @@ class MovingAverageConsumer:
     5-point moving averages for real-time technical analysis.
     """
     
-    def __init__(self):
-        """Initialize consumer with Kafka service and market service."""
+    def __init__(self, checkpoint_path: Optional[str] = None):
+        """
+        Initialize consumer with Kafka service and market service.
+
+        Args:
+            checkpoint_path: State snapshot file (defaults to
+                CONSUMER_CHECKPOINT_PATH; None disables checkpointing)
+        """
         self.kafka_service = KafkaService()
         # MarketService initialized without DB - will create per message
         self.market_service = MarketService(None, self.kafka_service)
+        # Counters reported to the supervisor when running with several workers
+        self.processed = 0
+        self.errors = 0
+        self.last_event_at: Optional[float] = None
+        self.duplicates = 0
+        # Recently processed event IDs (insertion ordered, oldest evicted first)
+        self._seen_events: "OrderedDict[str, None]" = OrderedDict()
+        self.checkpoint_path = checkpoint_path or settings.CONSUMER_CHECKPOINT_PATH
+        self._checkpointed_at = time.monotonic()
+        # Conflation: events skipped in favour of a newer tick for the same
+        # symbol, and the processing time that saved (EWMA per-event cost)
+        self.conflated = 0
+        self.lag_saved_seconds = 0.0
+        self._event_seconds = 0.0
+
+    def _is_duplicate(self, event_id: Optional[str]) -> bool:
+        """Check whether an event was already processed by this consumer."""
+        return event_id is not None and event_id in self._seen_events
+
+    def _mark_processed(self, event_id: Optional[str]) -> None:
+        """Remember a processed event ID, evicting the oldest beyond the cap."""
+        if event_id is None:
+            return
+        self._seen_events[event_id] = None
+        if len(self._seen_events) > settings.CONSUMER_DEDUP_CACHE_SIZE:
+            self._seen_events.popitem(last=False)
 
     async def process_price_event(self, message: Dict[str, Any]) -> None:
         """
         Process incoming price event and calculate moving average.
+
+        Idempotent per event_id: redelivered events (e.g. after a rebalance)
+        are skipped from an in-memory cache, and the unique event_id on
+        moving_averages catches anything the cache has already evicted.
         
         Args:
             message: Kafka message containing price data
+
+        Raises:
+            Exception: Processing errors, after rollback, so the event can be
+                retried (see KafkaService.consume_price_events)
         """
+        event_id = message.get("event_id")
+        if self._is_duplicate(event_id):
+            self.duplicates += 1
+            logger.info(f"Skipping already processed event {event_id}")
+            return
+
         # Create new database session for this message
         db = SessionLocal()
+        self.last_event_at = time.time()
         try:
             # Extract symbol from message
             symbol = message.get("symbol")
@@ -42,47 +96,175 @@ class MovingAverageConsumer:
                 logger.warning("Message missing symbol field")
                 return
 
-            # Get last 5 price points for moving average calculation
-            recent_prices = (
-                db.query(PricePoint)
-                .filter(PricePoint.symbol == symbol)
-                .order_by(desc(PricePoint.timestamp))  # Most recent first
-                .limit(5)
-                .all()
-            )
+            market_service = MarketService(db, self.kafka_service)
+            # Feed the tick store, then read the window from memory (DB on a miss)
+            self._feed_ticks(symbol, message)
+            recent_prices = market_service.get_recent_prices(symbol, 5)
 
             # Need at least 2 points to calculate meaningful average
             if len(recent_prices) < 2:
                 logger.info(f"Not enough data points for {symbol} moving average")
                 return
 
-            # Convert to price list in chronological order
-            prices = [p.price for p in reversed(recent_prices)]
+            # Price list in chronological order
+            prices = [price for _, price in recent_prices]
             
             # Calculate 5-point moving average
             ma_value = self.market_service.calculate_moving_average(prices, period=5)
 
-            # Store calculated moving average in database
-            moving_avg = MovingAverage(
-                symbol=symbol, 
-                period=5, 
-                average_value=ma_value
+            # Store calculated moving average (history + latest value)
+            stored = market_service.record_moving_average(
+                symbol,
+                period=5,
+                value=ma_value,
+                event_id=uuid.UUID(event_id) if event_id else None,
             )
-            db.add(moving_avg)
-            db.commit()
+            self._mark_processed(event_id)
+            if not stored:
+                self.duplicates += 1
+                logger.info(f"Event {event_id} already recorded, skipping")
+                return
 
+            self.processed += 1
             logger.info(f"Calculated MA for {symbol}: {ma_value}")
 
         except Exception as e:
+            self.errors += 1
             logger.error(f"Error processing price event: {e}")
             db.rollback()  # Rollback on error
+            raise
         finally:
             db.close()  # Always close database connection
 
+    def _feed_ticks(self, symbol: str, message: Dict[str, Any]) -> None:
+        """Add an event's tick (and any ticks it conflated) to the tick store and quote table."""
+        store = get_tick_store()
+        ticks = [(datetime.fromisoformat(timestamp), float(price)) for timestamp, price in message_ticks(message)]
+        for timestamp, price in ticks:
+            store.add(symbol, timestamp, price)
+        quote_table = get_quote_table()
+        if ticks and quote_table is not None and message.get("source"):
+            quote_table.put(symbol, message["source"], ticks[-1][1], ticks[-1][0])
+
+    def _maybe_checkpoint(self) -> None:
+        """Write a checkpoint if the interval has elapsed (between events only)."""
+        if (
+            self.checkpoint_path
+            and time.monotonic() - self._checkpointed_at >= settings.CONSUMER_CHECKPOINT_INTERVAL
+        ):
+            self.save_checkpoint()
+
+    async def handle_event(self, message: Dict[str, Any]) -> None:
+        """Process one event, then checkpoint if due."""
+        await self.process_price_event(message)
+        self._maybe_checkpoint()
+
+    async def process_price_batch(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Process a batch of events, conflating per symbol if enabled.
+
+        With CONSUMER_CONFLATE only the newest event per symbol gets a moving
+        average; earlier ones just add their ticks to the window. Positions
+        cover the whole batch, so checkpoints are only taken after it.
+
+        Args:
+            messages: Decoded price events in consumption order
+        """
+        if settings.CONSUMER_CONFLATE:
+            messages, superseded = conflate_batch(messages)
+            for message in superseded:
+                if message.get("symbol") and not self._is_duplicate(message.get("event_id")):
+                    self._feed_ticks(message["symbol"], message)
+                self._mark_processed(message.get("event_id"))
+            self.conflated += len(superseded)
+            self.lag_saved_seconds += len(superseded) * self._event_seconds
+
+        for message in messages:
+            started = time.perf_counter()
+            await self.process_price_event(message)
+            elapsed = time.perf_counter() - started
+            self._event_seconds = elapsed if not self._event_seconds else 0.9 * self._event_seconds + 0.1 * elapsed
+        self._maybe_checkpoint()
+
+    def save_checkpoint(self) -> None:
+        """Snapshot tick windows and transport positions to the checkpoint file."""
+        started = time.perf_counter()
+        try:
+            size = save_checkpoint(
+                self.checkpoint_path,
+                get_tick_store(),
+                self.kafka_service.get_consumer_positions(),
+                settings.CONSUMER_CHECKPOINT_TICKS,
+            )
+            logger.info(
+                f"Checkpoint written ({size} bytes) in {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+        except Exception as e:
+            logger.error(f"Failed to write checkpoint: {e}")
+        self._checkpointed_at = time.monotonic()
+
+    def restore_checkpoint(self) -> Optional[Dict[int, int]]:
+        """
+        Load tick windows from the checkpoint file into the tick store.
+
+        Returns:
+            Positions to resume consuming from, or None without a checkpoint
+        """
+        started = time.perf_counter()
+        store = get_tick_store()
+        checkpoint = load_checkpoint(self.checkpoint_path, store.capacity)
+        if checkpoint is None:
+            return None
+        store.restore(checkpoint.series, age=max(time.time() - checkpoint.created_at, 0.0))
+        logger.info(
+            f"Restored {len(checkpoint.series)} symbols from checkpoint in "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return checkpoint.positions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of processing counters and consumer lag.
+
+        Returns:
+            Dict with processed/error counts, last event time, lag and the
+            event bus retry, dead-letter and throughput counters
+        """
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "duplicates": self.duplicates,
+            "conflated": self.conflated,
+            "lag_saved_seconds": round(self.lag_saved_seconds, 3),
+            "last_event_at": self.last_event_at,
+            "lag": self.kafka_service.get_consumer_lag(),
+            # consumed, failed, retried, dead_lettered, transport_errors, throughput
+            **self.kafka_service.get_consume_stats(),
+        }
+
     async def start_consuming(self):
-        """Start the Kafka consumer to process price events."""
+        """
+        Start the Kafka consumer to process price events.
+
+        With checkpointing enabled, windows are restored from the last
+        snapshot and consumption resumes from the positions it recorded, so
+        nothing has to be re-read from price_points; a final snapshot is
+        written on shutdown.
+        """
         logger.info("Starting Moving Average Consumer...")
-        await self.kafka_service.consume_price_events(self.process_price_event)
+        positions = self.restore_checkpoint() if self.checkpoint_path else None
+        try:
+            if settings.CONSUMER_CONFLATE:
+                await self.kafka_service.consume_price_event_batches(
+                    self.process_price_batch, start_positions=positions
+                )
+            else:
+                await self.kafka_service.consume_price_events(
+                    self.handle_event, start_positions=positions
+                )
+        finally:
+            if self.checkpoint_path:
+                self.save_checkpoint()
 
 
 # Standalone consumer script
@@ -92,6 +274,30 @@ async def main():
     await consumer.start_consuming()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the consumer script."""
+    parser = argparse.ArgumentParser(description="Moving average consumer")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.CONSUMER_WORKERS,
+        help="Number of worker processes in the consumer group",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    # Run consumer as standalone application
-    asyncio.run(main())
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    if args.workers > 1:
+        # Supervisor mode: one process per worker, same consumer group
+        from app.services.consumer_supervisor import ConsumerSupervisor
+
+        try:
+            supervisor = ConsumerSupervisor(workers=args.workers)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        supervisor.run()
+    else:
+        # Run consumer as standalone application
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import bindparam, func, select, update
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.market_data import PollingJob, PollingJobSymbol, Symbol
+from app.services.kafka_service import KafkaService
+from app.services.market_service import MarketService
+from app.services.polling_service import last_slot
+
+logger = logging.getLogger(__name__)
+
+
+class PollingScheduler:
+    """
+    Runs active polling jobs shard by shard.
+
+    Every tick the scheduler works out which shards reached a new slot (see
+    polling_service.last_slot) and polls each one in its own task, so the
+    shards of a large job are spread across the interval. A shard whose
+    previous run is still going when its next slot arrives skips that slot
+    rather than piling up concurrent runs.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        kafka_service: Optional[KafkaService] = None,
+        tick: Optional[float] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            session_factory: Callable returning a database session
+            kafka_service: Service used to publish price events
+            tick: Seconds between schedule checks
+        """
+        self.session_factory = session_factory or SessionLocal
+        self.kafka_service = kafka_service
+        self.tick = tick or settings.POLL_SCHEDULER_TICK
+
+        # Latest slot already handled per (job, shard)
+        self._fired: Dict[Tuple, datetime] = {}
+        self._running: Dict[Tuple, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Start tasks for every shard whose slot has arrived.
+
+        Shards seen for the first time wait for their next slot, so starting
+        the scheduler does not poll every shard at once.
+
+        Args:
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Number of shard runs started
+        """
+        now = now or datetime.utcnow()
+        db = self.session_factory()
+        try:
+            jobs = db.execute(
+                select(
+                    PollingJob.id,
+                    PollingJob.provider,
+                    PollingJob.interval,
+                    func.max(PollingJobSymbol.shard).label("last_shard"),
+                )
+                .join(PollingJobSymbol, PollingJobSymbol.job_id == PollingJob.id)
+                .where(PollingJob.status == "active")
+                .group_by(PollingJob.id, PollingJob.provider, PollingJob.interval)
+            ).all()
+        finally:
+            db.close()
+
+        started = 0
+        active = set()
+        for job in jobs:
+            shards = job.last_shard + 1
+            for shard in range(shards):
+                key = (job.id, shard)
+                active.add(key)
+                slot = last_slot(shard, shards, job.interval, now)
+                if key not in self._fired:
+                    self._fired[key] = slot
+                    continue
+                if slot <= self._fired[key]:
+                    continue
+                self._fired[key] = slot
+                running = self._running.get(key)
+                if running is not None and not running.done():
+                    logger.warning(f"Polling job {job.id} shard {shard} still running, skipping slot {slot}")
+                    continue
+                self._running[key] = asyncio.create_task(self.poll_shard(job.id, job.provider, shard))
+                started += 1
+
+        # Forget paused, deleted or resharded shards, and finished runs
+        for key in list(self._fired):
+            if key not in active:
+                del self._fired[key]
+        for key, task in list(self._running.items()):
+            if task.done():
+                del self._running[key]
+        return started
+
+    async def poll_shard(self, job_id, provider: str, shard: int) -> int:
+        """
+        Fetch the latest price for every symbol in one shard.
+
+        The whole shard goes to the provider as one batch request.
+
+        Args:
+            job_id: Polling job primary key
+            provider: Data provider to use
+            shard: Shard index
+
+        Returns:
+            Number of symbols fetched successfully
+        """
+        db = self.session_factory()
+        try:
+            members = db.execute(
+                select(PollingJobSymbol.symbol_id, Symbol.ticker)
+                .join(Symbol, Symbol.id == PollingJobSymbol.symbol_id)
+                .where(PollingJobSymbol.job_id == job_id, PollingJobSymbol.shard == shard)
+            ).all()
+            service = MarketService(db, self.kafka_service)
+
+            results = {}
+            try:
+                if members:
+                    results = await service.get_latest_prices([m.ticker for m in members], provider)
+            except Exception as e:
+                db.rollback()
+                results = {member.ticker.upper(): e for member in members}  # The batch failed as a whole
+            polled_at = datetime.utcnow()
+
+            outcomes = []
+            for member in members:
+                result = results.get(member.ticker.upper())
+                error = None
+                if result is None:
+                    error = "No quote returned"
+                elif isinstance(result, Exception):
+                    error = str(result) or type(result).__name__
+                if error is not None:
+                    logger.warning(f"Polling {member.ticker} via {provider} failed: {error}")
+                outcomes.append({"b_symbol_id": member.symbol_id, "polled_at": polled_at, "error": error})
+
+            if outcomes:
+                # Core table UPDATE: one executemany for the whole shard
+                table = PollingJobSymbol.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.job_id == job_id, table.c.symbol_id == bindparam("b_symbol_id"))
+                    .values(last_polled_at=bindparam("polled_at"), last_error=bindparam("error")),
+                    outcomes,
+                )
+                db.execute(
+                    update(PollingJob).where(PollingJob.id == job_id).values(last_run=datetime.utcnow())
+                )
+                db.commit()
+            return sum(1 for outcome in outcomes if outcome["error"] is None)
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        """Check the schedule forever."""
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Polling schedule check failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the scheduler loop and any shard runs in progress."""
+        tasks = [t for t in [self._task, *self._running.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+
+
+async def main():
+    """Run the polling scheduler as a standalone process."""
+    from app.api.dependencies import close_kafka_service, get_kafka_service
+
+    scheduler = PollingScheduler(kafka_service=get_kafka_service())
+    logger.info("Starting polling scheduler...")
+    try:
+        await scheduler.run()
+    finally:
+        await scheduler.stop()
+        await close_kafka_service()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Polling scheduler stopped")
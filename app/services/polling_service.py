@@ -0,0 +1,321 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.database import dialect_insert
+from app.models.market_data import PollingJob, PollingJobSymbol, Symbol
+from app.services.symbol_registry import get_symbol_registry
+from app.services.tick_store import EPOCH
+
+class JobNotFound(LookupError):
+    """Raised when polling job IDs do not exist."""
+
+    def __init__(self, job_ids: List[str]):
+        super().__init__(f"Unknown polling jobs: {', '.join(job_ids)}")
+        self.job_ids = job_ids
+
+
+def shard_size_for(provider: str) -> int:
+    """Symbols per shard for a provider (POLL_SHARD_SIZES overrides POLL_SHARD_SIZE)."""
+    for item in settings.POLL_SHARD_SIZES.split(","):
+        if "=" in item:
+            name, size = item.split("=", 1)
+            if name.strip() == provider:
+                return int(size)
+    return settings.POLL_SHARD_SIZE
+
+
+def normalize_tickers(symbols: List[str]) -> List[str]:
+    """
+    Unique uppercase tickers of a job, sorted.
+
+    Raises:
+        ValueError: If every symbol is blank
+    """
+    tickers = sorted({s.strip().upper() for s in symbols if s.strip()})
+    if not tickers:
+        raise ValueError("A polling job needs at least one non-blank symbol")
+    return tickers
+
+
+def shard_count(symbols: int, shard_size: int) -> int:
+    """Number of shards needed so none exceeds shard_size symbols."""
+    return max(1, -(-symbols // shard_size))
+
+
+def assign_shards(symbol_ids: List[int], shard_size: int) -> Dict[int, int]:
+    """
+    Split symbols into evenly sized, contiguous shards of at most shard_size.
+
+    Args:
+        symbol_ids: Symbol dictionary IDs, in the order shards are filled
+        shard_size: Maximum symbols per shard
+
+    Returns:
+        Mapping of symbol ID to shard index
+    """
+    shards = shard_count(len(symbol_ids), shard_size)
+    return {symbol_id: i * shards // len(symbol_ids) for i, symbol_id in enumerate(symbol_ids)}
+
+
+def shard_offset(shard: int, shards: int, interval: int) -> float:
+    """Seconds into each interval at which a shard is polled."""
+    return shard * interval / shards
+
+
+def last_slot(shard: int, shards: int, interval: int, now: datetime) -> datetime:
+    """
+    Most recent scheduled poll time of a shard at or before now.
+
+    Slots are aligned to the epoch, so every process computes the same
+    schedule: shard k of n runs at k * interval / n seconds into each interval.
+    """
+    offset = shard_offset(shard, shards, interval)
+    elapsed = (now - EPOCH).total_seconds() - offset
+    return EPOCH + timedelta(seconds=elapsed // interval * interval + offset)
+
+
+class PollingService:
+    """
+    Polling job management for large symbol universes.
+
+    A job's symbols live in polling_job_symbols, split into provider-sized
+    shards. Shards are polled at staggered offsets within the interval so a
+    job with thousands of symbols produces a steady request rate instead of
+    a burst at the start of every interval.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def _register(self, symbol_lists: List[List[str]]) -> List[List[str]]:
+        """
+        Normalize every job's symbols and register new tickers.
+
+        Runs before the session writes anything: the registry inserts new
+        tickers on its own connection, which on SQLite would wait for the
+        write lock held by this session's open transaction.
+        """
+        ticker_lists = [normalize_tickers(symbols) for symbols in symbol_lists]
+        get_symbol_registry().symbol_ids(self.db, {t for tickers in ticker_lists for t in tickers})
+        return ticker_lists
+
+    def _set_symbols(self, job: PollingJob, tickers: List[str]) -> int:
+        """Replace a job's symbols with registered tickers and reshard; returns the shard count."""
+        symbol_ids = get_symbol_registry().symbol_ids(self.db, tickers, create=False)
+        # Alphabetical shards keep a job's layout stable across edits
+        shards = assign_shards([symbol_ids[t] for t in tickers], job.shard_size)
+
+        # Retained symbols keep their poll history; only their shard may move
+        self.db.execute(
+            delete(PollingJobSymbol).where(
+                PollingJobSymbol.job_id == job.id,
+                PollingJobSymbol.symbol_id.not_in(list(shards)),
+            )
+        )
+        stmt = dialect_insert(self.db, PollingJobSymbol).values(
+            [{"job_id": job.id, "symbol_id": symbol_id, "shard": shard} for symbol_id, shard in shards.items()]
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["job_id", "symbol_id"], set_={"shard": stmt.excluded.shard}
+            )
+        )
+        return shard_count(len(shards), job.shard_size)
+
+    def create_jobs(self, specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several polling jobs in one transaction.
+
+        Args:
+            specs: Dicts with symbols, interval and provider
+
+        Returns:
+            Dict with job_id, status and configuration per job, in order
+
+        Raises:
+            ValueError: If a job has no non-blank symbol (nothing is created)
+        """
+        ticker_lists = self._register([spec["symbols"] for spec in specs])
+        created = []
+        for spec, tickers in zip(specs, ticker_lists):
+            job = PollingJob(
+                id=uuid.uuid4(),
+                job_id=f"poll_{uuid.uuid4().hex[:8]}",
+                interval=spec["interval"],
+                provider=spec["provider"],
+                shard_size=shard_size_for(spec["provider"]),
+                status="active",
+            )
+            self.db.add(job)
+            self.db.flush()
+            shards = self._set_symbols(job, tickers)
+            created.append(
+                {
+                    "job_id": job.job_id,
+                    "status": "accepted",
+                    "config": {
+                        "symbols": spec["symbols"],
+                        "interval": job.interval,
+                        "provider": job.provider,
+                        "shards": shards,
+                    },
+                }
+            )
+        self.db.commit()
+        return created
+
+    def _jobs(self, job_ids: List[str]) -> List[PollingJob]:
+        """Load jobs by public ID in request order, failing if any is missing."""
+        jobs = {
+            job.job_id: job
+            for job in self.db.query(PollingJob).filter(PollingJob.job_id.in_(job_ids))
+        }
+        missing = [job_id for job_id in job_ids if job_id not in jobs]
+        if missing:
+            raise JobNotFound(missing)
+        return [jobs[job_id] for job_id in job_ids]
+
+    def update_jobs(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update several jobs in one transaction.
+
+        Args:
+            updates: Dicts with job_id and any of symbols, interval, provider, status
+
+        Returns:
+            Status of each updated job
+
+        Raises:
+            JobNotFound: If any job ID does not exist (nothing is changed)
+            ValueError: If new symbols are all blank (nothing is changed)
+        """
+        new_symbols = [update.get("symbols") for update in updates]
+        registered = iter(self._register([symbols for symbols in new_symbols if symbols is not None]))
+        new_tickers = [next(registered) if symbols is not None else None for symbols in new_symbols]
+
+        jobs = self._jobs([update["job_id"] for update in updates])
+        for job, update, tickers in zip(jobs, updates, new_tickers):
+            if update.get("interval") is not None:
+                job.interval = update["interval"]
+            if update.get("status") is not None:
+                job.status = update["status"]
+            if update.get("provider") is not None and update["provider"] != job.provider:
+                job.provider = update["provider"]
+                job.shard_size = shard_size_for(job.provider)
+                if tickers is None:
+                    tickers = sorted(self._tickers(job))  # Reshard for the new provider's size
+            if tickers is not None:
+                self._set_symbols(job, tickers)
+        self.db.commit()
+        return [self._status(job) for job in jobs]
+
+    def set_status(self, job_ids: List[str], status: str) -> List[Dict[str, Any]]:
+        """
+        Pause or resume several jobs.
+
+        Args:
+            job_ids: Public job IDs
+            status: "active" or "paused"
+
+        Returns:
+            Status of each job
+
+        Raises:
+            JobNotFound: If any job ID does not exist (nothing is changed)
+        """
+        return self.update_jobs([{"job_id": job_id, "status": status} for job_id in job_ids])
+
+    def get_job_status(self, job_id: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Job configuration with per-shard progress.
+
+        Args:
+            job_id: Public job ID
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Status dict, or None if the job does not exist
+        """
+        job = self.db.query(PollingJob).filter(PollingJob.job_id == job_id).first()
+        if job is None:
+            return None
+        return self._status(job, now)
+
+    def _tickers(self, job: PollingJob) -> List[str]:
+        rows = self.db.execute(
+            select(Symbol.ticker)
+            .join(PollingJobSymbol, PollingJobSymbol.symbol_id == Symbol.id)
+            .where(PollingJobSymbol.job_id == job.id)
+        )
+        return [row.ticker for row in rows]
+
+    def _status(self, job: PollingJob, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Summarize a job and each of its shards.
+
+        A shard's progress is the fraction of its symbols polled since its
+        latest slot. It is "late" if some symbol was not polled since the
+        slot before that, and "error" if the last poll of some symbol failed.
+        """
+        now = now or datetime.utcnow()
+        rows = self.db.execute(
+            select(
+                PollingJobSymbol.shard,
+                PollingJobSymbol.last_polled_at,
+                PollingJobSymbol.last_error,
+            ).where(PollingJobSymbol.job_id == job.id)
+        ).all()
+        by_shard: Dict[int, list] = {}
+        for row in rows:
+            by_shard.setdefault(row.shard, []).append(row)
+
+        shards = []
+        for shard in sorted(by_shard):
+            members = by_shard[shard]
+            slot = last_slot(shard, len(by_shard), job.interval, now)
+            polled = [m.last_polled_at for m in members if m.last_polled_at is not None]
+            errors = sum(1 for m in members if m.last_error)
+
+            if job.status == "paused":
+                status = "paused"
+            elif not polled:
+                status = "pending"
+            elif errors:
+                status = "error"
+            elif len(polled) < len(members) or min(polled) < slot - timedelta(seconds=job.interval):
+                status = "late"
+            else:
+                status = "ok"
+
+            shards.append(
+                {
+                    "shard": shard,
+                    "symbols": len(members),
+                    "offset_seconds": shard_offset(shard, len(by_shard), job.interval),
+                    "progress": sum(1 for t in polled if t >= slot) / len(members),
+                    "errors": errors,
+                    "last_polled_at": max(polled) if polled else None,
+                    "status": status,
+                }
+            )
+
+        return {
+            "job_id": job.job_id,
+            "status": job.status,
+            "interval": job.interval,
+            "provider": job.provider,
+            "shard_size": job.shard_size,
+            "symbols": len(rows),
+            "created_at": job.created_at,
+            "last_run": job.last_run,
+            "shards": shards,
+        }
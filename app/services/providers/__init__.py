@@ -1,14 +1,74 @@
+import importlib
+from typing import Dict, Type
 from .base import BaseProvider
-from .yfinance_provider import YFinanceProvider
-from .alpha_vantage_provider import AlphaVantageProvider
 
+# Registry of available market data providers
+# Maps provider names to "module:ClassName" paths. Modules are imported on
+# first use so that heavy SDKs (yfinance pulls in pandas/numpy) stay off
+# the application import path.
 PROVIDERS = {
-    "yfinance": YFinanceProvider,
-    "alpha_vantage": AlphaVantageProvider,
+    "yfinance": "app.services.providers.yfinance_provider:YFinanceProvider",
+    "alpha_vantage": "app.services.providers.alpha_vantage_provider:AlphaVantageProvider",
+    "smart": "app.services.providers.smart_provider:SmartProvider",
+    "synthetic": "app.services.providers.synthetic_provider:SyntheticProvider",
 }
 
+# Provider classes already imported, keyed by provider name
+_provider_classes: Dict[str, Type[BaseProvider]] = {}
 
-def get_provider(provider_name: str) -> BaseProvider:
+
+def get_provider_class(provider_name: str) -> Type[BaseProvider]:
+    """
+    Resolve a provider name to its implementation class.
+
+    Registry entries may be classes or "module:ClassName" strings; strings
+    are imported lazily and the resulting class is cached.
+
+    Args:
+        provider_name: Name of provider to resolve
+
+    Returns:
+        Provider class implementing BaseProvider
+
+    Raises:
+        ValueError: If provider_name is not supported
+    """
     if provider_name not in PROVIDERS:
         raise ValueError(f"Unknown provider: {provider_name}")
-    return PROVIDERS[provider_name]()
+
+    if provider_name not in _provider_classes:
+        target = PROVIDERS[provider_name]
+        if isinstance(target, str):
+            module_path, class_name = target.split(":")
+            target = getattr(importlib.import_module(module_path), class_name)
+        _provider_classes[provider_name] = target
+    return _provider_classes[provider_name]
+
+
+def get_provider(provider_name: str) -> BaseProvider:
+    """
+    Factory function to create provider instances.
+
+    Uses the provider registry to instantiate the correct provider
+    based on the requested name. Enables easy switching between
+    different data sources without changing business logic.
+
+    Args:
+        provider_name: Name of provider to create ("yfinance", "alpha_vantage", "smart", "synthetic")
+
+    Returns:
+        Instantiated provider object implementing BaseProvider interface
+
+    Raises:
+        ValueError: If provider_name is not supported
+    """
+    # Create and return new provider instance
+    return get_provider_class(provider_name)()
+
+
+def __getattr__(name: str):
+    """Keep `from app.services.providers import YFinanceProvider` working lazily."""
+    for provider_name, target in PROVIDERS.items():
+        if isinstance(target, str) and target.endswith(f":{name}"):
+            return get_provider_class(provider_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
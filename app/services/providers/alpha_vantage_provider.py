@@ -1,8 +1,14 @@
 import httpx
-from typing import Dict, Any
-from .base import BaseProvider
+import logging
+from typing import Dict, Any, List
+from .base import BaseProvider, unique_symbols
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+API_URL = "https://www.alphavantage.co/query"
+BULK_QUOTE_LIMIT = 100  # Symbols per REALTIME_BULK_QUOTES request
+
 
 class AlphaVantageProvider(BaseProvider):
     """Alpha Vantage API provider for fetching stock market data."""
@@ -28,12 +34,11 @@ class AlphaVantageProvider(BaseProvider):
             Formatted price data with symbol, price, timestamp, provider
         """
         # Alpha Vantage GLOBAL_QUOTE endpoint
-        url = "https://www.alphavantage.co/query"
         params = {"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": self.api_key}
 
         # Make API request
         async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
+            response = await client.get(API_URL, params=params)
             response.raise_for_status()
             data = response.json()
 
@@ -50,4 +55,54 @@ class AlphaVantageProvider(BaseProvider):
             price = float(quote["05. price"])
 
             # Return standardized format
-            return self.format_response(symbol=symbol, price=price, raw_data=data)
\ No newline at end of file
+            return self.format_response(symbol=symbol, price=price, raw_data=data)
+
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Fetch latest prices with REALTIME_BULK_QUOTES, 100 symbols per request.
+
+        The bulk endpoint needs a premium key, so it is only used when
+        ALPHA_VANTAGE_BULK_QUOTES is set. Symbols a bulk response leaves
+        out (and every symbol without the setting) are fetched one
+        GLOBAL_QUOTE at a time with bounded concurrency.
+
+        Args:
+            symbols: Stock symbols to fetch
+
+        Returns:
+            Dict mapping each uppercase symbol to its price data or to the
+            exception its fetch raised
+        """
+        symbols = unique_symbols(symbols)
+        results = {}
+        if settings.ALPHA_VANTAGE_BULK_QUOTES:
+            async with httpx.AsyncClient() as client:
+                for i in range(0, len(symbols), BULK_QUOTE_LIMIT):
+                    chunk = symbols[i:i + BULK_QUOTE_LIMIT]
+                    params = {
+                        "function": "REALTIME_BULK_QUOTES",
+                        "symbol": ",".join(chunk),
+                        "apikey": self.api_key,
+                    }
+                    try:
+                        response = await client.get(API_URL, params=params)
+                        response.raise_for_status()
+                        data = response.json()
+                    except (httpx.HTTPError, ValueError) as e:
+                        logger.warning(f"Alpha Vantage bulk quote request failed: {e}")
+                        continue
+                    if not data.get("data"):
+                        # Free keys get an explanation instead of quotes
+                        logger.warning(f"Alpha Vantage bulk quotes unavailable: {data.get('message') or data}")
+                        break
+                    for quote in data["data"]:
+                        try:
+                            symbol, price = quote["symbol"].upper(), float(quote["close"])
+                        except (KeyError, TypeError, ValueError):
+                            continue
+                        results[symbol] = self.format_response(symbol=symbol, price=price, raw_data=quote)
+
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing:
+            results.update(await self._fan_out(missing, self.get_latest_price))
+        return {symbol: results[symbol] for symbol in symbols}
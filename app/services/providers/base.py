@@ -1,6 +1,8 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
+from app.core.config import settings
 
 
 class BaseProvider(ABC):
@@ -24,6 +26,87 @@ class BaseProvider(ABC):
         """
         pass
 
+    async def get_history(
+        self, symbol: str, start: datetime, end: datetime, interval: str = "1d"
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch historical OHLCV bars for a stock symbol.
+
+        Optional capability; providers without a history API keep this default.
+
+        Args:
+            symbol: Stock symbol (e.g., "AAPL")
+            start: Range start (inclusive, naive UTC)
+            end: Range end (exclusive, naive UTC)
+            interval: Bar size (e.g., "1m", "1h", "1d")
+
+        Returns:
+            Bars in chronological order, each with symbol, timestamp (naive UTC),
+            open, high, low, close and volume
+
+        Raises:
+            NotImplementedError: If the provider has no history support
+        """
+        raise NotImplementedError(f"{self.get_provider_name()} does not provide history")
+
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Fetch latest prices for several symbols.
+
+        The default issues one get_latest_price per symbol, at most
+        PROVIDER_BATCH_CONCURRENCY at a time. Providers with a multi-symbol
+        API override it.
+
+        Args:
+            symbols: Stock symbols (duplicates are fetched once)
+
+        Returns:
+            Dict mapping each uppercase symbol, in request order, to its
+            price data or to the exception its fetch raised
+
+        Raises:
+            Exception: Only if the batch as a whole fails (e.g. a bulk request)
+        """
+        return await self._fan_out(symbols, self.get_latest_price)
+
+    async def get_histories(
+        self, symbols: List[str], start: datetime, end: datetime, interval: str = "1d"
+    ) -> Dict[str, Any]:
+        """
+        Fetch historical OHLCV bars for several symbols.
+
+        The default issues one get_history per symbol with bounded
+        concurrency, like get_latest_prices.
+
+        Args:
+            symbols: Stock symbols (duplicates are fetched once)
+            start: Range start (inclusive, naive UTC)
+            end: Range end (exclusive, naive UTC)
+            interval: Bar size (e.g., "1m", "1h", "1d")
+
+        Returns:
+            Dict mapping each uppercase symbol, in request order, to its bars
+            (as get_history returns them) or to the exception its fetch raised
+        """
+        return await self._fan_out(symbols, lambda symbol: self.get_history(symbol, start, end, interval))
+
+    async def _fan_out(
+        self, symbols: List[str], fetch: Callable[[str], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """Run fetch for every symbol, PROVIDER_BATCH_CONCURRENCY at a time."""
+        symbols = unique_symbols(symbols)
+        semaphore = asyncio.Semaphore(settings.PROVIDER_BATCH_CONCURRENCY)
+
+        async def _one(symbol: str) -> Any:
+            async with semaphore:
+                try:
+                    return await fetch(symbol)
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*(_one(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """
@@ -35,7 +118,11 @@ class BaseProvider(ABC):
         pass
 
     def format_response(
-        self, symbol: str, price: float, raw_data: Any
+        self,
+        symbol: str,
+        price: float,
+        raw_data: Any,
+        timestamp: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """
         Format provider response to standardized format.
@@ -47,6 +134,9 @@ class BaseProvider(ABC):
             symbol: Stock symbol
             price: Current price as float
             raw_data: Original API response for debugging
+            timestamp: Source quote time as naive UTC, if the provider reports
+                one. Together with symbol and provider it identifies a quote,
+                so repeated fetches of an unchanged quote are deduplicated.
             
         Returns:
             Standardized response with symbol, price, timestamp, provider, raw_data
@@ -54,7 +144,12 @@ class BaseProvider(ABC):
         return {
             "symbol": symbol.upper(),               # Normalize symbol to uppercase
             "price": price,                         # Current stock price
-            "timestamp": datetime.utcnow(),         # When data was fetched
+            "timestamp": timestamp or datetime.utcnow(),  # Quote time (or fetch time)
             "provider": self.get_provider_name(),   # Which provider supplied data
             "raw_data": raw_data,                   # Original API response
-        }
\ No newline at end of file
+        }
+
+
+def unique_symbols(symbols: List[str]) -> List[str]:
+    """Uppercase symbols without duplicates, in request order."""
+    return list(dict.fromkeys(symbol.upper() for symbol in symbols))
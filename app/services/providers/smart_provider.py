@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import settings
+from .base import BaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderStats:
+    """
+    Rolling latency/error window and circuit breaker for one provider.
+
+    The breaker opens after a run of consecutive failures, rejects traffic
+    for a cool-down period, then lets a single half-open trial request
+    through; success closes it again, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize empty statistics.
+
+        Args:
+            window: Number of recent requests kept for latency/error rates
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before a trial
+        """
+        self.window = window or settings.SMART_LATENCY_WINDOW
+        self.failure_threshold = failure_threshold or settings.SMART_BREAKER_FAILURES
+        self.reset_timeout = reset_timeout or settings.SMART_BREAKER_RESET_SECONDS
+
+        self.latencies: Deque[float] = deque(maxlen=self.window)
+        self.outcomes: Deque[bool] = deque(maxlen=self.window)
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and close the breaker."""
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker if it keeps failing."""
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit opened after {self.consecutive_failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def record_abandoned(self, elapsed: float) -> None:
+        """Record a request cancelled because a hedge won; it took at least elapsed."""
+        self.latencies.append(elapsed)
+        self._trial_in_flight = False
+
+    def is_available(self) -> bool:
+        """Check, without side effects, whether a request could be admitted now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not self._trial_in_flight
+
+    def allow_request(self) -> bool:
+        """
+        Admit a request if the breaker allows it.
+
+        Moving from open to half-open admits exactly one trial request.
+        """
+        if not self.is_available():
+            return False
+        if self.state == "open":
+            self.state = "half_open"
+        if self.state == "half_open":
+            self._trial_in_flight = True
+        return True
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile over the window, or None without samples."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failed requests in the window."""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current statistics for diagnostics."""
+        return {
+            "state": self.state,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "error_rate": self.error_rate,
+            "samples": len(self.outcomes),
+        }
+
+
+# Process-wide statistics shared by every SmartProvider instance, since
+# get_provider() creates a new provider object per request.
+_provider_stats: Dict[str, ProviderStats] = {}
+
+
+def get_provider_stats() -> Dict[str, ProviderStats]:
+    """Return the shared per-provider statistics registry."""
+    return _provider_stats
+
+
+class SmartProvider(BaseProvider):
+    """
+    Latency-aware router over several underlying providers.
+
+    Requests go to the healthy provider with the lowest median latency. If
+    it has not answered within its own p95 latency, a hedged request is sent
+    to the next provider and whichever succeeds first wins. Providers that
+    keep failing are skipped by a circuit breaker until a trial succeeds.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, BaseProvider]] = None,
+        stats: Optional[Dict[str, ProviderStats]] = None,
+    ):
+        """
+        Initialize router.
+
+        Args:
+            providers: Candidate providers by name (defaults to SMART_PROVIDERS
+                from the registry; ones that fail to initialize are skipped)
+            stats: Statistics registry (defaults to the process-wide one)
+        """
+        if providers is None:
+            from . import get_provider
+
+            providers = {}
+            for name in settings.SMART_PROVIDERS.split(","):
+                name = name.strip()
+                try:
+                    providers[name] = get_provider(name)
+                except ValueError as e:
+                    logger.info(f"Smart routing skips {name}: {e}")
+        if not providers:
+            raise ValueError("No providers available for smart routing")
+
+        self.providers = providers
+        self.stats = stats if stats is not None else get_provider_stats()
+        for name in providers:
+            self.stats.setdefault(name, ProviderStats())
+
+    def get_provider_name(self) -> str:
+        """Return provider identifier."""
+        return "smart"
+
+    def rank_providers(self) -> List[str]:
+        """
+        Order providers whose breaker admits a request by median latency.
+
+        A provider due a half-open trial goes first (hedging bounds the cost
+        if it is still broken); providers whose recent error rate exceeds
+        SMART_MAX_ERROR_RATE go last; providers without samples sort ahead
+        of measured ones so they get measured.
+        """
+        candidates = [name for name in self.providers if self.stats[name].is_available()]
+        return sorted(
+            candidates,
+            key=lambda name: (
+                self.stats[name].state == "closed",
+                self.stats[name].error_rate > settings.SMART_MAX_ERROR_RATE,
+                self.stats[name].percentile(0.5) or 0.0,
+            ),
+        )
+
+    def hedge_delay(self, name: str) -> float:
+        """Seconds to wait on a provider before hedging: its p95 latency."""
+        p95 = self.stats[name].percentile(0.95)
+        if p95 is None:
+            return settings.SMART_HEDGE_DEFAULT_DELAY
+        return max(p95, settings.SMART_HEDGE_MIN_DELAY)
+
+    async def _attempt(self, name: str, symbol: str) -> Dict[str, Any]:
+        """Call one provider and record the outcome."""
+        started = time.monotonic()
+        try:
+            result = await self.providers[name].get_latest_price(symbol)
+        except asyncio.CancelledError:
+            self.stats[name].record_abandoned(time.monotonic() - started)
+            raise
+        except Exception:
+            self.stats[name].record_failure()
+            raise
+        self.stats[name].record_success(time.monotonic() - started)
+        return result
+
+    async def get_latest_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch latest price from the fastest healthy provider, hedging if slow.
+
+        Args:
+            symbol: Stock symbol to fetch
+
+        Returns:
+            Price data from the first provider to succeed (its name is kept
+            in the "provider" field)
+
+        Raises:
+            RuntimeError: If every provider is unavailable or fails
+        """
+        queue = self.rank_providers()
+        if not queue:
+            raise RuntimeError("All providers are unavailable (circuit open)")
+
+        pending: Dict[asyncio.Task, str] = {}
+        last_error: Optional[Exception] = None
+
+        def launch() -> Optional[float]:
+            """Start the next admitted provider; return how long to wait before hedging."""
+            while queue:
+                name = queue.pop(0)
+                if self.stats[name].allow_request():
+                    pending[asyncio.create_task(self._attempt(name, symbol))] = name
+                    return self.hedge_delay(name) if queue else None
+            return None
+
+        try:
+            timeout = launch()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Slowest acceptable latency (p95) exceeded: hedge with the next provider
+                    logger.info(f"Hedging {symbol} request to {queue[0]}")
+                    timeout = launch()
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    logger.warning(f"Provider {name} failed for {symbol}: {last_error}")
+
+                # Failed outright: fail over without waiting for a hedge delay
+                timeout = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise RuntimeError(f"All providers failed for {symbol}: {last_error}")
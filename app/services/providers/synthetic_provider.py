@@ -0,0 +1,336 @@
+import asyncio
+import hashlib
+import math
+import random
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from .base import BaseProvider, unique_symbols
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+SECONDS_PER_YEAR = 365 * SECONDS_PER_DAY  # The synthetic market never closes
+# Ticks per block: block endpoints come from one random walk per day, ticks
+# inside a block from a Brownian bridge between them, so any tick can be
+# generated without generating the whole day
+BLOCK_TICKS = 4096
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": SECONDS_PER_DAY}
+
+
+def stable_hash(text: str) -> int:
+    """64-bit hash of a string that is the same in every process (unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def interval_seconds(interval: str) -> int:
+    """Length of a bar interval such as "1m", "15m", "1h" or "1d"."""
+    try:
+        return int(interval[:-1]) * INTERVAL_UNITS[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported interval: {interval}")
+
+
+def ticks_per_day(rate: float) -> int:
+    """
+    Ticks in one day of the grid.
+
+    The grid restarts at every UTC midnight with a tick every 1 / rate
+    seconds; when the rate does not divide a day the last tick falls short
+    of the next midnight.
+    """
+    day = SECONDS_PER_DAY * 1_000_000
+    ticks = math.ceil(SECONDS_PER_DAY * rate)
+    # Settle float rounding against the grid's own tick times
+    while ticks > 1 and int((ticks - 1) * 1_000_000 / rate) >= day:
+        ticks -= 1
+    while int(ticks * 1_000_000 / rate) < day:
+        ticks += 1
+    return ticks
+
+
+@lru_cache(maxsize=16384)
+def _day_anchors(
+    seed: int, key: int, day: int, base: float, mu: float, sigma: float, rate: float
+) -> np.ndarray:
+    """
+    Log price at the start of every block of one day.
+
+    Each day opens at a price drawn around the symbol's base price (one
+    day's volatility, like an overnight gap), so prices stay in a realistic
+    range however far the clock runs.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence([seed, key, day]))
+    ticks = ticks_per_day(rate)
+    blocks = -(-ticks // BLOCK_TICKS)
+    years = np.full(blocks, BLOCK_TICKS / rate / SECONDS_PER_YEAR)
+    years[-1] = (ticks - (blocks - 1) * BLOCK_TICKS) / rate / SECONDS_PER_YEAR
+
+    opening = math.log(base) + sigma * math.sqrt(1 / 365) * rng.standard_normal()
+    steps = (mu - sigma ** 2 / 2) * years + sigma * np.sqrt(years) * rng.standard_normal(blocks)
+    return np.concatenate(([opening], opening + np.cumsum(steps)))
+
+
+class SyntheticProvider(BaseProvider):
+    """
+    Offline provider generating geometric Brownian motion ticks.
+
+    Every symbol has its own seeded path on a fixed tick grid (tick_rate
+    ticks per second from every UTC midnight), so any process asked for the
+    same symbol and time returns the same tick. Latency and errors can be
+    injected to exercise timeouts, hedging and retries under load.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        volatility: Optional[float] = None,
+        drift: Optional[float] = None,
+        tick_rate: Optional[float] = None,
+        latency: Optional[float] = None,
+        error_rate: Optional[float] = None,
+    ):
+        """
+        Initialize provider; unset arguments come from the SYNTHETIC_* settings.
+
+        Args:
+            seed: Seed shared by all symbols' paths
+            volatility: Annualized volatility (sigma)
+            drift: Annualized drift (mu)
+            tick_rate: Ticks per second per symbol
+            latency: Mean injected latency per request in seconds (exponential)
+            error_rate: Probability that a request raises ConnectionError
+        """
+        self.seed = settings.SYNTHETIC_SEED if seed is None else seed
+        self.volatility = settings.SYNTHETIC_VOLATILITY if volatility is None else volatility
+        self.drift = settings.SYNTHETIC_DRIFT if drift is None else drift
+        self.tick_rate = tick_rate or settings.SYNTHETIC_TICK_RATE
+        self.latency = settings.SYNTHETIC_LATENCY if latency is None else latency
+        self.error_rate = settings.SYNTHETIC_ERROR_RATE if error_rate is None else error_rate
+        self._faults = random.Random()  # Injected faults are not meant to be reproducible
+
+    def get_provider_name(self) -> str:
+        """Return provider identifier."""
+        return "synthetic"
+
+    def base_price(self, symbol: str) -> float:
+        """Price each day of a symbol's path is drawn around (10 to 500)."""
+        return 10.0 + stable_hash(symbol.upper()) % 49_000 / 100
+
+    def _block(self, symbol: str, day: int, block: int) -> np.ndarray:
+        """Prices of every tick in one block."""
+        key = stable_hash(symbol)
+        anchors = _day_anchors(
+            self.seed, key, day, self.base_price(symbol), self.drift, self.volatility, self.tick_rate
+        )
+        ticks = ticks_per_day(self.tick_rate)
+        n = min(BLOCK_TICKS, ticks - block * BLOCK_TICKS)
+
+        # Brownian bridge from this block's anchor to the next one
+        rng = np.random.default_rng(np.random.SeedSequence([self.seed, key, day, block, 1]))
+        step = self.volatility * math.sqrt(1 / self.tick_rate / SECONDS_PER_YEAR)
+        walk = np.concatenate(([0.0], np.cumsum(rng.standard_normal(n) * step)))
+        fraction = np.arange(n + 1) / n
+        path = anchors[block] + fraction * (anchors[block + 1] - anchors[block]) + walk - fraction * walk[-1]
+        return np.exp(path[:-1])
+
+    def _offset_micros(self, offset: int) -> int:
+        """Microseconds from midnight to a day's tick (the same rounding as ticks())."""
+        return int(offset * 1_000_000 / self.tick_rate)
+
+    def _tick_index(self, when: datetime, at_or_after: bool) -> int:
+        """
+        Global index (day * ticks per day + offset) of a tick near a time.
+
+        The day comes from the clock before the tick rate is applied: the
+        grid restarts every midnight, so scaling seconds since the epoch by
+        the rate would drift by a fraction of a tick per day when the rate
+        does not divide a day.
+
+        Args:
+            when: Time (naive UTC)
+            at_or_after: First tick at or after when; otherwise the last tick
+                at or before it
+
+        Returns:
+            Tick index
+        """
+        per_day = ticks_per_day(self.tick_rate)
+        delta = when - EPOCH
+        micros = delta.seconds * 1_000_000 + delta.microseconds
+        # Estimate from the rate, then settle on the grid's own rounding
+        offset = math.floor(micros * self.tick_rate / 1_000_000)
+        if self._offset_micros(offset + 1) <= micros:
+            offset += 1
+        elif self._offset_micros(offset) > micros:
+            offset -= 1
+        if at_or_after:
+            if self._offset_micros(offset) < micros:
+                offset += 1
+            offset = min(offset, per_day)  # Past the day's last tick: next midnight
+        else:
+            offset = min(offset, per_day - 1)  # After the day's last tick: that tick
+        return delta.days * per_day + offset
+
+    def ticks(self, symbol: str, start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Every tick of a symbol in [start, end), generated in vectorized blocks.
+
+        Args:
+            symbol: Stock symbol
+            start: Range start (naive UTC)
+            end: Range end (naive UTC)
+
+        Returns:
+            (timestamps as int64 microseconds since the epoch, float64 prices)
+        """
+        symbol = symbol.upper()
+        per_day = ticks_per_day(self.tick_rate)
+        first = self._tick_index(start, at_or_after=True)
+        last = self._tick_index(end, at_or_after=True)  # Exclusive
+
+        prices = []
+        tick = first
+        while tick < last:
+            day, offset = divmod(tick, per_day)
+            block, within = divmod(offset, BLOCK_TICKS)
+            chunk = self._block(symbol, day, block)[within:within + last - tick]
+            prices.append(chunk)
+            tick += len(chunk)
+
+        indices = np.arange(first, max(first, last), dtype=np.int64)
+        day, offset = np.divmod(indices, per_day)
+        # Ticks fall on an exact per-day grid even when tick_rate does not divide a day
+        timestamps = day * SECONDS_PER_DAY * 1_000_000 + (offset * 1_000_000 / self.tick_rate).astype(np.int64)
+        return timestamps, np.concatenate(prices) if prices else np.empty(0)
+
+    def price_at(self, symbol: str, when: datetime) -> Tuple[datetime, float]:
+        """
+        Latest tick of a symbol at or before a time.
+
+        Returns:
+            (tick time, price)
+        """
+        tick = self._tick_index(when, at_or_after=False)
+        day, offset = divmod(tick, ticks_per_day(self.tick_rate))
+        block, within = divmod(offset, BLOCK_TICKS)
+        price = float(self._block(symbol.upper(), day, block)[within])
+        timestamp = EPOCH + timedelta(days=day, microseconds=self._offset_micros(offset))
+        return timestamp, round(price, 4)
+
+    async def _inject_faults(self) -> None:
+        """Sleep for the injected latency, then fail at the injected error rate."""
+        if self.latency > 0:
+            await asyncio.sleep(self._faults.expovariate(1 / self.latency))
+        if self.error_rate > 0 and self._faults.random() < self.error_rate:
+            raise ConnectionError("Synthetic provider error (injected)")
+
+    async def get_latest_price(self, symbol: str) -> Dict[str, Any]:
+        """
+        Latest synthetic tick for a symbol.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Formatted price data; the timestamp is the tick's grid time, so
+            repeated requests within one tick are deduplicated downstream
+
+        Raises:
+            ConnectionError: When an error is injected
+        """
+        await self._inject_faults()
+        timestamp, price = self.price_at(symbol, datetime.utcnow())
+        raw_data = {"source": "synthetic", "seed": self.seed, "tick_rate": self.tick_rate}
+        return self.format_response(symbol=symbol, price=price, raw_data=raw_data, timestamp=timestamp)
+
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Latest synthetic ticks for several symbols, as one simulated request.
+
+        Latency and errors are injected once for the whole batch.
+
+        Raises:
+            ConnectionError: When an error is injected
+        """
+        await self._inject_faults()
+        now = datetime.utcnow()
+        raw_data = {"source": "synthetic", "seed": self.seed, "tick_rate": self.tick_rate}
+        results = {}
+        for symbol in unique_symbols(symbols):
+            timestamp, price = self.price_at(symbol, now)
+            results[symbol] = self.format_response(symbol=symbol, price=price, raw_data=raw_data, timestamp=timestamp)
+        return results
+
+    def _bars(self, symbol: str, start: datetime, end: datetime, interval: str) -> List[Dict[str, Any]]:
+        """OHLC bars of one symbol, aggregated with numpy."""
+        bar_micros = interval_seconds(interval) * 1_000_000
+        timestamps, prices = self.ticks(symbol, start, end)
+        if not len(timestamps):
+            return []
+        buckets = timestamps // bar_micros
+        starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+        ends = np.append(starts[1:], len(prices))
+        return [
+            {
+                "symbol": symbol.upper(),
+                "timestamp": EPOCH + timedelta(microseconds=int(bucket * bar_micros)),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "volume": float(v),
+            }
+            for bucket, o, h, l, c, v in zip(
+                buckets[starts].tolist(),
+                prices[starts].tolist(),
+                np.maximum.reduceat(prices, starts).tolist(),
+                np.minimum.reduceat(prices, starts).tolist(),
+                prices[ends - 1].tolist(),
+                (ends - starts).tolist(),
+            )
+        ]
+
+    async def get_history(
+        self, symbol: str, start: datetime, end: datetime, interval: str = "1d"
+    ) -> List[Dict[str, Any]]:
+        """
+        OHLC bars aggregated from the synthetic ticks.
+
+        Volume is the number of ticks in the bar. Cost grows with the number
+        of ticks covered, so keep tick_rate modest for long daily ranges.
+
+        Args:
+            symbol: Stock symbol
+            start: Range start (inclusive, naive UTC)
+            end: Range end (exclusive, naive UTC)
+            interval: Bar size ("1m", "5m", "1h", "1d", ...)
+
+        Returns:
+            Bars in chronological order
+        """
+        await self._inject_faults()
+        interval_seconds(interval)  # Reject a bad interval before generating anything
+
+        # Long ranges take a while to generate; keep the event loop free
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._bars, symbol, start, end, interval)
+
+    async def get_histories(
+        self, symbols: List[str], start: datetime, end: datetime, interval: str = "1d"
+    ) -> Dict[str, Any]:
+        """
+        Bars for several symbols, generated in one executor call.
+
+        Latency and errors are injected once for the whole batch.
+        """
+        await self._inject_faults()
+        interval_seconds(interval)
+        symbols = unique_symbols(symbols)
+
+        def _all_bars():
+            return {symbol: self._bars(symbol, start, end, interval) for symbol in symbols}
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _all_bars)
@@ -1,8 +1,73 @@
 import yfinance as yf
-from typing import Dict, Any
-from .base import BaseProvider
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from .base import BaseProvider, unique_symbols
+from app.core.config import settings
 import asyncio
+import logging
 import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+def _to_utc_naive(ts) -> Optional[datetime]:
+    """Convert a pandas/epoch timestamp to the naive UTC datetime we store."""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+    ts = ts.to_pydatetime()
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _frame_to_bars(symbol: str, hist) -> List[Dict[str, Any]]:
+    """Convert a history DataFrame to bar dicts without iterating rows."""
+    hist = hist.dropna(subset=["Close"])  # Batch downloads pad every ticker to a shared index
+    if hist.empty:
+        return []
+
+    index = hist.index
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+
+    return [
+        {
+            "symbol": symbol.upper(),
+            "timestamp": ts,
+            "open": float(o),
+            "high": float(h),
+            "low": float(l),
+            "close": float(c),
+            "volume": float(v),
+        }
+        for ts, o, h, l, c, v in zip(
+            index.to_pydatetime(),
+            hist["Open"].tolist(),
+            hist["High"].tolist(),
+            hist["Low"].tolist(),
+            hist["Close"].tolist(),
+            hist["Volume"].tolist(),
+        )
+    ]
+
+
+def _split_download(frame, symbols: List[str]) -> Dict[str, Any]:
+    """
+    Per-symbol frames of a yf.download(group_by="ticker") result.
+
+    Several tickers come back with (ticker, field) columns, a single
+    ticker with plain field columns. Tickers Yahoo did not return are
+    left out.
+    """
+    if frame is None or frame.empty:
+        return {}
+    if frame.columns.nlevels == 1:
+        return {symbols[0]: frame} if len(symbols) == 1 else {}
+    returned = set(frame.columns.get_level_values(0))
+    return {symbol: frame[symbol] for symbol in symbols if symbol in returned}
 
 
 class YFinanceProvider(BaseProvider):
@@ -41,6 +106,7 @@ class YFinanceProvider(BaseProvider):
                     print(f"Got minute data for {symbol}: ${latest_price}")
                     return {
                         "price": float(latest_price),
+                        "timestamp": _to_utc_naive(hist.index[-1]),
                         "raw_data": hist.tail(1).to_dict()
                     }
             except Exception as e:
@@ -54,6 +120,7 @@ class YFinanceProvider(BaseProvider):
                     print(f"Got daily data for {symbol}: ${latest_price}")
                     return {
                         "price": float(latest_price),
+                        "timestamp": _to_utc_naive(hist.index[-1]),
                         "raw_data": hist.tail(1).to_dict()
                     }
             except Exception as e:
@@ -67,6 +134,7 @@ class YFinanceProvider(BaseProvider):
                     print(f"Got info data for {symbol}: ${price}")
                     return {
                         "price": price,
+                        "timestamp": _to_utc_naive(info.get("regularMarketTime")),
                         "raw_data": {"source": "info", "price": price}
                     }
                 elif info and 'currentPrice' in info and info['currentPrice']:
@@ -87,6 +155,7 @@ class YFinanceProvider(BaseProvider):
                     print(f"Got monthly data for {symbol}: ${latest_price}")
                     return {
                         "price": float(latest_price),
+                        "timestamp": _to_utc_naive(hist.index[-1]),
                         "raw_data": hist.tail(1).to_dict()
                     }
             except Exception as e:
@@ -94,7 +163,8 @@ class YFinanceProvider(BaseProvider):
 
             # Strategy 5: Demo data fallback (ensures system doesn't break)
             print(f"All strategies failed for {symbol}, using demo data")
-            mock_price = 150.0 + (hash(symbol) % 100)  # Deterministic demo price
+            # crc32, not hash(): string hashes differ between processes
+            mock_price = 150.0 + zlib.crc32(symbol.upper().encode("utf-8")) % 100
             return {
                 "price": float(mock_price),
                 "raw_data": {"source": "demo", "symbol": symbol, "price": mock_price}
@@ -108,5 +178,126 @@ class YFinanceProvider(BaseProvider):
         return self.format_response(
             symbol=symbol, 
             price=result["price"], 
-            raw_data=result["raw_data"]
-        )
\ No newline at end of file
+            raw_data=result["raw_data"],
+            timestamp=result.get("timestamp"),
+        )
+
+    async def get_history(
+        self, symbol: str, start: datetime, end: datetime, interval: str = "1d"
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch historical OHLCV bars using Ticker.history.
+
+        Yahoo limits how far back intraday intervals reach per request, so
+        callers should split long ranges into chunks (see app.tools.backfill).
+
+        Args:
+            symbol: Stock symbol to fetch
+            start: Range start (inclusive, naive UTC)
+            end: Range end (exclusive, naive UTC)
+            interval: Bar size accepted by yfinance ("1m", "1h", "1d", ...)
+
+        Returns:
+            Bars in chronological order
+        """
+        def _fetch_history():
+            """Download bars for the whole range in one request."""
+            hist = yf.Ticker(symbol).history(
+                start=start, end=end, interval=interval, auto_adjust=False
+            )
+            return _frame_to_bars(symbol, hist)
+
+        # Run in thread pool to avoid blocking the async event loop
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _fetch_history)
+
+    async def _download(self, symbols: List[str], **kwargs):
+        """
+        yf.download of several tickers, or None if it fails.
+
+        yfinance requests each ticker on its own thread and joins the results
+        into one frame; PROVIDER_BATCH_CONCURRENCY bounds the threads.
+        """
+        def _fetch():
+            return yf.download(
+                tickers=symbols,
+                group_by="ticker",
+                threads=settings.PROVIDER_BATCH_CONCURRENCY,  # True would mean 2 per CPU
+                auto_adjust=False,
+                ignore_tz=False,  # Keep exchange time zones so bars match get_history
+                progress=False,
+                **kwargs,
+            )
+
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(None, _fetch)
+        except Exception as e:
+            logger.warning(f"yfinance download of {len(symbols)} symbols failed: {e}")
+            return None
+
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Fetch latest prices with one yf.download of today's minute bars.
+
+        Symbols the download does not cover fall back to get_latest_price
+        and its strategies, with bounded concurrency.
+
+        Args:
+            symbols: Stock symbols to fetch
+
+        Returns:
+            Dict mapping each uppercase symbol to its price data or to the
+            exception its fallback fetch raised
+        """
+        symbols = unique_symbols(symbols)
+        frame = await self._download(symbols, period="1d", interval="1m")
+
+        results = {}
+        for symbol, hist in _split_download(frame, symbols).items():
+            hist = hist.dropna(subset=["Close"])
+            if hist.empty:
+                continue
+            last = hist.iloc[-1]
+            raw_data = {"source": "download"}
+            raw_data.update((field, float(last[field])) for field in ("Open", "High", "Low", "Close", "Volume"))
+            results[symbol] = self.format_response(
+                symbol=symbol,
+                price=float(last["Close"]),
+                raw_data=raw_data,
+                timestamp=_to_utc_naive(hist.index[-1]),
+            )
+
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing:
+            results.update(await self._fan_out(missing, self.get_latest_price))
+        return {symbol: results[symbol] for symbol in symbols}
+
+    async def get_histories(
+        self, symbols: List[str], start: datetime, end: datetime, interval: str = "1d"
+    ) -> Dict[str, Any]:
+        """
+        Fetch historical OHLCV bars for several symbols with one yf.download.
+
+        Args:
+            symbols: Stock symbols to fetch
+            start: Range start (inclusive, naive UTC)
+            end: Range end (exclusive, naive UTC)
+            interval: Bar size accepted by yfinance ("1m", "1h", "1d", ...)
+
+        Returns:
+            Dict mapping each uppercase symbol to its bars in chronological
+            order (empty when Yahoo has none)
+
+        Raises:
+            ConnectionError: If the download fails
+        """
+        symbols = unique_symbols(symbols)
+        frame = await self._download(symbols, start=start, end=end, interval=interval)
+        if frame is None:
+            raise ConnectionError(f"yfinance download of {len(symbols)} symbols failed")
+        frames = _split_download(frame, symbols)
+        return {
+            symbol: _frame_to_bars(symbol, frames[symbol]) if symbol in frames else []
+            for symbol in symbols
+        }
@@ -0,0 +1,273 @@
+import fcntl
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, NamedTuple, Optional
+from app.core.config import settings
+from app.services.tick_store import from_micros, to_micros
+
+logger = logging.getLogger(__name__)
+
+# Segment layout (little-endian):
+#   header   magic, layout version, capacity, padded to one record
+#   records  capacity fixed-size slots: seqlock version, symbol, provider,
+#            price, quote timestamp (UTC micros), write time (epoch seconds)
+MAGIC = b"MQTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<Q16s16sdqd")
+SEQ = struct.Struct("<Q")
+SLOT_SIZE = 64
+HEADER_SIZE = SLOT_SIZE
+
+# Reads retried while a writer holds the record before giving up
+READ_RETRIES = 100
+
+
+class Quote(NamedTuple):
+    """Latest quote read from the shared table."""
+
+    symbol: str
+    provider: str
+    price: float
+    timestamp: datetime
+    updated_at: float
+
+
+class QuoteTable:
+    """
+    Latest price per symbol in shared memory, visible to every process on the host.
+
+    Records are fixed 64-byte slots in an open-addressed hash table keyed by
+    the CRC32 of the symbol, so any process can find a symbol's slot without
+    coordination. Writers serialize on an flock()ed file next to the segment
+    and bump the record's seqlock version to odd before writing and to even
+    after. Readers take no lock: they read the version, the record and the
+    version again, and retry if a write was in progress or happened between
+    the two reads. Slots are never moved or freed, so the table holds at most
+    `capacity` symbols.
+    """
+
+    def __init__(self, name: str, capacity: Optional[int] = None):
+        """
+        Attach to the named table, creating it if it does not exist.
+
+        Args:
+            name: Shared memory segment name
+            capacity: Symbol slots when creating (an existing table keeps its own)
+        """
+        self.name = name
+        self._lock = _FileLock(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+        # Slot per symbol, resolved once per process; slots never move
+        self._slots: Dict[str, int] = {}
+        self._full_warned = False
+
+        with self._lock:
+            try:
+                capacity = capacity or settings.QUOTE_TABLE_CAPACITY
+                self._shm = shared_memory.SharedMemory(
+                    name=name, create=True, size=HEADER_SIZE + capacity * SLOT_SIZE
+                )
+                HEADER.pack_into(self._shm.buf, 0, MAGIC, VERSION, capacity)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+        # The segment outlives any one worker; by default Python unlinks it
+        # when the process that opened it exits
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        magic, version, self.capacity = HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Shared memory {name} is not a version {VERSION} quote table")
+        self._buf = self._shm.buf
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * SLOT_SIZE
+
+    def _read(self, slot: int) -> Optional[tuple]:
+        """Consistent copy of one record, or None if writers kept it busy."""
+        offset = self._offset(slot)
+        for _ in range(READ_RETRIES):
+            before = SEQ.unpack_from(self._buf, offset)[0]
+            if before & 1:
+                continue
+            record = RECORD.unpack_from(self._buf, offset)
+            if SEQ.unpack_from(self._buf, offset)[0] == before:
+                return record
+        return None
+
+    def _find(self, key: bytes, claim: bool) -> Optional[int]:
+        """
+        Slot holding a symbol, probing linearly from its hash.
+
+        With claim (writers only, under the lock) an empty slot is taken for
+        an unknown symbol.
+        """
+        start = zlib.crc32(key) % self.capacity
+        for i in range(self.capacity):
+            slot = (start + i) % self.capacity
+            offset = self._offset(slot) + SEQ.size
+            stored = bytes(self._buf[offset:offset + 16])
+            if stored == key:
+                return slot
+            if stored == bytes(16):
+                if not claim:
+                    return None
+                self._buf[offset:offset + 16] = key
+                return slot
+        return None
+
+    def put(self, symbol: str, provider: str, price: float, timestamp: datetime) -> bool:
+        """
+        Store a quote unless the table already holds a newer one for the symbol.
+
+        Args:
+            symbol: Stock symbol
+            provider: Provider that supplied the quote
+            price: Quote price
+            timestamp: Quote time (naive UTC)
+
+        Returns:
+            False if the table is full and the symbol has no slot
+        """
+        symbol = symbol.upper()
+        key = _key(symbol)
+        micros = to_micros(timestamp)
+        with self._lock:
+            slot = self._slots.get(symbol)
+            if slot is None:
+                slot = self._find(key, claim=True)
+                if slot is None:
+                    if not self._full_warned:
+                        logger.warning(f"Quote table {self.name} is full ({self.capacity} symbols)")
+                        self._full_warned = True
+                    return False
+                self._slots[symbol] = slot
+
+            offset = self._offset(slot)
+            seq, _, _, _, stored_micros, _ = RECORD.unpack_from(self._buf, offset)
+            if stored_micros > micros:
+                return True  # An older quote arrived late
+            SEQ.pack_into(self._buf, offset, seq + 1)
+            RECORD.pack_into(
+                self._buf, offset, seq + 1, key, _key(provider), price, micros, time.time()
+            )
+            SEQ.pack_into(self._buf, offset, seq + 2)
+        return True
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        """
+        Latest quote for a symbol, without locking.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Quote, or None if the symbol was never stored
+        """
+        symbol = symbol.upper()
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = self._find(_key(symbol), claim=False)
+            if slot is None:
+                return None
+            self._slots[symbol] = slot
+
+        record = self._read(slot)
+        if record is None or record[5] == 0:
+            return None  # Busy, or claimed but not written yet
+        _, _, provider, price, micros, updated_at = record
+        return Quote(symbol, provider.rstrip(b"\0").decode("utf-8"), price, from_micros(micros), updated_at)
+
+    def close(self) -> None:
+        """Detach this process from the table."""
+        self._buf = None
+        self._shm.close()
+        self._lock.close()
+
+    def unlink(self) -> None:
+        """Remove the segment; processes still attached keep their mapping."""
+        resource_tracker.register(self._shm._name, "shared_memory")  # unlink() unregisters it
+        self._shm.unlink()
+        try:
+            os.unlink(self._lock.path)
+        except FileNotFoundError:
+            pass
+
+
+def _key(name: str) -> bytes:
+    """Fixed 16-byte field for a symbol or provider name."""
+    return name.encode("utf-8")[:16].ljust(16, b"\0")
+
+
+class _FileLock:
+    """
+    Exclusive lock across processes (flock) and across threads of this one.
+
+    flock() locks belong to the open file, which every thread shares.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+b")
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# Process-wide attachment, opened on first use when QUOTE_TABLE_NAME is set
+_quote_table: Optional[QuoteTable] = None
+_quote_table_failed = False
+
+
+def get_quote_table() -> Optional[QuoteTable]:
+    """Return the shared quote table, or None if it is disabled or unavailable."""
+    global _quote_table, _quote_table_failed
+    if _quote_table is None and settings.QUOTE_TABLE_NAME and not _quote_table_failed:
+        try:
+            _quote_table = QuoteTable(settings.QUOTE_TABLE_NAME)
+        except (OSError, ValueError) as e:
+            logger.error(f"Shared quote table unavailable: {e}")
+            _quote_table_failed = True  # Don't retry on every request
+    return _quote_table
+
+
+def fresh_quote(symbol: str, provider: str, max_age: Optional[float] = None) -> Optional[Quote]:
+    """
+    Shared-table quote for a symbol if it was written within max_age seconds.
+
+    A quote only answers a request for the provider that supplied it, except
+    for "smart", which may be answered by any source.
+
+    Args:
+        symbol: Stock symbol
+        provider: Requested provider
+        max_age: Seconds since the quote was stored (defaults to QUOTE_TABLE_MAX_AGE)
+
+    Returns:
+        Quote, or None if there is no fresh quote from the provider
+    """
+    table = get_quote_table()
+    if table is None:
+        return None
+    quote = table.get(symbol)
+    max_age = settings.QUOTE_TABLE_MAX_AGE if max_age is None else max_age
+    if quote is None or time.time() - quote.updated_at > max_age:
+        return None
+    if provider != "smart" and quote.provider != provider:
+        return None
+    return quote
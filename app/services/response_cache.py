@@ -0,0 +1,142 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+import orjson
+from app.core.config import settings
+from app.services.tick_store import to_micros
+
+
+class CachedResponse(NamedTuple):
+    """A JSON response encoded once, with its validators."""
+
+    body: bytes
+    etag: str
+    last_modified: Optional[str]
+    expires: float  # time.monotonic() deadline; 0 when not cacheable
+
+    def max_age(self) -> int:
+        """Seconds clients may reuse the response without revalidating."""
+        return max(0, int(self.expires - time.monotonic()))
+
+
+def max_age_for(provider: str) -> int:
+    """Cache lifetime of a provider's quotes (HTTP_CACHE_MAX_AGES overrides HTTP_CACHE_MAX_AGE)."""
+    for item in settings.HTTP_CACHE_MAX_AGES.split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            if name.strip() == provider:
+                return int(seconds)
+    return settings.HTTP_CACHE_MAX_AGE
+
+
+def make_etag(parts: Iterable[Any]) -> str:
+    """Strong ETag for a representation identified by parts (e.g. symbol, provider, timestamp)."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(timestamp: datetime) -> str:
+    """Format a naive UTC timestamp as an HTTP date (Last-Modified)."""
+    return format_datetime(timestamp.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag.
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so a W/
+    prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def encode(
+    payload: Any, parts: Iterable[Any], timestamp: Optional[datetime], max_age: int = 0
+) -> CachedResponse:
+    """
+    Encode a response body with orjson and derive its validators.
+
+    Args:
+        payload: JSON-serializable body (datetimes are written in ISO format)
+        parts: Values identifying the representation, hashed into the ETag
+        timestamp: Time the data last changed (naive UTC), for Last-Modified
+        max_age: Seconds the response may be reused
+
+    Returns:
+        CachedResponse
+    """
+    return CachedResponse(
+        body=orjson.dumps(payload),
+        etag=make_etag(parts),
+        last_modified=http_date(timestamp) if timestamp is not None else None,
+        expires=time.monotonic() + max_age if max_age > 0 else 0.0,
+    )
+
+
+def encode_quote(symbol: str, price: float, timestamp: datetime, provider: str) -> CachedResponse:
+    """Encode a latest-price response (the PriceResponse shape) for a provider's quote."""
+    payload = {"symbol": symbol, "price": float(price), "timestamp": timestamp, "provider": provider}
+    # The price is part of the ETag so a corrected quote at the same timestamp is not a 304
+    parts = (symbol.upper(), provider, to_micros(timestamp), float(price))
+    return encode(payload, parts, timestamp, max_age_for(provider))
+
+
+class ResponseCache:
+    """
+    Encoded latest-price responses per (symbol, requested provider).
+
+    Entries expire after their provider's max-age; until then a request is
+    answered from the stored bytes (or with 304) without calling the
+    provider, touching the database or validating through Pydantic. Least
+    recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.HTTP_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+
+    def get(self, symbol: str, provider: str) -> Optional[CachedResponse]:
+        """Unexpired response for a symbol and requested provider, or None."""
+        key = (symbol.upper(), provider)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, symbol: str, provider: str, entry: CachedResponse) -> None:
+        """Store a response if its provider allows caching."""
+        if not entry.expires:
+            return
+        key = (symbol.upper(), provider)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "max_entries": self.max_entries}
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,128 @@
+import threading
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from app.models.database import dialect_insert
+from app.models.market_data import Provider, Symbol
+
+
+class _Dictionary:
+    """Two-way name <-> ID cache for one dictionary table in one database."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+
+
+class SymbolRegistry:
+    """
+    In-process intern cache for the symbols and providers dictionary tables.
+
+    IDs never change once assigned, so cached entries are never invalidated;
+    only names not seen before cost a database round trip. New names are
+    inserted in their own short transaction (ON CONFLICT DO NOTHING, then
+    read back) so a caller's rollback cannot leave a cached ID that points
+    at a row that was never committed.
+    """
+
+    def __init__(self):
+        """Initialize empty caches (kept per database URL)."""
+        self._caches: Dict[tuple, _Dictionary] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _engine(bind):
+        """Accept a Session or an Engine."""
+        return bind.get_bind() if hasattr(bind, "get_bind") else bind
+
+    def _cache(self, engine, model) -> _Dictionary:
+        key = (str(engine.url), model.__tablename__)
+        with self._lock:
+            if key not in self._caches:
+                self._caches[key] = _Dictionary()
+            return self._caches[key]
+
+    def _intern(self, bind, model, column, names: Iterable[str], create: bool) -> Dict[str, int]:
+        """Resolve names to IDs, inserting unknown ones if create is set."""
+        engine = self._engine(bind)
+        cache = self._cache(engine, model)
+        names = set(names)
+        missing = [name for name in names if name not in cache.ids]
+
+        if missing:
+            with engine.begin() as conn:
+                if create:
+                    conn.execute(
+                        dialect_insert(conn, model)
+                        .values([{column.key: name} for name in missing])
+                        .on_conflict_do_nothing()
+                    )
+                rows = conn.execute(select(model.id, column).where(column.in_(missing))).all()
+            with self._lock:
+                for row_id, name in rows:
+                    cache.ids[name] = row_id
+                    cache.names[row_id] = name
+
+        return {name: cache.ids[name] for name in names if name in cache.ids}
+
+    def _names(self, bind, model, column, ids: Iterable[int]) -> Dict[int, str]:
+        """Resolve IDs back to names."""
+        engine = self._engine(bind)
+        cache = self._cache(engine, model)
+        ids = set(ids)
+        missing = [row_id for row_id in ids if row_id not in cache.names]
+
+        if missing:
+            with engine.connect() as conn:
+                rows = conn.execute(select(model.id, column).where(model.id.in_(missing))).all()
+            with self._lock:
+                for row_id, name in rows:
+                    cache.ids[name] = row_id
+                    cache.names[row_id] = name
+
+        return {row_id: cache.names[row_id] for row_id in ids if row_id in cache.names}
+
+    def symbol_ids(self, bind, tickers: Iterable[str], create: bool = True) -> Dict[str, int]:
+        """
+        Map tickers to symbol IDs.
+
+        Args:
+            bind: Session or Engine
+            tickers: Uppercase tickers
+            create: Register unknown tickers (False for read paths)
+
+        Returns:
+            Mapping for every ticker that has (or was given) an ID
+        """
+        return self._intern(bind, Symbol, Symbol.ticker, tickers, create)
+
+    def symbol_id(self, bind, ticker: str, create: bool = True) -> Optional[int]:
+        """Map one ticker to its symbol ID (None if unknown and create is off)."""
+        return self.symbol_ids(bind, [ticker], create).get(ticker)
+
+    def tickers(self, bind, symbol_ids: Iterable[int]) -> Dict[int, str]:
+        """Map symbol IDs back to tickers."""
+        return self._names(bind, Symbol, Symbol.ticker, symbol_ids)
+
+    def provider_ids(self, bind, names: Iterable[str], create: bool = True) -> Dict[str, int]:
+        """Map provider names to provider IDs (see symbol_ids)."""
+        return self._intern(bind, Provider, Provider.name, names, create)
+
+    def provider_id(self, bind, name: str, create: bool = True) -> Optional[int]:
+        """Map one provider name to its ID (None if unknown and create is off)."""
+        return self.provider_ids(bind, [name], create).get(name)
+
+    def provider_names(self, bind, provider_ids: Iterable[int]) -> Dict[int, str]:
+        """Map provider IDs back to names."""
+        return self._names(bind, Provider, Provider.name, provider_ids)
+
+
+# Process-wide registry shared by MarketService, the consumer and tools
+_registry: Optional[SymbolRegistry] = None
+
+
+def get_symbol_registry() -> SymbolRegistry:
+    """Return the process-wide symbol/provider intern cache."""
+    global _registry
+    if _registry is None:
+        _registry = SymbolRegistry()
+    return _registry
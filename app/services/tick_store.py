@@ -0,0 +1,262 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Marker for a series known to hold every tick the database has
+FULL_HISTORY = -(2 ** 63)
+
+
+def to_micros(timestamp: datetime) -> int:
+    """Convert a naive UTC datetime to integer epoch microseconds."""
+    return (timestamp - EPOCH) // ONE_MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert integer epoch microseconds back to a naive UTC datetime."""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class SymbolSeries:
+    """
+    Columnar tick buffer for one symbol, sorted by timestamp.
+
+    Prices and timestamps live in typed arrays (8 bytes each per tick)
+    rather than per-tick objects. Once the buffer exceeds its capacity by a
+    quarter the oldest ticks are dropped in one slice, which keeps appends
+    amortized O(1) and the arrays contiguous for binary search.
+    """
+
+    __slots__ = ("timestamps", "prices", "capacity", "complete_from", "verified_at")
+
+    def __init__(self, capacity: int):
+        self.timestamps = array("q")
+        self.prices = array("d")
+        self.capacity = capacity
+        # Ticks at or after this time are all present (None: unknown)
+        self.complete_from: Optional[int] = None
+        # time.monotonic() of the database read behind complete_from
+        self.verified_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, micros: int, price: float) -> None:
+        """Insert a tick, keeping timestamp order and skipping exact duplicates."""
+        timestamps = self.timestamps
+        if not timestamps or micros > timestamps[-1]:
+            timestamps.append(micros)
+            self.prices.append(price)
+        else:
+            # Late tick: insert in place (rare; ticks mostly arrive in order)
+            index = bisect_left(timestamps, micros)
+            if index < len(timestamps) and timestamps[index] == micros and self.prices[index] == price:
+                return
+            timestamps.insert(index, micros)
+            self.prices.insert(index, price)
+
+        if len(timestamps) >= self.capacity + self.capacity // 4 + 1:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop all but the newest capacity ticks."""
+        excess = len(self.timestamps) - self.capacity
+        if excess > 0:
+            del self.timestamps[:excess]
+            del self.prices[:excess]
+            self.complete_from = self.timestamps[0]
+
+    def last(self, n: int) -> Tuple[array, array]:
+        """Newest n ticks as (timestamps, prices), oldest first."""
+        return self.timestamps[-n:], self.prices[-n:]
+
+    def between(self, start: int, end: int) -> Tuple[array, array]:
+        """Ticks with start <= timestamp <= end, found by binary search."""
+        lo = bisect_left(self.timestamps, start)
+        hi = bisect_right(self.timestamps, end)
+        return self.timestamps[lo:hi], self.prices[lo:hi]
+
+    def nbytes(self) -> int:
+        """Bytes held by the tick arrays (including spare capacity)."""
+        return (
+            self.timestamps.buffer_info()[1] * self.timestamps.itemsize
+            + self.prices.buffer_info()[1] * self.prices.itemsize
+        )
+
+
+class TickStore:
+    """
+    In-memory store of recent ticks per symbol.
+
+    Answers last-N and time-range queries when it can prove it holds every
+    matching tick, and returns None otherwise so callers fall back to the
+    database (and can seed the store with what they read via load()).
+    Live ticks keep a series current, but rows can also reach the database
+    without an event (a backfill, another process), so a series only
+    answers for TICK_STORE_VERIFY_TTL seconds after it was last loaded.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity: Ticks kept per symbol (16 bytes each)
+        """
+        self.capacity = capacity or settings.TICK_STORE_CAPACITY
+        self.series: Dict[str, SymbolSeries] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _complete_from(series: Optional[SymbolSeries]) -> Optional[int]:
+        """A series' completeness bound, or None if unknown or no longer trusted."""
+        if series is None or time.monotonic() - series.verified_at >= settings.TICK_STORE_VERIFY_TTL:
+            return None
+        return series.complete_from
+
+    def _series(self, symbol: str) -> SymbolSeries:
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = SymbolSeries(self.capacity)
+        return series
+
+    def add(self, symbol: str, timestamp: datetime, price: float) -> None:
+        """
+        Record a live tick.
+
+        Args:
+            symbol: Stock symbol
+            timestamp: Quote time (naive UTC)
+            price: Quote price
+        """
+        with self._lock:
+            self._series(symbol).add(to_micros(timestamp), price)
+
+    def load(self, symbol: str, ticks: List[Tuple[datetime, float]], complete_from: Optional[datetime]) -> None:
+        """
+        Merge ticks read from the database.
+
+        Args:
+            symbol: Stock symbol
+            ticks: (timestamp, price) pairs, in any order
+            complete_from: Time from which ticks is everything the database
+                has, or None if ticks is the symbol's entire history
+        """
+        with self._lock:
+            series = self._series(symbol)
+            for timestamp, price in sorted(ticks):
+                series.add(to_micros(timestamp), price)
+            bound = FULL_HISTORY if complete_from is None else to_micros(complete_from)
+            current = self._complete_from(series)
+            # An expired bound may predate rows written since, so it is replaced
+            if current is None or bound < current:
+                series.complete_from = bound
+            series.verified_at = time.monotonic()
+            series.compact()
+
+    def last(self, symbol: str, n: int) -> Optional[List[Tuple[datetime, float]]]:
+        """
+        Newest n ticks for a symbol, oldest first.
+
+        Returns:
+            The ticks, or None if the store cannot answer without the database
+        """
+        with self._lock:
+            series = self.series.get(symbol)
+            complete_from = self._complete_from(series)
+            if complete_from is None:
+                return None  # Only live ticks seen, or not checked lately; older ones may be missing
+            if len(series) < n:
+                if complete_from != FULL_HISTORY:
+                    return None
+            elif series.timestamps[-n] < complete_from:
+                return None
+            timestamps, prices = series.last(n)
+        return [(from_micros(t), p) for t, p in zip(timestamps, prices)]
+
+    def latest(self, symbol: str) -> Optional[Tuple[datetime, float]]:
+        """
+        Newest tick seen for a symbol, regardless of completeness.
+
+        Returns:
+            (timestamp, price), or None if the symbol has no ticks
+        """
+        with self._lock:
+            series = self.series.get(symbol)
+            if not series:
+                return None
+            return from_micros(series.timestamps[-1]), series.prices[-1]
+
+    def range(self, symbol: str, start: datetime, end: datetime) -> Optional[List[Tuple[datetime, float]]]:
+        """
+        Ticks for a symbol between start and end inclusive.
+
+        Returns:
+            The ticks, or None if the store cannot answer without the database
+        """
+        start_micros = to_micros(start)
+        with self._lock:
+            series = self.series.get(symbol)
+            complete_from = self._complete_from(series)
+            if complete_from is None or complete_from > start_micros:
+                return None
+            timestamps, prices = series.between(start_micros, to_micros(end))
+        return [(from_micros(t), p) for t, p in zip(timestamps, prices)]
+
+    def snapshot(self, max_ticks: int) -> List[Tuple[str, Optional[int], array, array]]:
+        """
+        Copy the newest ticks of every symbol, e.g. for a checkpoint.
+
+        Args:
+            max_ticks: Ticks copied per symbol
+
+        Returns:
+            (symbol, complete_from, timestamps, prices) per symbol; complete_from
+            is adjusted to the first copied tick when older ticks are left out
+        """
+        with self._lock:
+            snapshot = []
+            for symbol, series in self.series.items():
+                timestamps, prices = series.last(max_ticks)
+                complete_from = self._complete_from(series)  # An expired bound is saved as unknown
+                if complete_from is not None and len(timestamps) < len(series):
+                    complete_from = max(complete_from, timestamps[0])
+                snapshot.append((symbol, complete_from, timestamps, prices))
+            return snapshot
+
+    def restore(self, series: Dict[str, SymbolSeries], age: float = 0.0) -> None:
+        """
+        Replace the series of the given symbols, e.g. from a checkpoint.
+
+        Args:
+            series: Series by symbol
+            age: Seconds since their completeness was established
+        """
+        verified_at = time.monotonic() - age
+        with self._lock:
+            for symbol_series in series.values():
+                symbol_series.verified_at = verified_at
+            self.series.update(series)
+
+    def nbytes(self) -> int:
+        """Bytes held by all tick arrays."""
+        with self._lock:
+            return sum(series.nbytes() for series in self.series.values())
+
+
+# Process-wide store fed by the consumer and MarketService
+_tick_store: Optional[TickStore] = None
+
+
+def get_tick_store() -> TickStore:
+    """Return the process-wide tick store."""
+    global _tick_store
+    if _tick_store is None:
+        _tick_store = TickStore()
+    return _tick_store
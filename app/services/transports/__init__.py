@@ -0,0 +1,33 @@
+import importlib
+from typing import Type
+from .base import BaseTransport
+
+# Registry of event bus backends, mapping names to "module:ClassName" paths.
+# Modules are imported on first use so that confluent_kafka is only loaded
+# by deployments that actually talk to a broker.
+TRANSPORTS = {
+    "kafka": "app.services.transports.kafka_transport:KafkaTransport",
+    "memory": "app.services.transports.memory_transport:MemoryTransport",
+    "log": "app.services.transports.log_transport:LogTransport",
+}
+
+
+def get_transport(backend: str) -> BaseTransport:
+    """
+    Factory function to create transport instances.
+
+    Args:
+        backend: Name of backend to create ("kafka", "memory", "log")
+
+    Returns:
+        Instantiated transport implementing BaseTransport
+
+    Raises:
+        ValueError: If backend is not supported
+    """
+    if backend not in TRANSPORTS:
+        raise ValueError(f"Unknown event bus backend: {backend}")
+
+    module_path, class_name = TRANSPORTS[backend].split(":")
+    transport_class: Type[BaseTransport] = getattr(importlib.import_module(module_path), class_name)
+    return transport_class()
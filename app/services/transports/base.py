@@ -0,0 +1,135 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+
+def symbol_shard(symbol: str, shards: int) -> int:
+    """
+    Map a symbol to a stable shard index.
+
+    Uses CRC32 rather than hash() so every process agrees on the mapping
+    regardless of hash randomization. All events for one symbol land on
+    the same shard, which preserves per-symbol ordering.
+
+    Args:
+        symbol: Stock symbol
+        shards: Total number of shards
+
+    Returns:
+        Shard index in range [0, shards)
+    """
+    return zlib.crc32(symbol.upper().encode("utf-8")) % shards
+
+
+class Event(NamedTuple):
+    """A message read from a transport, with the position it was read at."""
+
+    key: bytes
+    value: bytes
+    partition: int
+    offset: int
+
+
+class BaseTransport(ABC):
+    """
+    Abstract base class for event bus transports.
+
+    A transport moves keyed byte messages from producers to a single
+    consumer group. Messages with the same key land on the same partition,
+    so per-symbol ordering is preserved by every backend.
+    """
+
+    @abstractmethod
+    async def publish(self, topic: str, key: bytes, value: bytes) -> None:
+        """
+        Publish one message.
+
+        Args:
+            topic: Topic name
+            key: Partitioning key (the symbol)
+            value: Serialized message body
+        """
+        pass
+
+    @abstractmethod
+    def subscribe(self, topic: str, positions: Optional[Dict[int, int]] = None) -> None:
+        """
+        Start consuming a topic from the group's committed positions.
+
+        Args:
+            topic: Topic name
+            positions: Next position to read per partition, overriding the
+                committed ones (e.g. restored from a consumer checkpoint)
+        """
+        pass
+
+    @abstractmethod
+    def positions(self) -> Dict[int, int]:
+        """Next position to read per partition, for events delivered so far."""
+        pass
+
+    @abstractmethod
+    async def poll(self, timeout: float) -> Optional[Event]:
+        """
+        Wait for the next message.
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The next event, or None if nothing arrived in time
+
+        Raises:
+            Exception: On a transport error the consumer cannot continue past
+        """
+        pass
+
+    async def poll_batch(self, max_messages: int, timeout: float) -> List[Event]:
+        """
+        Wait for a message, then take whatever else is already available.
+
+        Args:
+            max_messages: Largest batch to return
+            timeout: Seconds to wait for the first message
+
+        Returns:
+            Up to max_messages events (empty if nothing arrived in time)
+        """
+        event = await self.poll(timeout)
+        batch = []
+        while event is not None:
+            batch.append(event)
+            if len(batch) >= max_messages:
+                break
+            event = await self.poll(0)
+        return batch
+
+    def sibling(self, group: Optional[str] = None) -> "BaseTransport":
+        """
+        New transport on the same bus, e.g. to consume a second topic.
+
+        Args:
+            group: Suffix of the sibling's own consumer group (e.g. "retry.1"),
+                for backends whose groups span topics; None shares this group
+
+        Returns:
+            Unsubscribed transport sharing this one's configuration
+        """
+        return type(self)()
+
+    def lag(self) -> Optional[int]:
+        """Messages behind the end of the subscribed topic, or None if unknown."""
+        return None
+
+    def check_connection(self, timeout: float) -> None:
+        """
+        Confirm the transport is usable; raise if it is not.
+
+        Args:
+            timeout: Seconds to wait for the backend
+        """
+        pass
+
+    def close(self) -> None:
+        """Flush pending messages and release resources."""
+        pass
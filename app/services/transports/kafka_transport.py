@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, TYPE_CHECKING
+from app.core.config import settings
+from .base import BaseTransport, Event
+
+if TYPE_CHECKING:
+    from confluent_kafka import Producer, Consumer
+
+logger = logging.getLogger(__name__)
+
+# Consumer group of the price events consumer; siblings append a suffix
+DEFAULT_GROUP_ID = "market-data-consumers"
+
+
+class KafkaTransport(BaseTransport):
+    """
+    Transport backed by a Kafka cluster via confluent_kafka.
+
+    Producer and consumer are created lazily, and confluent_kafka itself is
+    only imported once a client is first needed. The client calls block, so
+    they run on worker threads to keep the event loop (and other consumers
+    sharing it, such as the retry lanes) responsive.
+    """
+
+    def __init__(self, group_id: Optional[str] = None):
+        """
+        Initialize Kafka configurations for producer and consumer.
+
+        Args:
+            group_id: Consumer group (defaults to DEFAULT_GROUP_ID)
+        """
+        # Producer configuration for publishing price events
+        self.producer_config = {
+            "bootstrap.servers": settings.KAFKA_BOOTSTRAP_SERVERS,
+            "client.id": "market-data-producer",
+        }
+
+        # Consumer configuration for processing price events
+        self.consumer_config = {
+            "bootstrap.servers": settings.KAFKA_BOOTSTRAP_SERVERS,
+            "group.id": group_id or DEFAULT_GROUP_ID,
+            "auto.offset.reset": "earliest",  # Start from beginning if no offset
+        }
+
+        # Lazy initialization - created when first needed
+        self.producer: Optional["Producer"] = None
+        self.consumer: Optional["Consumer"] = None
+        # Next offset per partition for delivered messages
+        self._positions: Dict[int, int] = {}
+        # Offsets to seek to when partitions are first assigned
+        self._start_positions: Dict[int, int] = {}
+        # Held by a poll running on a worker thread, so close() waits for it
+        self._consumer_lock = threading.Lock()
+
+    def sibling(self, group: Optional[str] = None) -> "KafkaTransport":
+        """
+        Transport on the same cluster, in its own consumer group if group is given.
+
+        A sibling sharing the group would join it as another member and take
+        over partitions of the main topic in the next rebalance.
+        """
+        group_id = self.consumer_config["group.id"]
+        return type(self)(f"{group_id}.{group}" if group else group_id)
+
+    def get_producer(self) -> "Producer":
+        """Get or create Kafka producer instance (lazy initialization)."""
+        if not self.producer:
+            from confluent_kafka import Producer
+
+            self.producer = Producer(self.producer_config)
+        return self.producer
+
+    def get_consumer(self) -> "Consumer":
+        """Get or create Kafka consumer instance (lazy initialization)."""
+        if not self.consumer:
+            from confluent_kafka import Consumer
+
+            self.consumer = Consumer(self.consumer_config)
+        return self.consumer
+
+    async def publish(self, topic: str, key: bytes, value: bytes) -> None:
+        """Produce a message and wait briefly for delivery."""
+        producer = self.get_producer()
+
+        def delivery_callback(err, msg):
+            """Callback to handle message delivery confirmation."""
+            if err:
+                logger.error(f"Failed to deliver message: {err}")
+            else:
+                logger.info(f"Message delivered to {msg.topic()} [{msg.partition()}]")
+
+        # Symbol key drives Kafka's partitioning
+        producer.produce(topic=topic, key=key, value=value, callback=delivery_callback)
+        # Wait for message to be delivered
+        await asyncio.to_thread(producer.flush, 1.0)
+
+    def subscribe(self, topic: str, positions: Optional[Dict[int, int]] = None) -> None:
+        """Join the consumer group on topic, seeking to positions on first assignment."""
+        self._start_positions = dict(positions or {})
+
+        def on_assign(consumer, partitions):
+            """Start assigned partitions at their restored offsets (once each)."""
+            for tp in partitions:
+                if tp.partition in self._start_positions:
+                    tp.offset = self._start_positions.pop(tp.partition)
+            consumer.assign(partitions)
+
+        self.get_consumer().subscribe([topic], on_assign=on_assign)
+
+    def positions(self) -> Dict[int, int]:
+        """Next offset per partition for messages delivered so far."""
+        return dict(self._positions)
+
+    async def poll(self, timeout: float) -> Optional[Event]:
+        """Poll the consumer; partition EOF is not an error."""
+        from confluent_kafka import KafkaError, KafkaException
+
+        consumer = self.get_consumer()
+
+        def _poll():
+            with self._consumer_lock:
+                return consumer.poll(timeout)
+
+        # A cancelled await leaves the thread polling until timeout; the lock
+        # keeps close() from closing the consumer underneath it
+        msg = await asyncio.to_thread(_poll) if timeout > 0 else _poll()
+        if msg is None:
+            return None  # No message available
+
+        if msg.error():
+            if msg.error().code() == KafkaError._PARTITION_EOF:
+                return None  # End of partition, not an error
+            raise KafkaException(msg.error())
+
+        self._positions[msg.partition()] = msg.offset() + 1
+        return Event(msg.key() or b"", msg.value(), msg.partition(), msg.offset())
+
+    def lag(self) -> Optional[int]:
+        """
+        Compute total lag across the partitions assigned to this consumer.
+
+        Uses cached high watermarks so it is cheap enough to call from a
+        reporting thread while the consume loop is polling.
+        """
+        if not self.consumer:
+            return None
+
+        assignment = self.consumer.assignment()
+        if not assignment:
+            return 0
+
+        lag = 0
+        for tp in self.consumer.position(assignment):
+            low, high = self.consumer.get_watermark_offsets(tp, cached=True)
+            if high < 0:
+                continue  # Watermarks not fetched yet
+            # Negative position means nothing consumed yet on this partition
+            position = tp.offset if tp.offset >= 0 else low
+            lag += max(high - position, 0)
+        return lag
+
+    def check_connection(self, timeout: float) -> None:
+        """Fetch price topic metadata to confirm the brokers are reachable."""
+        self.get_producer().list_topics(topic=settings.KAFKA_TOPIC_PRICE_EVENTS, timeout=timeout)
+
+    def close(self) -> None:
+        """Clean up producer and consumer connections."""
+        if self.producer:
+            self.producer.flush()  # Ensure all messages are sent
+        if self.consumer:
+            with self._consumer_lock:
+                self.consumer.close()
+            self.consumer = None
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.core.config import settings
+from .base import BaseTransport, Event, symbol_shard
+
+# Record header: key length, value length (little-endian uint32)
+RECORD_HEADER = struct.Struct("<II")
+
+
+class _PartitionReader:
+    """mmap view over one partition log, remapped as the file grows."""
+
+    def __init__(self, path: Path):
+        self.fd = os.open(path, os.O_RDONLY)
+        self.view: Optional[mmap.mmap] = None
+
+    def size(self) -> int:
+        return os.fstat(self.fd).st_size
+
+    def read(self, position: int) -> Optional[tuple]:
+        """
+        Read the record at position.
+
+        Returns:
+            (key, value, next_position), or None if no complete record yet
+        """
+        size = self.size()
+        if position + RECORD_HEADER.size > size:
+            return None
+        if self.view is None or len(self.view) < size:
+            if self.view is not None:
+                self.view.close()
+            self.view = mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ)
+
+        key_len, value_len = RECORD_HEADER.unpack_from(self.view, position)
+        start = position + RECORD_HEADER.size
+        end = start + key_len + value_len
+        if end > len(self.view):
+            return None  # Record still being written
+        return (
+            self.view[start:start + key_len],
+            self.view[start + key_len:end],
+            end,
+        )
+
+    def count_from(self, position: int) -> int:
+        """Number of complete records from position to the end of the file."""
+        size = self.size()
+        if position >= size:
+            return 0
+        count = 0
+        with mmap.mmap(self.fd, 0, access=mmap.ACCESS_READ) as view:
+            while position + RECORD_HEADER.size <= size:
+                key_len, value_len = RECORD_HEADER.unpack_from(view, position)
+                position += RECORD_HEADER.size + key_len + value_len
+                if position > size:
+                    break
+                count += 1
+        return count
+
+    def close(self) -> None:
+        if self.view is not None:
+            self.view.close()
+        os.close(self.fd)
+
+
+class LogTransport(BaseTransport):
+    """
+    Durable single-node transport over append-only partition files.
+
+    Each partition is a file of length-prefixed records under
+    EVENT_BUS_LOG_DIR/<topic>/. Producers append with O_APPEND (one write
+    per record, so several API processes can share a partition), the
+    consumer reads through mmap and commits byte offsets to an offsets file
+    so it resumes where it left off after a restart.
+
+    There is one offsets file per topic, so a topic has exactly one consumer
+    process. Files are never rolled over or truncated: they grow without
+    bound until removed by hand while the consumer is stopped.
+    """
+
+    def __init__(
+        self,
+        log_dir: Optional[str] = None,
+        partitions: Optional[int] = None,
+        fsync: Optional[bool] = None,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            log_dir: Directory holding topic logs
+            partitions: Partitions per topic
+            fsync: Whether to fsync after every append
+        """
+        self.log_dir = Path(log_dir or settings.EVENT_BUS_LOG_DIR)
+        self.partitions = partitions or settings.EVENT_BUS_PARTITIONS
+        self.fsync = settings.EVENT_BUS_LOG_FSYNC if fsync is None else fsync
+
+        self._writers: Dict[tuple, int] = {}
+        self._topic: Optional[str] = None
+        self._readers: List[_PartitionReader] = []
+        self._positions: List[int] = []
+        self._cursor = 0
+        self._committed_at = 0.0
+
+    def sibling(self, group: Optional[str] = None) -> "LogTransport":
+        """Transport over the same log directory (offsets are kept per topic, so group is not needed)."""
+        return LogTransport(str(self.log_dir), self.partitions, self.fsync)
+
+    def _partition_path(self, topic: str, partition: int) -> Path:
+        return self.log_dir / topic / f"{partition}.log"
+
+    def _offsets_path(self) -> Path:
+        return self.log_dir / self._topic / "offsets.json"
+
+    def _open_writer(self, topic: str, partition: int) -> int:
+        """Get or open an append-only descriptor for a partition file."""
+        if (topic, partition) not in self._writers:
+            path = self._partition_path(topic, partition)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._writers[(topic, partition)] = os.open(
+                path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+        return self._writers[(topic, partition)]
+
+    async def publish(self, topic: str, key: bytes, value: bytes) -> None:
+        """Append one length-prefixed record to the key's partition."""
+        fd = self._open_writer(topic, symbol_shard(key.decode("utf-8"), self.partitions))
+        # Single write() so concurrent appenders never interleave a record
+        os.write(fd, RECORD_HEADER.pack(len(key), len(value)) + key + value)
+        if self.fsync:
+            os.fsync(fd)
+
+    def subscribe(self, topic: str, positions: Optional[Dict[int, int]] = None) -> None:
+        """Open every partition for reading from the committed (or given) offsets."""
+        self._topic = topic
+        for partition in range(self.partitions):
+            os.close(self._open_writer(topic, partition))  # Ensure the file exists
+            del self._writers[(topic, partition)]
+            self._readers.append(_PartitionReader(self._partition_path(topic, partition)))
+
+        committed: Dict[str, int] = {}
+        if self._offsets_path().exists():
+            committed = json.loads(self._offsets_path().read_text())
+        self._positions = [committed.get(str(p), 0) for p in range(self.partitions)]
+        for partition, position in (positions or {}).items():
+            if partition < self.partitions:
+                self._positions[partition] = position
+
+    def positions(self) -> Dict[int, int]:
+        """Next byte offset per partition."""
+        return dict(enumerate(self._positions))
+
+    def commit(self) -> None:
+        """Persist consumer positions atomically."""
+        path = self._offsets_path()
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({str(p): pos for p, pos in enumerate(self._positions)}))
+        os.replace(tmp_path, path)
+        self._committed_at = time.monotonic()
+
+    def _take(self) -> Optional[Event]:
+        """Read the next record, visiting partitions round robin."""
+        for step in range(self.partitions):
+            index = (self._cursor + step) % self.partitions
+            record = self._readers[index].read(self._positions[index])
+            if record is not None:
+                key, value, next_position = record
+                event = Event(key, value, index, self._positions[index])
+                self._positions[index] = next_position
+                self._cursor = index + 1
+                return event
+        return None
+
+    async def poll(self, timeout: float) -> Optional[Event]:
+        """Return the next record, tailing the files for up to timeout."""
+        if time.monotonic() - self._committed_at >= settings.EVENT_BUS_COMMIT_INTERVAL:
+            self.commit()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            event = self._take()
+            if event is not None:
+                return event
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(settings.EVENT_BUS_LOG_POLL_INTERVAL, remaining))
+
+    def lag(self) -> Optional[int]:
+        """Records appended but not yet consumed."""
+        if self._topic is None:
+            return None
+        return sum(r.count_from(pos) for r, pos in zip(self._readers, self._positions))
+
+    def check_connection(self, timeout: float) -> None:
+        """Confirm the log directory is writable."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        if not os.access(self.log_dir, os.W_OK):
+            raise PermissionError(f"Event log directory {self.log_dir} is not writable")
+
+    def close(self) -> None:
+        """Commit positions and close every file."""
+        if self._topic is not None:
+            self.commit()
+        for reader in self._readers:
+            reader.close()
+        for fd in self._writers.values():
+            os.close(fd)
+        self._readers, self._writers, self._topic = [], {}, None
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+from app.core.config import settings
+from .base import BaseTransport, Event, symbol_shard
+
+
+class _Partition:
+    """Bounded in-memory partition; offsets keep counting past evicted messages."""
+
+    __slots__ = ("messages", "end")
+
+    def __init__(self, retention: int):
+        self.messages: Deque[Tuple[bytes, bytes]] = deque(maxlen=retention)
+        self.end = 0  # Offset the next message will get
+
+    @property
+    def base(self) -> int:
+        """Offset of the oldest retained message."""
+        return self.end - len(self.messages)
+
+
+class _Topic:
+    """Partitions, consumer group positions and waiting consumers of one topic."""
+
+    def __init__(self, partitions: int, retention: int):
+        self.partitions = [_Partition(retention) for _ in range(partitions)]
+        self.positions = [0] * partitions
+        self.cursor = 0  # Next partition to read, for round-robin fairness
+        self.waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self.lock = threading.Lock()
+
+    def append(self, key: bytes, value: bytes) -> None:
+        """Append to the key's partition and wake waiting consumers."""
+        with self.lock:
+            partition = self.partitions[symbol_shard(key.decode("utf-8"), len(self.partitions))]
+            partition.messages.append((key, value))
+            partition.end += 1
+            waiters = list(self.waiters)
+
+        for loop, waiter in waiters:
+            try:
+                # Producers may run on another thread's loop (e.g. the API
+                # under a test client), so wake consumers thread-safely
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                with self.lock:
+                    self.waiters.discard((loop, waiter))  # Loop already closed
+
+    def take(self) -> Optional[Event]:
+        """Pop the next message for the group, visiting partitions round robin."""
+        with self.lock:
+            count = len(self.partitions)
+            for step in range(count):
+                index = (self.cursor + step) % count
+                partition = self.partitions[index]
+                # Messages evicted before being read are skipped
+                position = max(self.positions[index], partition.base)
+                if position < partition.end:
+                    key, value = partition.messages[position - partition.base]
+                    self.positions[index] = position + 1
+                    self.cursor = index + 1
+                    return Event(key, value, index, position)
+        return None
+
+    def lag(self) -> int:
+        """Messages not yet taken by the group."""
+        with self.lock:
+            return sum(
+                p.end - max(position, p.base)
+                for p, position in zip(self.partitions, self.positions)
+            )
+
+
+class MemoryBus:
+    """Process-local registry of in-memory topics."""
+
+    def __init__(self, partitions: Optional[int] = None, retention: Optional[int] = None):
+        """
+        Initialize an empty bus.
+
+        Args:
+            partitions: Partitions per topic
+            retention: Messages kept per partition before the oldest are dropped
+        """
+        self.partitions = partitions or settings.EVENT_BUS_PARTITIONS
+        self.retention = retention or settings.EVENT_BUS_MEMORY_RETENTION
+        self.topics: Dict[str, _Topic] = {}
+        self._lock = threading.Lock()
+
+    def topic(self, name: str) -> _Topic:
+        """Get or create a topic."""
+        with self._lock:
+            if name not in self.topics:
+                self.topics[name] = _Topic(self.partitions, self.retention)
+            return self.topics[name]
+
+
+# Bus shared by every MemoryTransport in the process, so the API's producer
+# and an in-process consumer see the same topics.
+_default_bus: Optional[MemoryBus] = None
+
+
+def get_memory_bus() -> MemoryBus:
+    """Return the process-wide in-memory bus."""
+    global _default_bus
+    if _default_bus is None:
+        _default_bus = MemoryBus()
+    return _default_bus
+
+
+class MemoryTransport(BaseTransport):
+    """
+    Asyncio in-memory transport for single-process deployments and tests.
+
+    Messages are partitioned by symbol like Kafka and read by a single
+    consumer group. Nothing survives a restart; use the log backend for that.
+    """
+
+    def __init__(self, bus: Optional[MemoryBus] = None):
+        """
+        Initialize transport.
+
+        Args:
+            bus: Bus to attach to (defaults to the process-wide one)
+        """
+        self.bus = bus or get_memory_bus()
+        self._topic: Optional[_Topic] = None
+
+    def sibling(self, group: Optional[str] = None) -> "MemoryTransport":
+        """Transport on the same bus (positions are kept per topic, so group is not needed)."""
+        return MemoryTransport(self.bus)
+
+    async def publish(self, topic: str, key: bytes, value: bytes) -> None:
+        """Append the message to its partition."""
+        self.bus.topic(topic).append(key, value)
+
+    def subscribe(self, topic: str, positions: Optional[Dict[int, int]] = None) -> None:
+        """Consume topic from the group's current positions (or the given ones)."""
+        self._topic = self.bus.topic(topic)
+        with self._topic.lock:
+            for partition, position in (positions or {}).items():
+                if partition < len(self._topic.positions):
+                    self._topic.positions[partition] = position
+
+    def positions(self) -> Dict[int, int]:
+        """Next offset per partition for the group."""
+        if self._topic is None:
+            return {}
+        with self._topic.lock:
+            return dict(enumerate(self._topic.positions))
+
+    async def poll(self, timeout: float) -> Optional[Event]:
+        """Return the next message, waiting up to timeout for one to arrive."""
+        topic = self._topic
+        event = topic.take()
+        if event is not None or timeout <= 0:
+            return event
+
+        # Register before re-checking so a publish in between is not missed
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with topic.lock:
+            topic.waiters.add(waiter)
+        try:
+            event = topic.take()
+            if event is None:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+                event = topic.take()
+            return event
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with topic.lock:
+                topic.waiters.discard(waiter)
+
+    def lag(self) -> Optional[int]:
+        """Messages published but not yet consumed."""
+        return self._topic.lag() if self._topic else None
@@ -0,0 +1,476 @@
+"""
+Bulk historical backfill for price_points (ticks) or price_bars.
+
+Pulls history through the providers in chunks, or streams local CSV/Parquet
+files, and loads rows with COPY on PostgreSQL (batched executemany on other
+databases). Progress is checkpointed so an interrupted run resumes where it
+stopped. Backfilled rows do not publish Kafka events.
+
+Usage:
+    python -m app.tools.backfill --symbols AAPL,MSFT --start 2019-01-01 --end 2024-01-01
+    python -m app.tools.backfill --symbols AAPL --start 2024-06-01 --interval 1m --bars
+    python -m app.tools.backfill --file history.csv --file more.parquet
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.models.database import engine as default_engine, dialect_insert
+from app.models.market_data import PricePoint, PriceBar
+from app.services.market_service import price_event_id
+from app.services.providers import get_provider
+from app.services.symbol_registry import get_symbol_registry
+
+logger = logging.getLogger(__name__)
+
+# Longest range requested from a provider in one call, per bar interval.
+# Yahoo rejects intraday ranges beyond these spans.
+CHUNK_SPANS = {
+    "1m": timedelta(days=7),
+    "2m": timedelta(days=59),
+    "5m": timedelta(days=59),
+    "15m": timedelta(days=59),
+    "30m": timedelta(days=59),
+    "60m": timedelta(days=729),
+    "1h": timedelta(days=729),
+}
+DEFAULT_CHUNK_SPAN = timedelta(days=365 * 5)
+
+TICK_COLUMNS = ("id", "symbol", "price", "timestamp", "provider")
+# price_points stores dictionary IDs in place of the symbol/provider strings
+TICK_TABLE_COLUMNS = ("id", "symbol_id", "price", "timestamp", "provider_id")
+BAR_COLUMNS = ("symbol", "interval", "timestamp", "open", "high", "low", "close", "volume", "provider")
+
+
+def to_utc_naive(value: Any) -> datetime:
+    """Parse a timestamp (datetime or ISO string) into naive UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def chunk_ranges(
+    start: datetime, end: datetime, interval: str
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Split [start, end) into provider-sized chunks.
+
+    Args:
+        start: Range start
+        end: Range end
+        interval: Bar interval, used to pick the chunk span
+
+    Yields:
+        (chunk_start, chunk_end) pairs covering the range in order
+    """
+    span = CHUNK_SPANS.get(interval, DEFAULT_CHUNK_SPAN)
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + span, end)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
+
+
+def record_to_row(
+    record: Dict[str, Any], provider: str, interval: str, as_bars: bool
+) -> Tuple:
+    """
+    Convert a bar/tick record into a row tuple for the target table.
+
+    Ticks use the close (or explicit price) as the price and get the same
+    deterministic ID the live ingestion path would assign.
+
+    Args:
+        record: Dict with symbol, timestamp and price or OHLC(V) fields
+        provider: Provider label stored with the row
+        interval: Bar interval (bars only)
+        as_bars: Build a price_bars row instead of a price_points row
+
+    Returns:
+        Row tuple ordered like BAR_COLUMNS or TICK_COLUMNS
+    """
+    symbol = str(record["symbol"]).upper()
+    timestamp = to_utc_naive(record["timestamp"])
+    provider = record.get("provider") or provider
+
+    if as_bars:
+        close = float(record["close"])
+        volume = record.get("volume")
+        return (
+            symbol,
+            interval,
+            timestamp,
+            float(record.get("open") or close),
+            float(record.get("high") or close),
+            float(record.get("low") or close),
+            close,
+            float(volume) if volume not in (None, "") else None,
+            provider,
+        )
+
+    price = record.get("price")
+    price = float(price if price not in (None, "") else record["close"])
+    return (price_event_id(symbol, provider, timestamp), symbol, price, timestamp, provider)
+
+
+class BatchWriter:
+    """
+    Loads row batches into price_points or price_bars.
+
+    On PostgreSQL each batch is streamed with COPY into a session-local
+    staging table and merged with INSERT ... SELECT ... ON CONFLICT DO NOTHING,
+    so reruns and overlapping ranges are safe. Other databases fall back to a
+    batched executemany with the same conflict handling.
+    """
+
+    def __init__(self, engine=None, as_bars: bool = False):
+        """
+        Initialize writer for the target table.
+
+        Args:
+            engine: SQLAlchemy engine (defaults to the application engine)
+            as_bars: Write price_bars instead of price_points
+        """
+        self.engine = engine or default_engine
+        self.model = PriceBar if as_bars else PricePoint
+        self.columns = BAR_COLUMNS if as_bars else TICK_TABLE_COLUMNS
+
+    def write(self, rows: Sequence[Tuple]) -> int:
+        """
+        Write one batch of rows.
+
+        Args:
+            rows: Row tuples ordered like TICK_COLUMNS or BAR_COLUMNS
+
+        Returns:
+            Number of rows actually inserted (duplicates excluded)
+        """
+        if not rows:
+            return 0
+        if self.model is PricePoint:
+            rows = self._intern(rows)
+        if self.engine.dialect.name == "postgresql":
+            return self._copy(rows)
+        return self._executemany(rows)
+
+    def _intern(self, rows: Sequence[Tuple]) -> List[Tuple]:
+        """Replace symbol/provider strings in tick rows with dictionary IDs."""
+        registry = get_symbol_registry()
+        symbol_ids = registry.symbol_ids(self.engine, {row[1] for row in rows})
+        provider_ids = registry.provider_ids(self.engine, {row[4] for row in rows})
+        return [
+            (row_id, symbol_ids[symbol], price, timestamp, provider_ids[provider])
+            for row_id, symbol, price, timestamp, provider in rows
+        ]
+
+    def _copy(self, rows: Sequence[Tuple]) -> int:
+        """Stream rows through COPY into a staging table, then merge."""
+        table = self.model.__tablename__
+        staging = f"backfill_{table}"
+        columns = ", ".join(f'"{c}"' for c in self.columns)
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            # Temp tables are per connection; rows vanish at commit
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} "
+                f"ON CONFLICT DO NOTHING"
+            )
+            inserted = cursor.rowcount
+            raw.commit()
+            return inserted
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+
+    def _executemany(self, rows: Sequence[Tuple]) -> int:
+        """Insert rows with one executemany per batch."""
+        with self.engine.begin() as conn:
+            stmt = dialect_insert(conn, self.model).on_conflict_do_nothing()
+            result = conn.execute(stmt, [dict(zip(self.columns, row)) for row in rows])
+            return max(result.rowcount, 0)
+
+
+class Checkpoint:
+    """
+    Resumable progress stored as a small JSON file.
+
+    Values are per-key markers (chunk end timestamps for provider symbols,
+    row counts for files). Each update rewrites the file atomically.
+    """
+
+    def __init__(self, path: Optional[str]):
+        """
+        Load existing progress from path (no persistence if path is None).
+
+        Args:
+            path: Checkpoint file location
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._state = json.load(f)
+
+    def get(self, key: str) -> Any:
+        """Return the stored marker for key, if any."""
+        with self._lock:
+            return self._state.get(key)
+
+    def update(self, key: str, value: Any) -> None:
+        """Store a marker for key and persist the checkpoint file."""
+        with self._lock:
+            self._state[key] = value
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.path)
+
+
+def batched(rows: List[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """Yield consecutive slices of at most size rows."""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+async def backfill_symbols(
+    symbols: List[str],
+    provider_name: str,
+    start: datetime,
+    end: datetime,
+    interval: str,
+    writer: BatchWriter,
+    checkpoint: Checkpoint,
+    as_bars: bool,
+    batch_size: int,
+    semaphore: asyncio.Semaphore,
+) -> int:
+    """
+    Backfill a group of symbols from a provider, chunk by chunk.
+
+    Each chunk is requested for the whole group in one get_histories call
+    (one download where the provider supports it). Symbols keep their own
+    checkpoints, so a symbol that failed is retried from its last chunk on
+    the next run.
+
+    Args:
+        symbols: Stock symbols fetched together
+        provider_name: Provider to pull history from
+        start: Range start
+        end: Range end
+        interval: Bar interval
+        writer: Destination writer
+        checkpoint: Progress store; completed chunks are skipped
+        as_bars: Store bars instead of ticks
+        batch_size: Rows per write
+        semaphore: Limits how many groups are fetched concurrently
+
+    Returns:
+        Number of rows inserted
+
+    Raises:
+        Exception: The first symbol's fetch error, once the other symbols
+            of the group are done
+    """
+    kind = "bars" if as_bars else "ticks"
+    keys = {symbol: f"{provider_name}:{symbol}:{interval}:{kind}" for symbol in symbols}
+    done_until = {}
+    for symbol, key in keys.items():
+        marker = checkpoint.get(key)
+        done_until[symbol] = datetime.fromisoformat(marker) if marker else None
+    provider = get_provider(provider_name)
+    failures = {}
+    inserted = 0
+
+    async with semaphore:
+        for chunk_start, chunk_end in chunk_ranges(start, end, interval):
+            pending = [
+                symbol for symbol in symbols
+                if symbol not in failures and not (done_until[symbol] and chunk_end <= done_until[symbol])
+            ]
+            if not pending:
+                continue  # Finished in a previous run
+
+            histories = await provider.get_histories(pending, chunk_start, chunk_end, interval)
+            for symbol in pending:
+                bars = histories.get(symbol.upper(), [])
+                if isinstance(bars, Exception):
+                    failures[symbol] = bars
+                    logger.error(f"{symbol}: {chunk_start:%Y-%m-%d} -> {chunk_end:%Y-%m-%d} failed: {bars}")
+                    continue
+                rows = [record_to_row(bar, provider_name, interval, as_bars) for bar in bars]
+                for batch in batched(rows, batch_size):
+                    # Writes block on the database, keep them off the event loop
+                    inserted += await asyncio.to_thread(writer.write, batch)
+
+                checkpoint.update(keys[symbol], chunk_end.isoformat())
+                logger.info(f"{symbol}: {chunk_start:%Y-%m-%d} -> {chunk_end:%Y-%m-%d}, {len(rows)} rows")
+
+    if failures:
+        raise next(iter(failures.values()))
+    return inserted
+
+
+def read_file_records(path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream records from a CSV or Parquet file in batches.
+
+    Args:
+        path: File path (.csv or .parquet)
+        batch_size: Records per yielded batch
+
+    Yields:
+        Lists of record dicts keyed by column name
+    """
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Reading Parquet files requires pyarrow")
+
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield record_batch.to_pylist()
+        return
+
+    with open(path, newline="") as f:
+        batch = []
+        for record in csv.DictReader(f):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def import_file(
+    path: str,
+    provider_name: str,
+    interval: str,
+    writer: BatchWriter,
+    checkpoint: Checkpoint,
+    as_bars: bool,
+    batch_size: int,
+) -> int:
+    """
+    Load a local CSV/Parquet file, resuming after already imported rows.
+
+    Files need symbol and timestamp columns plus price or close; bars also
+    use open/high/low/volume when present. An optional provider column
+    overrides provider_name per row.
+
+    Returns:
+        Number of rows inserted
+    """
+    key = f"file:{os.path.abspath(path)}:{interval}:{'bars' if as_bars else 'ticks'}"
+    skip = checkpoint.get(key) or 0
+    seen = inserted = 0
+
+    for records in read_file_records(path, batch_size):
+        first = max(skip - seen, 0)  # Rows of this batch imported previously
+        seen += len(records)
+        if first >= len(records):
+            continue
+        rows = [record_to_row(r, provider_name, interval, as_bars) for r in records[first:]]
+        inserted += writer.write(rows)
+        checkpoint.update(key, seen)
+
+    logger.info(f"{path}: {seen} rows read")
+    return inserted
+
+
+async def run_backfill(args: argparse.Namespace, engine=None) -> int:
+    """Run the backfill described by parsed CLI arguments."""
+    writer = BatchWriter(engine, as_bars=args.bars)
+    checkpoint = Checkpoint(args.checkpoint)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    tasks = []
+    for i in range(0, len(args.symbols), args.group_size):
+        tasks.append(
+            backfill_symbols(
+                args.symbols[i:i + args.group_size], args.provider, args.start, args.end, args.interval,
+                writer, checkpoint, args.bars, args.batch_size, semaphore,
+            )
+        )
+    for path in args.file:
+        tasks.append(
+            asyncio.to_thread(
+                import_file, path, args.provider, args.interval,
+                writer, checkpoint, args.bars, args.batch_size,
+            )
+        )
+
+    results = await asyncio.gather(*tasks)
+    return sum(results)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Bulk historical price backfill")
+    parser.add_argument(
+        "--symbols",
+        type=lambda s: [x.strip().upper() for x in s.split(",") if x.strip()],
+        default=[],
+        help="Comma-separated symbols to pull from the provider",
+    )
+    parser.add_argument("--file", action="append", default=[], help="CSV or Parquet file to load")
+    parser.add_argument("--provider", default=settings.DEFAULT_PROVIDER)
+    parser.add_argument("--start", type=to_utc_naive, default=None, help="ISO date/time")
+    parser.add_argument("--end", type=to_utc_naive, default=None, help="ISO date/time (default now)")
+    parser.add_argument("--interval", default="1d", help="Bar interval, e.g. 1m, 1h, 1d")
+    parser.add_argument("--bars", action="store_true", help="Store OHLCV bars instead of ticks")
+    parser.add_argument("--concurrency", type=int, default=4, help="Symbol groups fetched in parallel")
+    parser.add_argument("--group-size", type=int, default=20, help="Symbols per provider request")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY batch")
+    parser.add_argument("--checkpoint", default=".backfill_checkpoint.json")
+    args = parser.parse_args(argv)
+
+    if not args.symbols and not args.file:
+        parser.error("provide --symbols and/or --file")
+    if args.symbols and args.start is None:
+        parser.error("--start is required with --symbols")
+    args.end = args.end or datetime.utcnow()
+    return args
+
+
+def main(argv=None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    started = time.perf_counter()
+    inserted = asyncio.run(run_backfill(args))
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Backfill complete: {inserted} rows inserted in {elapsed:.1f}s "
+        f"({inserted / elapsed * 60:,.0f} rows/min)"
+    )
+
+
+if __name__ == "__main__":
+    main()
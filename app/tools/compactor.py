@@ -0,0 +1,304 @@
+"""
+Retention compactor for price_points, price_bars and raw_market_responses.
+
+Old data is downsampled through retention tiers instead of kept forever:
+ticks older than RETENTION_TICK_DAYS are rolled up into 1-minute bars, and
+1-minute bars older than RETENTION_MINUTE_BAR_DAYS into daily bars. Daily
+bars are kept forever unless RETENTION_DAILY_BAR_DAYS is set. Raw provider
+responses older than RETENTION_RAW_RESPONSE_DAYS are deleted outright.
+
+Rollups move source rows in chunks of COMPACTION_DELETE_BATCH rows, oldest
+first: each chunk is deleted and merged into its bars by one set-based
+statement (DELETE ... RETURNING feeding INSERT ... SELECT), so a run never
+holds long locks and an interrupted run neither loses nor double-counts
+rows. A bar that already exists (an earlier run, a late tick) absorbs the
+new rows: high and low widen, close moves to the newest row and volumes add.
+
+Usage:
+    python -m app.tools.compactor --once
+    python -m app.tools.compactor --once --vacuum
+    python -m app.tools.compactor            # Run every COMPACTION_INTERVAL seconds
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.models.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Merge rows rolled up into a bar that already exists. Chunks are taken in
+# timestamp order, so the incoming rows are the newer ones.
+MERGE_BAR_SQL = """
+    ON CONFLICT (symbol, interval, timestamp) DO UPDATE SET
+        high = GREATEST(price_bars.high, EXCLUDED.high),
+        low = LEAST(price_bars.low, EXCLUDED.low),
+        close = EXCLUDED.close,
+        volume = COALESCE(price_bars.volume + EXCLUDED.volume, price_bars.volume, EXCLUDED.volume)
+    RETURNING xmax = 0 AS inserted
+"""
+
+# Ticks -> 1m bars. Ticks of one symbol from several providers share a bar,
+# as price_bars is keyed by (symbol, interval, timestamp). Returns the
+# number of ticks moved and of bars created (rather than merged into).
+ROLLUP_TICKS_SQL = """
+    WITH moved AS (
+        DELETE FROM price_points
+        WHERE ctid = ANY(ARRAY(
+            SELECT ctid FROM price_points
+            WHERE timestamp >= :lo AND timestamp < :hi
+            ORDER BY timestamp LIMIT :batch
+        ))
+        RETURNING symbol_id, provider_id, timestamp, price
+    ), merged AS (
+        INSERT INTO price_bars (symbol, interval, timestamp, open, high, low, close, volume, provider)
+        SELECT s.ticker, '1m', date_trunc('minute', m.timestamp),
+               (array_agg(m.price ORDER BY m.timestamp))[1],
+               max(m.price), min(m.price),
+               (array_agg(m.price ORDER BY m.timestamp DESC))[1],
+               NULL, min(pr.name)
+        FROM moved m
+        JOIN symbols s ON s.id = m.symbol_id
+        JOIN providers pr ON pr.id = m.provider_id
+        GROUP BY s.ticker, date_trunc('minute', m.timestamp)
+""" + MERGE_BAR_SQL + """
+    )
+    SELECT (SELECT count(*) FROM moved), count(*) FILTER (WHERE inserted) FROM merged
+"""
+
+# 1m bars -> 1d bars
+ROLLUP_MINUTE_BARS_SQL = """
+    WITH moved AS (
+        DELETE FROM price_bars
+        WHERE ctid = ANY(ARRAY(
+            SELECT ctid FROM price_bars
+            WHERE interval = '1m' AND timestamp >= :lo AND timestamp < :hi
+            ORDER BY timestamp LIMIT :batch
+        ))
+        RETURNING symbol, timestamp, open, high, low, close, volume, provider
+    ), merged AS (
+        INSERT INTO price_bars (symbol, interval, timestamp, open, high, low, close, volume, provider)
+        SELECT symbol, '1d', date_trunc('day', timestamp),
+               (array_agg(open ORDER BY timestamp))[1],
+               max(high), min(low),
+               (array_agg(close ORDER BY timestamp DESC))[1],
+               sum(volume), min(provider)
+        FROM moved
+        GROUP BY symbol, date_trunc('day', timestamp)
+""" + MERGE_BAR_SQL + """
+    )
+    SELECT (SELECT count(*) FROM moved), count(*) FILTER (WHERE inserted) FROM merged
+"""
+
+SLICE = timedelta(days=1)
+
+
+def retention_cutoff(now: datetime, days: int) -> Optional[datetime]:
+    """
+    Start of the day `days` days before now, or None if the tier is kept forever.
+
+    Cutoffs fall on day boundaries so no minute or day bucket is split
+    between a compacted and a retained part.
+    """
+    if days <= 0:
+        return None
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class Compactor:
+    """Applies the retention tiers to one database."""
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        delete_batch: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ):
+        """
+        Initialize compactor.
+
+        Args:
+            engine: Database engine (PostgreSQL)
+            delete_batch: Rows deleted per transaction
+            now: Reference time for the cutoffs (defaults to utcnow per run)
+
+        Raises:
+            ValueError: If the engine is not PostgreSQL (the rollups and
+                chunked deletes use Postgres-only SQL)
+        """
+        self.engine = engine or default_engine
+        if self.engine.dialect.name != "postgresql":
+            raise ValueError(f"The compactor requires PostgreSQL, not {self.engine.dialect.name}")
+        self.delete_batch = delete_batch or settings.COMPACTION_DELETE_BATCH
+        self.now = now
+
+    def run(self, vacuum: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Compact every tier once.
+
+        Args:
+            vacuum: Run VACUUM (ANALYZE) on the compacted tables afterwards
+
+        Returns:
+            Per-table counts: rows rolled up, bars written, rows deleted and
+            estimated bytes reclaimed
+        """
+        now = self.now or datetime.utcnow()
+        tables = ("price_points", "price_bars", "raw_market_responses")
+        row_bytes = {table: self._row_bytes(table) for table in tables}
+        report = {table: {"rolled_up": 0, "bars_written": 0, "deleted": 0} for table in tables}
+
+        cutoff = retention_cutoff(now, settings.RETENTION_TICK_DAYS)
+        if cutoff is not None:
+            rolled, written, deleted = self._compact(
+                ROLLUP_TICKS_SQL, "price_points", "TRUE", cutoff
+            )
+            report["price_points"].update(rolled_up=rolled, bars_written=written, deleted=deleted)
+
+        cutoff = retention_cutoff(now, settings.RETENTION_MINUTE_BAR_DAYS)
+        if cutoff is not None:
+            rolled, written, deleted = self._compact(
+                ROLLUP_MINUTE_BARS_SQL, "price_bars", "interval = '1m'", cutoff
+            )
+            report["price_bars"].update(rolled_up=rolled, bars_written=written, deleted=deleted)
+
+        cutoff = retention_cutoff(now, settings.RETENTION_DAILY_BAR_DAYS)
+        if cutoff is not None:
+            report["price_bars"]["deleted"] += self._delete(
+                "price_bars", "interval = '1d' AND timestamp < :hi", {"hi": cutoff}
+            )
+
+        cutoff = retention_cutoff(now, settings.RETENTION_RAW_RESPONSE_DAYS)
+        if cutoff is not None:
+            report["raw_market_responses"]["deleted"] = self._delete(
+                "raw_market_responses", "timestamp < :hi", {"hi": cutoff}
+            )
+
+        for table, counts in report.items():
+            # Deleted rows are freed for reuse by the next (auto)vacuum
+            counts["bytes_reclaimed"] = int(counts["deleted"] * row_bytes[table])
+        if vacuum:
+            self._vacuum([table for table, counts in report.items() if counts["deleted"]])
+        return report
+
+    def _compact(self, rollup_sql: str, table: str, where: str, cutoff: datetime):
+        """
+        Roll up a table's rows older than cutoff into bars, one day at a time.
+
+        Returns:
+            Tuple of (source rows rolled up, bars written, source rows deleted)
+        """
+        rolled = written = 0
+        lo = self._oldest(table, where, datetime.min, cutoff)
+        while lo is not None:
+            lo = lo.replace(hour=0, minute=0, second=0, microsecond=0)
+            hi = min(lo + SLICE, cutoff)
+            count = 0
+            while True:
+                # One short transaction per chunk: its rows leave exactly when their bars absorb them
+                with self.engine.begin() as conn:
+                    moved, created = conn.execute(
+                        text(rollup_sql), {"lo": lo, "hi": hi, "batch": self.delete_batch}
+                    ).one()
+                count += moved
+                written += created
+                if moved < self.delete_batch:
+                    break
+            rolled += count
+            logger.info(f"Compacted {count} {table} rows from {lo:%Y-%m-%d}")
+            # Next populated day, found through the timestamp index
+            lo = self._oldest(table, where, hi, cutoff)
+        return rolled, written, rolled
+
+    def _oldest(self, table: str, where: str, lo: datetime, hi: datetime) -> Optional[datetime]:
+        """Earliest timestamp in [lo, hi) among rows matching where."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT min(timestamp) FROM {table} WHERE {where} AND timestamp >= :lo AND timestamp < :hi"),
+                {"lo": lo, "hi": hi},
+            ).scalar()
+
+    def _delete(self, table: str, where: str, params: Dict) -> int:
+        """Delete matching rows in bounded chunks, one transaction per chunk."""
+        stmt = text(
+            f"DELETE FROM {table} WHERE ctid = ANY(ARRAY("
+            f"SELECT ctid FROM {table} WHERE {where} LIMIT :batch))"
+        )
+        deleted = 0
+        while True:
+            with self.engine.begin() as conn:
+                count = conn.execute(stmt, {**params, "batch": self.delete_batch}).rowcount
+            deleted += count
+            if count < self.delete_batch:
+                return deleted
+
+    def _row_bytes(self, table: str) -> float:
+        """Average on-disk bytes per row, including indexes and TOAST."""
+        with self.engine.connect() as conn:
+            size, rows = conn.execute(
+                text(
+                    "SELECT pg_total_relation_size(CAST(:t AS regclass)), reltuples "
+                    "FROM pg_class WHERE oid = CAST(:t AS regclass)"
+                ),
+                {"t": table},
+            ).one()
+            if rows <= 0:
+                # Never analyzed: count once rather than report nothing
+                rows = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        return size / rows if rows else 0.0
+
+    def _vacuum(self, tables) -> None:
+        """VACUUM (ANALYZE) tables; VACUUM cannot run inside a transaction."""
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in tables:
+                conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+
+
+def log_report(report: Dict[str, Dict[str, int]], elapsed: float) -> None:
+    """Log the per-table outcome of a compaction run."""
+    for table, counts in report.items():
+        logger.info(
+            f"{table}: {counts['rolled_up']} rows rolled up into {counts['bars_written']} bars, "
+            f"{counts['deleted']} rows deleted, ~{counts['bytes_reclaimed'] / 1e6:.1f} MB reclaimed"
+        )
+    logger.info(f"Compaction finished in {elapsed:.1f}s")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Downsample and expire old market data")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE) compacted tables")
+    parser.add_argument(
+        "--interval", type=float, default=settings.COMPACTION_INTERVAL, help="Seconds between passes"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.COMPACTION_DELETE_BATCH, help="Rows deleted per transaction"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    compactor = Compactor(delete_batch=args.batch_size)
+
+    while True:
+        started = time.perf_counter()
+        try:
+            log_report(compactor.run(vacuum=args.vacuum), time.perf_counter() - started)
+        except Exception as e:
+            if args.once:
+                raise
+            logger.error(f"Compaction failed: {e}")
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
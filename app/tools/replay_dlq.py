@@ -0,0 +1,47 @@
+"""
+Replay dead-lettered price events onto the price events topic.
+
+Events land on KAFKA_TOPIC_DEAD_LETTER once every retry in
+EVENT_RETRY_DELAYS has failed, with the last error attached. Once the cause
+is fixed, this moves them back so the consumer processes them again. Run it
+against the same EVENT_BUS_BACKEND as the consumer (the memory backend is
+process-local and cannot be replayed from here).
+
+Usage:
+    python -m app.tools.replay_dlq
+    python -m app.tools.replay_dlq --limit 1000 --idle 10
+"""
+import argparse
+import asyncio
+import logging
+from app.services.kafka_service import KafkaService
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Replay dead-lettered price events")
+    parser.add_argument("--limit", type=int, default=None, help="Most events to replay (default all)")
+    parser.add_argument(
+        "--idle", type=float, default=5.0, help="Stop after this many seconds without an event"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    service = KafkaService()
+    try:
+        replayed = asyncio.run(service.replay_dead_letters(limit=args.limit, idle=args.idle))
+    finally:
+        service.close()
+    for reason, count in sorted(replayed.items(), key=lambda item: -item[1]):
+        logger.info(f"{count:>8} {reason}")
+    logger.info(f"Replayed {sum(replayed.values())} dead-lettered events")
+
+
+if __name__ == "__main__":
+    main()
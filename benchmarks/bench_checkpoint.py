@@ -0,0 +1,52 @@
+"""
+Benchmark consumer checkpoint size and warm-restart time.
+
+Fills a tick store for --symbols symbols, writes a checkpoint, then times
+loading it back into a fresh store, which is what a restarting consumer does
+instead of re-reading every symbol's window from price_points.
+
+Usage:
+    python -m benchmarks.bench_checkpoint --symbols 10000 --ticks 64
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app.services.consumer_checkpoint import load_checkpoint, save_checkpoint
+from app.services.tick_store import TickStore
+
+T0 = datetime(2024, 1, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consumer checkpoint benchmark")
+    parser.add_argument("--symbols", type=int, default=10_000)
+    parser.add_argument("--ticks", type=int, default=64)
+    args = parser.parse_args()
+
+    store = TickStore(capacity=args.ticks)
+    ticks = [(T0 + timedelta(seconds=i), 100.0 + i % 97) for i in range(args.ticks)]
+    for s in range(args.symbols):
+        store.load(f"SYM{s:05d}", ticks, complete_from=T0)
+    positions = {p: 1_000_000 + p for p in range(8)}
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-checkpoint-"), "consumer.ckpt")
+    start = time.perf_counter()
+    size = save_checkpoint(path, store, positions, args.ticks)
+    save_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    checkpoint = load_checkpoint(path, capacity=args.ticks)
+    restored = TickStore(capacity=args.ticks)
+    restored.restore(checkpoint.series)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    assert restored.last("SYM00000", 5) == store.last("SYM00000", 5)
+    print(f"symbols={args.symbols} ticks/symbol={args.ticks} size={size / 1024 / 1024:.1f} MB")
+    print(f"save: {save_ms:.0f} ms, load + restore: {load_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
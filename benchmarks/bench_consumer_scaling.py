@@ -0,0 +1,92 @@
+"""
+Offline benchmark for symbol-partitioned consumer parallelism.
+
+Generates synthetic price events, shards them by symbol onto N worker
+processes (the same split the consumer group gets from symbol-keyed
+partitions) and measures decode + moving average throughput. No Kafka
+or database is needed.
+
+Usage:
+    python -m benchmarks.bench_consumer_scaling --events 400000 --symbols 500
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import List
+
+from app.services.transports.base import symbol_shard
+from app.services.market_service import MarketService
+
+
+def make_events(count: int, symbols: int, seed: int = 42) -> List[bytes]:
+    """Build JSON-encoded price events in the producer's wire format."""
+    rng = random.Random(seed)
+    tickers = [f"SYM{i:04d}" for i in range(symbols)]
+    start = datetime(2024, 1, 1)
+    events = []
+    for i in range(count):
+        symbol = rng.choice(tickers)
+        message = {
+            "symbol": symbol,
+            "price": round(100 + rng.gauss(0, 5), 4),
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "source": "benchmark",
+            "raw_response_id": f"{i:032x}",
+        }
+        events.append(json.dumps(message).encode("utf-8"))
+    return events
+
+
+def process_shard(events: List[bytes]) -> int:
+    """Decode events and keep a 5-point moving average per symbol."""
+    service = MarketService(None, None)
+    windows = defaultdict(lambda: deque(maxlen=5))
+    for raw in events:
+        message = json.loads(raw.decode("utf-8"))
+        window = windows[message["symbol"]]
+        window.append(message["price"])
+        service.calculate_moving_average(list(window), period=5)
+    return len(events)
+
+
+def run(events: List[bytes], workers: int) -> float:
+    """Process all events on `workers` processes and return events/second."""
+    shards = [[] for _ in range(workers)]
+    for raw in events:
+        # Shard on the symbol exactly like the partitioner would
+        symbol = json.loads(raw)["symbol"]
+        shards[symbol_shard(symbol, workers)].append(raw)
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers) as pool:
+        start = time.perf_counter()
+        processed = sum(pool.map(process_shard, shards))
+        elapsed = time.perf_counter() - start
+    return processed / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=400_000)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.symbols)
+    worker_counts = sorted({1, 2, 4, 8, args.max_workers} & set(range(1, args.max_workers + 1)))
+
+    baseline = None
+    print(f"{'workers':>8} {'events/s':>12} {'speedup':>8}")
+    for workers in worker_counts:
+        rate = run(events, workers)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark per-event overhead of the event bus backends.
+
+Publishes N price events through KafkaService with each transport, then
+consumes them back, and reports microseconds per event for both halves.
+The Kafka backend is only included with --kafka (it needs a broker).
+
+Usage:
+    python -m benchmarks.bench_event_bus --events 100000 [--kafka]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.services.kafka_service import KafkaService
+from app.services.transports import get_transport
+from app.services.transports.log_transport import LogTransport
+from app.services.transports.memory_transport import MemoryBus, MemoryTransport
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(100)]
+
+
+async def run(make_transport, events: int):
+    """Time publishing then consuming events; return (publish_us, consume_us)."""
+    producer = KafkaService(make_transport())
+    start = time.perf_counter()
+    for i in range(events):
+        await producer.produce_price_event(
+            {"symbol": SYMBOLS[i % len(SYMBOLS)], "price": 100.0 + i % 7, "timestamp": "2024-03-20T15:30:00"}
+        )
+    publish_s = time.perf_counter() - start
+
+    consumer = KafkaService(make_transport())
+    received = 0
+    done = asyncio.Event()
+
+    async def callback(message):
+        nonlocal received
+        received += 1
+        if received == events:
+            done.set()
+            await asyncio.sleep(3600)
+
+    start = time.perf_counter()
+    task = asyncio.create_task(consumer.consume_price_events(callback))
+    await done.wait()
+    consume_s = time.perf_counter() - start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    producer.close()
+    return publish_s / events * 1e6, consume_s / events * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event bus backend overhead benchmark")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--kafka", action="store_true", help="Also benchmark the Kafka backend")
+    args = parser.parse_args()
+
+    bus = MemoryBus()
+    log_dir = tempfile.mkdtemp(prefix="bench-event-log-")
+    backends = [
+        ("memory", lambda: MemoryTransport(bus)),
+        ("log", lambda: LogTransport(log_dir=log_dir)),
+    ]
+    if args.kafka:
+        backends.append(("kafka", lambda: get_transport("kafka")))
+
+    print(f"{'backend':>8} {'publish us/event':>17} {'consume us/event':>17}")
+    for name, make_transport in backends:
+        publish_us, consume_us = asyncio.run(run(make_transport, args.events))
+        print(f"{name:>8} {publish_us:>17.1f} {consume_us:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark columnar price export against the ORM row-by-row path.
+
+Seeds DATABASE_URL with synthetic price_points (once), then times building
+an Arrow table from ORM objects versus streaming Parquet via ExportService.
+Each path runs in its own process so peak RSS is measured independently.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_export --rows 10000000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from datetime import datetime, timedelta
+
+from app.models.database import SessionLocal, engine
+from app.models.market_data import PricePoint, Provider, Symbol
+from app.services.export_service import ExportService
+from app.tools.backfill import BatchWriter, record_to_row
+
+SYMBOL_PREFIX = "BX"
+
+
+def seed(rows: int, symbols: int) -> None:
+    """Load synthetic ticks unless the benchmark symbols already hold enough rows."""
+    session = SessionLocal()
+    try:
+        existing = (
+            session.query(PricePoint)
+            .join(Symbol, Symbol.id == PricePoint.symbol_id)
+            .filter(Symbol.ticker.like(f"{SYMBOL_PREFIX}%"))
+            .count()
+        )
+    finally:
+        session.close()
+    if existing >= rows:
+        return
+
+    writer = BatchWriter(engine)
+    per_symbol = rows // symbols
+    start = datetime(2020, 1, 1)
+    for s in range(symbols):
+        symbol = f"{SYMBOL_PREFIX}{s:03d}"
+        for offset in range(0, per_symbol, 100_000):
+            batch = [
+                record_to_row(
+                    {"symbol": symbol, "timestamp": start + timedelta(seconds=i), "price": 100.0 + i % 97},
+                    "benchmark", "1d", False,
+                )
+                for i in range(offset, min(offset + 100_000, per_symbol))
+            ]
+            writer.write(batch)
+
+
+def orm_path(symbols) -> int:
+    """Load ORM objects and convert them to Arrow row by row."""
+    import pyarrow as pa
+
+    session = SessionLocal()
+    try:
+        points = (
+            session.query(PricePoint, Symbol.ticker, Provider.name)
+            .join(Symbol, Symbol.id == PricePoint.symbol_id)
+            .join(Provider, Provider.id == PricePoint.provider_id)
+            .filter(Symbol.ticker.in_(symbols))
+            .all()
+        )
+        table = pa.Table.from_pylist(
+            [
+                {"symbol": ticker, "timestamp": p.timestamp, "price": p.price, "provider": provider}
+                for p, ticker, provider in points
+            ]
+        )
+        return table.num_rows
+    finally:
+        session.close()
+
+
+def columnar_path(symbols) -> int:
+    """Stream Parquet bytes through ExportService."""
+    return sum(len(chunk) for chunk in ExportService(engine).stream(symbols, format="parquet"))
+
+
+def measure(target, symbols, results) -> None:
+    start = time.perf_counter()
+    output = target(symbols)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((elapsed, peak_mb, output))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar vs ORM export benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--symbols", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows, args.symbols)
+    symbols = [f"{SYMBOL_PREFIX}{s:03d}" for s in range(args.symbols)]
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'path':>10} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}")
+    for name, target in [("orm", orm_path), ("columnar", columnar_path)]:
+        results = ctx.Queue()
+        process = ctx.Process(target=measure, args=(target, symbols, results))
+        process.start()
+        elapsed, peak_mb, _ = results.get()
+        process.join()
+        print(f"{name:>10} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {peak_mb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
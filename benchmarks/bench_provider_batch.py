@@ -0,0 +1,158 @@
+"""
+Benchmark multi-symbol latest-price fetches: per-symbol loop vs bounded fan-out vs batch.
+
+Replays the provider responses in benchmarks/fixtures with --latency
+seconds of simulated round trip per HTTP request, so no network or API key
+is needed. For each provider it times fetching --symbols symbols three ways:
+one get_latest_price after another (how polling shards used to run),
+BaseProvider's default fan-out (PROVIDER_BATCH_CONCURRENCY requests in
+flight), and the provider's own get_latest_prices (one yf.download, Alpha
+Vantage REALTIME_BULK_QUOTES, one synthetic call).
+
+Usage:
+    python -m benchmarks.bench_provider_batch --symbols 100 --latency 0.05
+    python -m benchmarks.bench_provider_batch --providers alpha_vantage --concurrency 16
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+from app.core.config import settings
+from app.services.providers import get_provider
+from app.services.providers.base import BaseProvider
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class Replay:
+    """Serves fixture responses after a simulated round trip, counting requests."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    def wait(self) -> None:
+        self.requests += 1
+        time.sleep(self.latency)
+
+    async def wait_async(self) -> None:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+
+def install_yfinance(replay: Replay) -> None:
+    """Route yf.Ticker(...).history and yf.download to the recorded minute bars."""
+    import pandas as pd
+    from app.services.providers import yfinance_provider
+
+    bars = pd.read_csv(FIXTURES / "yfinance_1m.csv", index_col="Datetime")
+    bars.index = pd.to_datetime(bars.index, utc=True).tz_convert("America/New_York")
+
+    class ReplayTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, **kwargs):
+            replay.wait()
+            return bars.copy()
+
+    def download(tickers, threads=True, **kwargs):
+        # yfinance fetches each ticker on its own thread, then joins the frames
+        if threads is True:
+            threads = (os.cpu_count() or 1) * 2
+        workers = min(len(tickers), max(int(threads), 1))
+        with ThreadPoolExecutor(workers) as pool:
+            frames = list(pool.map(lambda ticker: (replay.wait(), bars.copy())[1], tickers))
+        if len(tickers) == 1:
+            return frames[0]
+        return pd.concat(dict(zip(tickers, frames)), axis=1)
+
+    yfinance_provider.yf = SimpleNamespace(Ticker=ReplayTicker, download=download)
+
+
+def install_alpha_vantage(replay: Replay) -> None:
+    """Answer GLOBAL_QUOTE and REALTIME_BULK_QUOTES requests from the fixtures."""
+    from app.services.providers import alpha_vantage_provider
+
+    global_quote = json.loads((FIXTURES / "alpha_vantage_global_quote.json").read_text())
+    bulk_quote = json.loads((FIXTURES / "alpha_vantage_bulk_quote.json").read_text())
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await replay.wait_async()
+        params = request.url.params
+        symbols = params["symbol"].split(",")
+        if params["function"] == "REALTIME_BULK_QUOTES":
+            data = [{**bulk_quote, "symbol": symbol} for symbol in symbols]
+            return httpx.Response(200, json={"endpoint": "Realtime Bulk Quotes", "message": "", "data": data})
+        quote = {**global_quote["Global Quote"], "01. symbol": symbols[0]}
+        return httpx.Response(200, json={"Global Quote": quote})
+
+    class ReplayClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+    alpha_vantage_provider.httpx = SimpleNamespace(AsyncClient=ReplayClient, HTTPError=httpx.HTTPError)
+    settings.ALPHA_VANTAGE_API_KEY = settings.ALPHA_VANTAGE_API_KEY or "benchmark"
+    settings.ALPHA_VANTAGE_BULK_QUOTES = True
+
+
+async def loop_fetch(provider, symbols):
+    return {symbol: await provider.get_latest_price(symbol) for symbol in symbols}
+
+
+async def fan_out_fetch(provider, symbols):
+    return await BaseProvider.get_latest_prices(provider, symbols)
+
+
+async def batch_fetch(provider, symbols):
+    return await provider.get_latest_prices(symbols)
+
+
+def bench(name: str, provider, replay, symbols) -> None:
+    for label, fetch in [("loop", loop_fetch), ("fan-out", fan_out_fetch), ("batch", batch_fetch)]:
+        if replay is not None:
+            replay.requests = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # yfinance logs every fetch with print()
+            results = asyncio.run(fetch(provider, symbols))
+        elapsed = time.perf_counter() - start
+        failed = sum(isinstance(result, Exception) for result in results.values())
+        requests = replay.requests if replay is not None else "-"
+        print(f"{name:14} {label:8} {elapsed * 1000:9.1f} ms  {requests:>5} requests  {failed} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-symbol provider fetch benchmark")
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per HTTP request")
+    parser.add_argument("--concurrency", type=int, default=settings.PROVIDER_BATCH_CONCURRENCY)
+    parser.add_argument("--providers", default="yfinance,alpha_vantage,synthetic")
+    args = parser.parse_args()
+
+    settings.PROVIDER_BATCH_CONCURRENCY = args.concurrency
+    symbols = [f"BP{s:04d}" for s in range(args.symbols)]
+    for name in args.providers.split(","):
+        replay = Replay(args.latency)
+        if name == "yfinance":
+            install_yfinance(replay)
+        elif name == "alpha_vantage":
+            install_alpha_vantage(replay)
+        else:
+            replay = None  # The synthetic provider injects its own latency, once per call
+        provider = get_provider(name)
+        if replay is None:
+            provider.latency = args.latency
+        bench(name, provider, replay, symbols)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark latest-quote read latency: shared-memory table vs Redis vs database.
+
+Stores one quote for each of --symbols symbols in a fresh QuoteTable, in
+Redis (JSON per key, if REDIS_URL answers) and in price_points (if
+DATABASE_URL answers), then times random single-symbol reads from each. A
+forked process reads the table concurrently with writes from this one to
+measure reads under contention.
+
+Usage:
+    python -m benchmarks.bench_quote_table --symbols 5000 --reads 100000
+    DATABASE_URL=postgresql://... REDIS_URL=redis://... python -m benchmarks.bench_quote_table
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+import uuid
+from datetime import datetime
+
+from app.core.config import settings
+from app.services.quote_table import QuoteTable
+
+T0 = datetime(2024, 1, 2, 15, 0)
+SYMBOL_PREFIX = "QB"
+
+
+def symbols(count: int):
+    return [f"{SYMBOL_PREFIX}{s:05d}" for s in range(count)]
+
+
+def time_reads(read, names, reads: int) -> float:
+    """Mean microseconds per read over random symbols."""
+    sample = [random.choice(names) for _ in range(reads)]
+    start = time.perf_counter()
+    for name in sample:
+        read(name)
+    return (time.perf_counter() - start) / reads * 1e6
+
+
+def contended_reader(table_name: str, names, reads: int, result) -> None:
+    table = QuoteTable(table_name)
+    result.value = time_reads(table.get, names, reads)
+    table.close()
+
+
+def bench_table(names, reads: int):
+    table = QuoteTable(f"bench_quotes_{uuid.uuid4().hex[:8]}", capacity=len(names) * 2)
+    try:
+        start = time.perf_counter()
+        for i, name in enumerate(names):
+            table.put(name, "benchmark", 100.0 + i, T0)
+        put_us = (time.perf_counter() - start) / len(names) * 1e6
+        read_us = time_reads(table.get, names, reads)
+
+        # Reads in another process while this one keeps writing
+        result = multiprocessing.get_context("fork").Value("d", 0.0)
+        reader = multiprocessing.get_context("fork").Process(
+            target=contended_reader, args=(table.name, names, reads, result)
+        )
+        reader.start()
+        writes = 0
+        while reader.is_alive():
+            table.put(random.choice(names), "benchmark", 101.0, T0)
+            writes += 1
+        reader.join()
+        return put_us, read_us, result.value, writes
+    finally:
+        table.unlink()
+        table.close()
+
+
+def bench_redis(names, reads: int):
+    import redis
+
+    client = redis.from_url(settings.REDIS_URL, socket_timeout=1)
+    try:
+        client.ping()
+    except redis.RedisError as e:
+        print(f"redis: skipped ({e})")
+        return None
+    client.mset({
+        f"quote:{name}": json.dumps({"price": 100.0, "timestamp": T0.isoformat(), "provider": "benchmark"})
+        for name in names
+    })
+    return time_reads(lambda name: json.loads(client.get(f"quote:{name}")), names, reads)
+
+
+def bench_database(names, reads: int):
+    from sqlalchemy import desc
+    from sqlalchemy.exc import OperationalError
+    from app.models.database import SessionLocal, engine
+    from app.models.market_data import PricePoint
+    from app.services.symbol_registry import get_symbol_registry
+    from app.tools.backfill import BatchWriter, record_to_row
+
+    try:
+        BatchWriter(engine).write(
+            [record_to_row({"symbol": name, "timestamp": T0, "price": 100.0}, "benchmark", "1d", False) for name in names]
+        )
+    except OperationalError as e:
+        print(f"database: skipped ({e.orig})")
+        return None
+
+    session = SessionLocal()
+    registry = get_symbol_registry()
+
+    def read(name):
+        return (
+            session.query(PricePoint.price, PricePoint.timestamp)
+            .filter(PricePoint.symbol_id == registry.symbol_id(session, name, create=False))
+            .order_by(desc(PricePoint.timestamp))
+            .first()
+        )
+
+    try:
+        return time_reads(read, names, reads)
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latest-quote read latency benchmark")
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--reads", type=int, default=100_000)
+    parser.add_argument("--db-reads", type=int, default=5000, help="Reads timed against Redis and the database")
+    args = parser.parse_args()
+
+    names = symbols(args.symbols)
+    put_us, read_us, contended_us, writes = bench_table(names, args.reads)
+    print(f"shared table: put {put_us:.2f} us, get {read_us:.2f} us, "
+          f"get from another process during {writes} writes {contended_us:.2f} us")
+
+    redis_us = bench_redis(names, args.db_reads)
+    if redis_us is not None:
+        print(f"redis: get {redis_us:.1f} us")
+    db_us = bench_database(names, args.db_reads)
+    if db_us is not None:
+        print(f"database: latest row {db_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark price_points with string symbol/provider columns against dictionary IDs.
+
+Creates two scratch copies of the price_points layout in DATABASE_URL: the
+old one keyed on symbol VARCHAR(10) / provider VARCHAR(50) and the current
+one keyed on symbol_id INTEGER / provider_id SMALLINT. Both get the same
+secondary index and unique constraint, then the same synthetic ticks are
+inserted in batches (ON CONFLICT DO NOTHING, like the live path) and the
+insert rate and index sizes are compared.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_symbol_dictionary --rows 2000000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.models.database import engine
+
+PROVIDERS = ["yfinance", "alpha_vantage"]
+
+LAYOUTS = {
+    "strings": {
+        "columns": "symbol VARCHAR(10) NOT NULL, provider VARCHAR(50) NOT NULL",
+        "keys": ("symbol", "provider"),
+    },
+    "dictionary": {
+        "columns": "symbol_id INTEGER NOT NULL, provider_id SMALLINT NOT NULL",
+        "keys": ("symbol_id", "provider_id"),
+    },
+}
+
+
+def create_table(conn, name: str, layout: dict) -> None:
+    symbol, provider = layout["keys"]
+    conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {name} (id UUID PRIMARY KEY, {layout['columns']}, "
+            f"price DOUBLE PRECISION NOT NULL, timestamp TIMESTAMP NOT NULL, raw_response_id UUID, "
+            f"UNIQUE ({symbol}, {provider}, timestamp))"
+        )
+    )
+    conn.execute(text(f"CREATE INDEX {name}_symbol_ts ON {name} ({symbol}, timestamp)"))
+
+
+def batches(rows: int, symbols: int, batch_size: int, interned: bool):
+    """Yield the same synthetic ticks in either layout."""
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        s, p = i % symbols, (i // symbols) % len(PROVIDERS)
+        batch.append(
+            {
+                "id": uuid.UUID(int=i + 1),
+                "symbol": s + 1 if interned else f"SYM{s:05d}",
+                "provider": p + 1 if interned else PROVIDERS[p],
+                "price": 100.0 + i % 97,
+                "timestamp": start + timedelta(seconds=i // (symbols * len(PROVIDERS))),
+            }
+        )
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def index_sizes(conn, name: str) -> dict:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_relation_size(c.oid) FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = CAST(:table AS regclass)"
+        ),
+        {"table": name},
+    )
+    return dict(rows.all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="String vs dictionary-ID price_points benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--symbols", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"{'layout':>11} {'rows/s':>10} {'table MB':>9} {'index MB':>9}  per index")
+    for layout_name, layout in LAYOUTS.items():
+        table = f"bench_price_points_{layout_name}"
+        symbol, provider = layout["keys"]
+        with engine.begin() as conn:
+            create_table(conn, table, layout)
+
+        insert = text(
+            f"INSERT INTO {table} (id, {symbol}, {provider}, price, timestamp) "
+            f"VALUES (:id, :symbol, :provider, :price, :timestamp) ON CONFLICT DO NOTHING"
+        )
+        started = time.perf_counter()
+        for batch in batches(args.rows, args.symbols, args.batch_size, layout_name == "dictionary"):
+            with engine.begin() as conn:
+                conn.execute(insert, batch)
+        rate = args.rows / (time.perf_counter() - started)
+
+        with engine.begin() as conn:
+            sizes = index_sizes(conn, table)
+            table_bytes = conn.execute(text(f"SELECT pg_relation_size('{table}')")).scalar()
+            conn.execute(text(f"DROP TABLE {table}"))
+
+        detail = ", ".join(f"{k.replace(table, '')}={v / 1024 / 1024:.1f}" for k, v in sorted(sizes.items()))
+        print(
+            f"{layout_name:>11} {rate:>10.0f} {table_bytes / 1024 / 1024:>9.1f} "
+            f"{sum(sizes.values()) / 1024 / 1024:>9.1f}  {detail}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark synthetic tick generation.
+
+Generates --hours of ticks for each of --symbols symbols with the synthetic
+GBM provider and reports the batch generation rate, then times single
+latest-tick lookups as served to /prices/latest.
+
+Usage:
+    python -m benchmarks.bench_synthetic --symbols 100 --hours 24 --tick-rate 1
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.services.providers.synthetic_provider import SyntheticProvider
+
+T0 = datetime(2024, 1, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic provider benchmark")
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--tick-rate", type=float, default=1.0)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    provider = SyntheticProvider(tick_rate=args.tick_rate)
+    end = T0 + timedelta(hours=args.hours)
+    start = time.perf_counter()
+    total = sum(len(provider.ticks(f"SYN{s:04d}", T0, end)[1]) for s in range(args.symbols))
+    elapsed = time.perf_counter() - start
+    print(f"batch: {total:,} ticks in {elapsed:.2f}s ({total / elapsed / 1e6:.1f}M ticks/s)")
+
+    span = (end - T0).total_seconds()
+    queries = [
+        (f"SYN{random.randrange(args.symbols):04d}", T0 + timedelta(seconds=random.random() * span))
+        for _ in range(args.lookups)
+    ]
+    start = time.perf_counter()
+    for symbol, when in queries:
+        provider.price_at(symbol, when)
+    print(f"price_at: {(time.perf_counter() - start) / args.lookups * 1e6:.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
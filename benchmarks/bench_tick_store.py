@@ -0,0 +1,97 @@
+"""
+Benchmark tick store memory footprint and query latency.
+
+Fills a TickStore with --ticks ticks for each of --symbols symbols and
+compares its traced memory to the same ticks held as per-symbol lists of
+(datetime, price) tuples (measured on a sample of symbols and scaled up, since
+the tuple layout does not fit in memory at 10k symbols), then times add,
+last-N and range queries.
+
+Usage:
+    python -m benchmarks.bench_tick_store --symbols 10000 --ticks 2048
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from array import array
+from datetime import datetime, timedelta
+
+from app.services.tick_store import TickStore, to_micros
+
+T0 = datetime(2024, 1, 1)
+
+
+def fill_store(symbols: int, ticks: int) -> TickStore:
+    """Fill the store's arrays in bulk; add() cost is timed separately."""
+    store = TickStore(capacity=ticks)
+    base = to_micros(T0)
+    timestamps = array("q", range(base, base + ticks * 1_000_000, 1_000_000))
+    prices = array("d", (100.0 + i % 97 for i in range(ticks)))
+    for s in range(symbols):
+        symbol = f"SYM{s:05d}"
+        store.load(symbol, [], complete_from=None)
+        store.series[symbol].timestamps.extend(timestamps)
+        store.series[symbol].prices.extend(prices)
+    return store
+
+
+def fill_lists(symbols: int, ticks: int) -> dict:
+    return {
+        f"SYM{s:05d}": [(T0 + timedelta(seconds=i), 100.0 + i % 97) for i in range(ticks)]
+        for s in range(symbols)
+    }
+
+
+def traced_mb(build, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick store memory and latency benchmark")
+    parser.add_argument("--symbols", type=int, default=10_000)
+    parser.add_argument("--ticks", type=int, default=2048)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--sample-symbols", type=int, default=100)
+    args = parser.parse_args()
+
+    store, store_mb = traced_mb(fill_store, args.symbols, args.ticks)
+    sample = min(args.sample_symbols, args.symbols)
+    lists, lists_mb = traced_mb(fill_lists, sample, args.ticks)
+    lists_mb *= args.symbols / sample
+    del lists
+
+    total_ticks = args.symbols * args.ticks
+    print(f"{'layout':>14} {'MB':>9} {'bytes/tick':>11}")
+    for name, mb in [("tuple lists", lists_mb), ("tick store", store_mb)]:
+        print(f"{name:>14} {mb:>9.1f} {mb * 1024 * 1024 / total_ticks:>11.1f}")
+
+    probe = TickStore(capacity=args.ticks)
+    start = time.perf_counter()
+    for i in range(args.queries):
+        probe.add("SYM", T0 + timedelta(seconds=i), 100.0)
+    add_us = (time.perf_counter() - start) / args.queries * 1e6
+
+    symbols = [f"SYM{random.randrange(args.symbols):05d}" for _ in range(args.queries)]
+    start = time.perf_counter()
+    for symbol in symbols:
+        store.last(symbol, 5)
+    last_us = (time.perf_counter() - start) / args.queries * 1e6
+
+    window = timedelta(seconds=60)
+    start = time.perf_counter()
+    for symbol in symbols:
+        offset = T0 + timedelta(seconds=random.randrange(args.ticks))
+        store.range(symbol, offset, offset + window)
+    range_us = (time.perf_counter() - start) / args.queries * 1e6
+    print(f"add: {add_us:.2f} us/tick, last(5): {last_us:.2f} us/query, 60s range: {range_us:.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
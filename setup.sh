@@ -19,6 +19,9 @@ docker-compose up -d postgres kafka zookeeper redis
 echo "Waiting for services to start..."
 sleep 15
 
+# Apply database migrations
+alembic upgrade head
+
 echo "Setup complete!"
 echo "Starting Market Data Service..."
 echo ""
@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.models.database import get_db, Base
+from app.models.database import get_db, get_read_db, Base
 from app.services.kafka_service import KafkaService
 from unittest.mock import Mock
 
@@ -38,6 +38,7 @@ def mock_kafka_service():
     return mock_service
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 @pytest.fixture
 def client():
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from datetime import datetime
+import httpx
+import pytest
+from app.api.dependencies import get_kafka_service
+from app.core.config import settings
+from app.main import app
+from app.services import admission
+from app.services import providers as providers_module
+from app.services.providers.base import BaseProvider
+from app.services.tick_store import get_tick_store
+from unittest.mock import AsyncMock
+
+
+class SlowProvider(BaseProvider):
+    """Local provider that answers after a fixed delay."""
+
+    delay = 0.3
+
+    def get_provider_name(self):
+        return "slow"
+
+    async def get_latest_price(self, symbol):
+        await asyncio.sleep(self.delay)
+        return self.format_response(symbol=symbol, price=123.0, raw_data={}, timestamp=datetime.utcnow())
+
+
+class BlockingProvider(SlowProvider):
+    """Local provider whose client blocks on an executor thread, like yfinance."""
+
+    async def get_latest_price(self, symbol):
+        await asyncio.get_running_loop().run_in_executor(None, time.sleep, self.delay)
+        return self.format_response(symbol=symbol, price=123.0, raw_data={}, timestamp=datetime.utcnow())
+
+
+@pytest.fixture
+def slow_provider(monkeypatch):
+    monkeypatch.setitem(providers_module.PROVIDERS, "slow", SlowProvider)
+    monkeypatch.setattr(admission, "_limiters", {})
+    app.dependency_overrides[get_kafka_service] = lambda: AsyncMock()
+    yield
+    providers_module._provider_classes.pop("slow", None)
+    app.dependency_overrides.pop(get_kafka_service, None)
+
+
+async def _fire(count, symbol="SLOW"):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(
+            *(client.get(f"/prices/latest?symbol={symbol}&provider=slow") for _ in range(count))
+        )
+
+
+def test_requests_over_route_limit_fail_fast(slow_provider, monkeypatch):
+    """Test excess concurrent requests get 503 + Retry-After instead of queueing"""
+    monkeypatch.setattr(settings, "ADMISSION_ROUTE_LIMIT", 2)
+
+    responses = asyncio.run(_fire(5))
+
+    codes = sorted(r.status_code for r in responses)
+    assert codes == [200, 200, 503, 503, 503]
+    shed = [r for r in responses if r.status_code == 503]
+    assert all(r.headers["Retry-After"] == str(settings.ADMISSION_RETRY_AFTER) for r in shed)
+
+
+def test_provider_limit_applies_across_requests(slow_provider, monkeypatch):
+    """Test the per-provider limit sheds load even when the route has capacity"""
+    monkeypatch.setattr(settings, "ADMISSION_PROVIDER_LIMITS", "slow=1")
+
+    responses = asyncio.run(_fire(3))
+
+    assert sorted(r.status_code for r in responses) == [200, 503, 503]
+
+
+def test_deadline_bounds_slow_provider(slow_provider, monkeypatch):
+    """Test a provider slower than the request deadline yields 504 promptly"""
+    monkeypatch.setattr(settings, "ADMISSION_REQUEST_TIMEOUT", 0.05)
+
+    (response,) = asyncio.run(_fire(1))
+
+    assert response.status_code == 504
+    assert "Retry-After" in response.headers
+
+
+def test_stale_mode_serves_cached_quote(slow_provider, monkeypatch):
+    """Test shed requests get the last cached quote in stale mode"""
+    monkeypatch.setattr(settings, "ADMISSION_ROUTE_LIMIT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_OVERLOAD_MODE", "stale")
+    get_tick_store().add("STALEQ", datetime.utcnow(), 99.5)
+
+    responses = asyncio.run(_fire(2, symbol="STALEQ"))
+
+    stale = [r for r in responses if "Warning" in r.headers]
+    assert len(stale) == 1
+    assert stale[0].status_code == 200
+    assert stale[0].json()["price"] == 99.5
+
+
+def test_timed_out_provider_call_keeps_its_slot(slow_provider, monkeypatch):
+    """Test a call abandoned at the deadline counts against the provider limit until it returns"""
+    monkeypatch.setitem(providers_module.PROVIDERS, "slow", BlockingProvider)
+    monkeypatch.setattr(settings, "ADMISSION_PROVIDER_LIMITS", "slow=1")
+    monkeypatch.setattr(settings, "ADMISSION_REQUEST_TIMEOUT", 0.05)
+
+    async def scenario():
+        (timed_out,) = await _fire(1)
+        (shed,) = await _fire(1)  # The executor thread is still fetching
+        await asyncio.sleep(BlockingProvider.delay)
+        return timed_out, shed, admission.get_provider_limiter("slow").in_flight
+
+    timed_out, shed, in_flight = asyncio.run(scenario())
+    assert (timed_out.status_code, shed.status_code, in_flight) == (504, 503, 0)
@@ -21,3 +21,25 @@ def test_poll_endpoint_exists(client):
     })
     # Should not return 404 (route not found)
     assert response.status_code != 404
+
+def test_moving_average_endpoint(client, db):
+    """Test moving average is served from the latest-value table"""
+    from app.services.market_service import MarketService
+
+    MarketService(db, None).record_moving_average("TESTMA", period=5, value=101.5)
+    MarketService(db, None).record_moving_average("TESTMA", period=5, value=102.5)
+
+    response = client.get("/prices/moving-average?symbol=testma&period=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["symbol"] == "TESTMA"
+    assert data["average_value"] == 102.5
+
+    response = client.get("/prices/moving-average/batch?symbols=TESTMA,NOSUCH&period=5")
+    assert response.status_code == 200
+    assert [m["symbol"] for m in response.json()] == ["TESTMA"]
+
+def test_moving_average_not_found(client):
+    """Test missing moving average returns 404"""
+    response = client.get("/prices/moving-average?symbol=NOSUCH&period=7")
+    assert response.status_code == 404
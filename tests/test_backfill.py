@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timedelta
+from app.models.market_data import PricePoint, Symbol
+from app.tools.backfill import BatchWriter, Checkpoint, chunk_ranges, import_file
+
+
+def test_chunk_ranges_cover_range_within_provider_limits():
+    """Test intraday ranges are split into provider-sized chunks"""
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 20)
+    chunks = list(chunk_ranges(start, end, "1m"))
+
+    assert chunks[0][0] == start
+    assert chunks[-1][1] == end
+    assert all(b - a <= timedelta(days=7) for a, b in chunks)
+    assert all(chunks[i][1] == chunks[i + 1][0] for i in range(len(chunks) - 1))
+
+
+def test_csv_import_is_resumable_and_idempotent(db, tmp_path):
+    """Test a CSV import loads rows once and resumes from its checkpoint"""
+    path = tmp_path / "history.csv"
+    symbol = f"BK{uuid.uuid4().hex[:5].upper()}"
+    lines = ["symbol,timestamp,close"]
+    lines += [f"{symbol},2020-01-{day:02d}T00:00:00,{100 + day}" for day in range(1, 21)]
+    path.write_text("\n".join(lines) + "\n")
+
+    writer = BatchWriter(db.get_bind())
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    inserted = import_file(str(path), "csv", "1d", writer, checkpoint, False, batch_size=7)
+    assert inserted == 20
+    assert db.query(PricePoint).join(Symbol).filter(Symbol.ticker == symbol).count() == 20
+
+    # Second run resumes past every row; a fresh checkpoint still inserts nothing new
+    assert import_file(str(path), "csv", "1d", writer, checkpoint, False, batch_size=7) == 0
+    fresh = Checkpoint(None)
+    assert import_file(str(path), "csv", "1d", writer, fresh, False, batch_size=7) == 0
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from app.models.market_data import PriceBar, PricePoint, RawMarketResponse
+from app.services.symbol_registry import get_symbol_registry
+from app.tools.backfill import BatchWriter, record_to_row
+from app.tools.compactor import Compactor, retention_cutoff
+from tests.conftest import engine
+
+# Far enough in the past that only this module's rows cross the cutoffs
+NOW = datetime(2000, 1, 10, 12, 0)
+OLD = datetime(1999, 12, 30, 9, 30)
+
+
+@pytest.fixture(autouse=True)
+def clean_compactor_rows(db):
+    """Remove this module's bars and ticks, so a rerun against the same database starts empty"""
+    def clean():
+        registry = get_symbol_registry()
+        symbol_ids = [registry.symbol_id(db, symbol) for symbol in ("CMPA", "CMPC")]
+        db.query(PricePoint).filter(PricePoint.symbol_id.in_(symbol_ids)).delete(synchronize_session=False)
+        db.query(PriceBar).filter(PriceBar.symbol.like("CMP%")).delete(synchronize_session=False)
+        db.commit()
+
+    clean()
+    yield
+    clean()
+
+
+def _tick(symbol, ts, price):
+    return record_to_row({"symbol": symbol, "timestamp": ts, "price": price}, "test", "1d", False)
+
+
+def test_retention_cutoff_is_day_aligned():
+    """Test cutoffs start at midnight and a zero retention keeps data forever"""
+    assert retention_cutoff(NOW, 7) == datetime(2000, 1, 3)
+    assert retention_cutoff(NOW, 0) is None
+
+
+def test_compactor_refuses_other_databases():
+    """Test a non-Postgres engine fails before any work is done"""
+    with pytest.raises(ValueError, match="PostgreSQL"):
+        Compactor(create_engine("sqlite://"))
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="The compactor uses Postgres-only SQL")
+def test_compactor_rolls_up_ticks_and_minute_bars(db):
+    """Test old ticks become 1m bars, old 1m bars become 1d bars, and both are deleted"""
+    ticks = [
+        _tick("CMPA", OLD + timedelta(seconds=s), price)
+        for s, price in [(0, 10.0), (15, 12.0), (30, 9.0), (45, 11.0), (60, 20.0)]
+    ]
+    ticks.append(_tick("CMPA", OLD + timedelta(days=1), 30.0))
+    ticks.append(_tick("CMPA", datetime(2000, 1, 9), 40.0))  # Within retention
+    BatchWriter(db.get_bind()).write(ticks)
+
+    minute = datetime(1999, 6, 1, 14, 0)
+    db.add_all(
+        PriceBar(
+            symbol="CMPB", interval="1m", timestamp=minute + timedelta(minutes=m),
+            open=o, high=o + 2, low=o - 1, close=o + 1, volume=100.0, provider="test",
+        )
+        for m, o in enumerate([50.0, 51.0, 49.0])
+    )
+    registry = get_symbol_registry()
+    db.add(
+        RawMarketResponse(
+            symbol_id=registry.symbol_id(db, "CMPA"),
+            provider_id=registry.provider_id(db, "test"),
+            raw_response="{}",
+            timestamp=OLD,
+        )
+    )
+    db.commit()
+
+    report = Compactor(db.get_bind(), delete_batch=2, now=NOW).run()
+    db.expire_all()
+
+    assert report["price_points"]["rolled_up"] == 6
+    assert report["price_points"]["bars_written"] == 3
+    assert report["price_points"]["deleted"] == 6
+    assert report["price_bars"]["rolled_up"] == 3
+    assert report["price_bars"]["bars_written"] == 1
+    assert report["raw_market_responses"]["deleted"] == 1
+    assert report["price_points"]["bytes_reclaimed"] > 0
+
+    symbol_id = registry.symbol_id(db, "CMPA")
+    remaining = db.query(PricePoint).filter(PricePoint.symbol_id == symbol_id).all()
+    assert [(p.timestamp, p.price) for p in remaining] == [(datetime(2000, 1, 9), 40.0)]
+
+    bars = {
+        bar.timestamp: (bar.open, bar.high, bar.low, bar.close)
+        for bar in db.query(PriceBar).filter(PriceBar.symbol == "CMPA", PriceBar.interval == "1m")
+    }
+    assert bars == {
+        OLD: (10.0, 12.0, 9.0, 11.0),
+        OLD + timedelta(minutes=1): (20.0, 20.0, 20.0, 20.0),
+        OLD + timedelta(days=1): (30.0, 30.0, 30.0, 30.0),
+    }
+
+    daily = db.query(PriceBar).filter(PriceBar.symbol == "CMPB").all()
+    assert [(b.interval, b.timestamp, b.open, b.high, b.low, b.close, b.volume) for b in daily] == [
+        ("1d", datetime(1999, 6, 1), 50.0, 53.0, 48.0, 50.0, 300.0)
+    ]
+
+    # A second pass finds nothing left to compact
+    again = Compactor(db.get_bind(), delete_batch=2, now=NOW).run()
+    assert all(counts["deleted"] == 0 for counts in again.values())
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="The compactor uses Postgres-only SQL")
+def test_compactor_merges_into_existing_bars(db):
+    """Test ticks and minute bars landing on an existing bar are merged into it, not dropped"""
+    minute = datetime(1999, 12, 29, 14, 0)
+    db.add_all([
+        # Left by an earlier run; the ticks below arrived late for the same minute
+        PriceBar(
+            symbol="CMPC", interval="1m", timestamp=minute,
+            open=18.0, high=19.0, low=17.0, close=19.0, volume=None, provider="test",
+        ),
+        PriceBar(
+            symbol="CMPD", interval="1d", timestamp=datetime(1999, 6, 2),
+            open=60.0, high=61.0, low=59.0, close=60.5, volume=100.0, provider="test",
+        ),
+        PriceBar(
+            symbol="CMPD", interval="1m", timestamp=datetime(1999, 6, 2, 15, 0),
+            open=60.5, high=63.0, low=60.0, close=62.0, volume=50.0, provider="test",
+        ),
+    ])
+    db.commit()
+    BatchWriter(db.get_bind()).write(
+        [_tick("CMPC", minute + timedelta(seconds=s), price) for s, price in [(10, 20.0), (20, 16.5), (30, 18.5)]]
+    )
+
+    report = Compactor(db.get_bind(), delete_batch=2, now=NOW).run()
+    db.expire_all()
+
+    assert report["price_points"]["rolled_up"] == report["price_points"]["deleted"] == 3
+    assert report["price_points"]["bars_written"] == 0
+    assert (report["price_bars"]["rolled_up"], report["price_bars"]["bars_written"]) == (1, 0)
+
+    (bar,) = db.query(PriceBar).filter(PriceBar.symbol == "CMPC").all()
+    assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (18.0, 20.0, 16.5, 18.5, None)
+    (daily,) = db.query(PriceBar).filter(PriceBar.symbol == "CMPD").all()
+    assert (daily.interval, daily.open, daily.high, daily.low, daily.close, daily.volume) == (
+        "1d", 60.0, 63.0, 59.0, 62.0, 150.0
+    )
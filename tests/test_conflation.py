@@ -0,0 +1,83 @@
+import asyncio
+import json
+import pytest
+from app.core.config import settings
+from app.services import moving_average_consumer as consumer_module
+from app.services.conflation import ProducerConflator, conflate_batch
+from app.services.kafka_service import KafkaService
+from app.services.moving_average_consumer import MovingAverageConsumer
+from app.services.tick_store import TickStore
+from app.services.transports.memory_transport import MemoryBus, MemoryTransport
+
+
+def _event(symbol, second, price):
+    return {
+        "event_id": f"{symbol}-{second}",
+        "symbol": symbol,
+        "price": price,
+        "timestamp": f"2024-03-20T15:30:{second:02d}",
+    }
+
+
+def test_conflate_batch_keeps_newest_per_symbol():
+    """Test only the last event per symbol survives, in consumption order"""
+    batch = [_event("AAPL", 1, 1.0), _event("MSFT", 1, 2.0), _event("AAPL", 2, 3.0)]
+
+    latest, superseded = conflate_batch(batch)
+
+    assert [m["event_id"] for m in latest] == ["MSFT-1", "AAPL-2"]
+    assert [m["event_id"] for m in superseded] == ["AAPL-1"]
+
+
+def test_consumer_conflates_batch_but_keeps_window_ticks(monkeypatch):
+    """Test superseded ticks feed the window while only the newest gets an MA"""
+    store = TickStore(capacity=16)
+    monkeypatch.setattr(consumer_module, "get_tick_store", lambda: store)
+    monkeypatch.setattr(settings, "CONSUMER_CONFLATE", True)
+    consumer = MovingAverageConsumer()
+    computed = []
+
+    async def fake_process(message):
+        computed.append(message["event_id"])
+
+    consumer.process_price_event = fake_process
+    asyncio.run(consumer.process_price_batch([_event("AAPL", i, 100.0 + i) for i in range(5)]))
+
+    assert computed == ["AAPL-4"]
+    assert len(store.series["AAPL"]) == 4  # Superseded ticks reached the window
+    assert consumer.conflated == 4
+
+
+@pytest.mark.asyncio
+async def test_producer_conflation_publishes_latest_with_ticks(monkeypatch):
+    """Test the producer sends one event per symbol per flush, carrying replaced ticks"""
+    monkeypatch.setattr(settings, "PRODUCER_CONFLATE_INTERVAL", 0.05)
+    bus = MemoryBus(partitions=1)
+    producer = KafkaService(MemoryTransport(bus))
+    for i in range(3):
+        await producer.produce_price_event(_event("AAPL", i, 100.0 + i))
+    await producer.produce_price_event(_event("MSFT", 0, 300.0))
+
+    await asyncio.sleep(0.1)
+    consumer = MemoryTransport(bus)
+    consumer.subscribe("price-events")
+    published = [json.loads(e.value) for e in await consumer.poll_batch(10, timeout=0.1)]
+    producer.close()
+
+    assert [m["symbol"] for m in published] == ["AAPL", "MSFT"]
+    assert published[0]["conflated_ticks"] == [
+        ["2024-03-20T15:30:00", 100.0],
+        ["2024-03-20T15:30:01", 101.0],
+    ]
+    assert producer.conflator.conflated == 2
+
+
+def test_producer_conflator_chains_ticks():
+    """Test ticks accumulate across repeated replacement"""
+    conflator = ProducerConflator()
+    for i in range(3):
+        conflator.add(_event("AAPL", i, float(i)))
+
+    (message,) = conflator.drain()
+    assert [tick[1] for tick in message["conflated_ticks"]] == [0.0, 1.0]
+    assert conflator.drain() == []
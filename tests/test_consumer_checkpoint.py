@@ -0,0 +1,93 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from app.services import moving_average_consumer as consumer_module
+from app.services.consumer_checkpoint import load_checkpoint, save_checkpoint
+from app.services.kafka_service import KafkaService
+from app.services.moving_average_consumer import MovingAverageConsumer
+from app.services.tick_store import TickStore
+from app.services.transports.log_transport import LogTransport
+
+T0 = datetime(2024, 3, 20, 15, 30)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Test windows, completeness and positions survive a save/load cycle"""
+    store = TickStore(capacity=16)
+    store.load("AAPL", [(T0 + timedelta(seconds=i), 100.0 + i) for i in range(10)], complete_from=None)
+    store.add("MSFT", T0, 300.0)  # Live tick only: completeness unknown
+    path = str(tmp_path / "consumer.ckpt")
+
+    save_checkpoint(path, store, {0: 42, 3: 7}, max_ticks=5)
+    checkpoint = load_checkpoint(path, capacity=16)
+
+    assert checkpoint.positions == {0: 42, 3: 7}
+    restored = TickStore(capacity=16)
+    restored.restore(checkpoint.series)
+    assert restored.last("AAPL", 5) == store.last("AAPL", 5)
+    assert restored.last("AAPL", 6) is None  # Older ticks were not checkpointed
+    assert restored.series["MSFT"].complete_from is None
+    assert load_checkpoint(str(tmp_path / "missing.ckpt"), capacity=16) is None
+
+
+def test_truncated_checkpoint_is_ignored(tmp_path):
+    """Test a snapshot cut short anywhere after its header loads as None instead of raising"""
+    store = TickStore(capacity=16)
+    store.load("AAPL", [(T0 + timedelta(seconds=i), 100.0 + i) for i in range(10)], complete_from=None)
+    path = tmp_path / "consumer.ckpt"
+    save_checkpoint(str(path), store, {0: 42}, max_ticks=10)
+    data = path.read_bytes()
+
+    for size in (30, 40, len(data) - 80, len(data) - 3):
+        path.write_bytes(data[:size])
+        assert load_checkpoint(str(path), capacity=16) is None
+    path.write_bytes(b"XXXX" + data[4:])
+    assert load_checkpoint(str(path), capacity=16) is None
+
+
+def test_restart_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """Test a restarted consumer restores windows and skips already-processed events"""
+    log_dir, path = str(tmp_path / "log"), str(tmp_path / "consumer.ckpt")
+    producer = KafkaService(LogTransport(log_dir=log_dir, partitions=2))
+
+    async def run():
+        for i in range(4):
+            await producer.produce_price_event({"symbol": "AAPL", "price": 100.0 + i})
+
+        # First run processes two events, checkpoints, then dies without committing
+        store = TickStore(capacity=16)
+        monkeypatch.setattr(consumer_module, "get_tick_store", lambda: store)
+        first = MovingAverageConsumer(checkpoint_path=path)
+        first.kafka_service = KafkaService(LogTransport(log_dir=log_dir, partitions=2))
+        first.kafka_service.transport.subscribe("price-events")
+        for i in range(2):
+            event = await first.kafka_service.transport.poll(1.0)
+            store.load("AAPL", [(T0 + timedelta(seconds=i), json.loads(event.value)["price"])], complete_from=None)
+        first.save_checkpoint()
+
+        # Restart: windows come from the snapshot and consumption resumes after them
+        restarted_store = TickStore(capacity=16)
+        monkeypatch.setattr(consumer_module, "get_tick_store", lambda: restarted_store)
+        second = MovingAverageConsumer(checkpoint_path=path)
+        second.kafka_service = KafkaService(LogTransport(log_dir=log_dir, partitions=2))
+        positions = second.restore_checkpoint()
+
+        received = []
+
+        async def callback(message):
+            received.append(message["price"])
+            if len(received) == 2:
+                await asyncio.sleep(3600)
+
+        task = asyncio.create_task(second.kafka_service.consume_price_events(callback, positions))
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return restarted_store, received
+
+    restarted_store, received = asyncio.run(run())
+    assert [price for _, price in restarted_store.last("AAPL", 2)] == [100.0, 101.0]
+    assert received == [102.0, 103.0]
@@ -0,0 +1,39 @@
+import time
+import pytest
+from app.services.consumer_supervisor import ConsumerSupervisor
+from app.services.transports.base import symbol_shard
+
+
+def test_symbol_shard_is_stable():
+    """Test symbols always map to the same shard within range"""
+    for symbol in ["AAPL", "MSFT", "GOOGL", "TSLA"]:
+        shard = symbol_shard(symbol, 4)
+        assert 0 <= shard < 4
+        assert symbol_shard(symbol.lower(), 4) == shard
+
+
+def test_health_aggregates_worker_reports():
+    """Test supervisor sums counters and lag across workers"""
+    supervisor = ConsumerSupervisor(workers=2, report_interval=5)
+    now = time.time()
+    supervisor._reports = {
+        0: {"worker_id": 0, "processed": 10, "errors": 1, "lag": 3, "reported_at": now},
+        1: {"worker_id": 1, "processed": 5, "errors": 0, "lag": None, "reported_at": now},
+    }
+
+    health = supervisor.health()
+    assert health["processed"] == 15
+    assert health["errors"] == 1
+    assert health["lag"] == 3
+    # No processes were started, so nothing is alive
+    assert health["status"] == "degraded"
+
+
+def test_multiple_workers_require_kafka():
+    """Test supervisor refuses backends that cannot split partitions across processes"""
+    for backend in ["memory", "log"]:
+        with pytest.raises(ValueError):
+            ConsumerSupervisor(workers=2, backend=backend)
+
+    # A single worker is fine on any backend
+    assert ConsumerSupervisor(workers=1, backend="log").workers == 1
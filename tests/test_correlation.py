@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.services.correlation_service import CorrelationCache, CorrelationService, forward_fill
+from app.tools.backfill import BatchWriter, record_to_row
+
+T0 = datetime(2024, 5, 1, 9, 30)
+SYMBOLS = ["CORA", "CORB", "CORC"]
+
+
+def _prices(minute):
+    rng = np.random.default_rng(minute)
+    base = 100 + rng.normal(size=3).cumsum()
+    return {"CORA": base[0], "CORB": base[0] * 0.5 + base[1], "CORC": 50 + base[2]}
+
+
+def _seed(db, minutes):
+    rows = [
+        record_to_row(
+            {"symbol": symbol, "timestamp": T0 + timedelta(minutes=m, seconds=30), "price": price},
+            "test", "1d", False,
+        )
+        for m in minutes
+        for symbol, price in _prices(m).items()
+    ]
+    BatchWriter(db.get_bind()).write(rows)
+
+
+def test_forward_fill_carries_last_close_and_backfills_leading_gaps():
+    """Test bar gaps take the previous close and leading gaps the first close"""
+    prices = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0]])
+    assert forward_fill(prices).tolist() == [[2.0, 1.0], [2.0, 1.0], [2.0, 3.0]]
+    assert forward_fill(prices, seed=np.array([5.0, np.nan])).tolist() == [[5.0, 1.0], [2.0, 1.0], [2.0, 3.0]]
+
+
+def test_correlation_is_cached_per_bar_and_updated_incrementally(db):
+    """Test results match a full recompute after incremental bar updates"""
+    _seed(db, range(12))
+    cache = CorrelationCache()
+    service = CorrelationService(db, cache)
+
+    first = service.correlation(SYMBOLS, 8, "1m", include_returns=True, now=T0 + timedelta(minutes=10))
+    closes = np.array([[_prices(m)[s] for s in SYMBOLS] for m in range(1, 10)])
+    expected = np.corrcoef(np.diff(np.log(closes), axis=0), rowvar=False)
+    assert first["as_of"] == T0 + timedelta(minutes=9)
+    assert np.allclose(first["matrix"], expected)
+    assert cache.misses == 1
+
+    # Same closed bar: served from the cache
+    service.correlation(SYMBOLS, 8, "1m", now=T0 + timedelta(minutes=10, seconds=50))
+    assert cache.hits == 1
+
+    # Two more bars close: folded into the existing window
+    later = service.correlation(SYMBOLS, 8, "1m", include_returns=True, now=T0 + timedelta(minutes=12))
+    assert cache.updates == 1
+    fresh = CorrelationService(db, CorrelationCache()).correlation(
+        SYMBOLS, 8, "1m", include_returns=True, now=T0 + timedelta(minutes=12)
+    )
+    assert np.allclose(later["returns"], fresh["returns"])
+    assert np.allclose(later["matrix"], fresh["matrix"])
+
+
+def test_correlation_endpoint(client, db):
+    """Test the endpoint returns a symmetric matrix with None for unknown symbols"""
+    _seed(db, range(12))
+    response = client.get("/analytics/correlation?symbols=CORA,CORB,NOSUCH&window=5&bar=1m")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["symbols"] == ["CORA", "CORB", "NOSUCH"]
+    assert body["matrix"][2] == [None, None, None]
+    assert "returns" not in body
+
+    assert client.get("/analytics/correlation?symbols=CORA&bar=7m").status_code == 422
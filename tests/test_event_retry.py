@@ -0,0 +1,110 @@
+import asyncio
+import json
+import pytest
+from app.core.config import settings
+from app.services.kafka_service import KafkaService, retry_topic
+from app.services.transports.memory_transport import MemoryBus, MemoryTransport
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_RETRY_DELAYS", "0.05,0.1")
+
+
+async def _consume_until(service, callback, done, timeout=5):
+    """Run the consume loop until done() holds."""
+    task = asyncio.create_task(service.consume_price_events(callback))
+    try:
+        for _ in range(int(timeout / 0.01)):
+            if done():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("consumer did not finish in time")
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def _dead_letters(bus):
+    transport = MemoryTransport(bus)
+    transport.subscribe(settings.KAFKA_TOPIC_DEAD_LETTER)
+    events = []
+    while (event := await transport.poll(0)) is not None:
+        events.append(json.loads(event.value))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_poison_event_is_retried_then_dead_lettered_without_stalling():
+    """Test a failing event moves through the retry lanes while later events flow"""
+    bus = MemoryBus(partitions=1)
+    service = KafkaService(MemoryTransport(bus))
+    handled = []
+
+    async def callback(message):
+        handled.append(message["symbol"])
+        if message["symbol"] == "BAD":
+            raise ValueError("bad tick")
+
+    await service.produce_price_event({"symbol": "BAD", "price": 1.0})
+    await service.produce_price_event({"symbol": "GOOD", "price": 2.0})
+    await _consume_until(service, callback, lambda: service.stats["dead_lettered"] == 1)
+
+    # Same partition, yet GOOD did not wait for BAD's retries
+    assert handled == ["BAD", "GOOD", "BAD", "BAD"]
+    assert {k: service.stats[k] for k in ("failed", "retried", "dead_lettered")} == {
+        "failed": 3, "retried": 2, "dead_lettered": 1
+    }
+    [parked] = await _dead_letters(bus)
+    assert parked["symbol"] == "BAD" and "retry" not in parked
+    assert parked["dead_letter"]["reason"] == "ValueError: bad tick"
+    assert parked["dead_letter"]["attempts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_recovers_on_retry_and_transport_errors_are_survived():
+    """Test a flaky event succeeds on retry and a poll error does not end the loop"""
+    bus = MemoryBus(partitions=1)
+    service = KafkaService(MemoryTransport(bus))
+    poll = service.transport.poll
+    failures = iter([RuntimeError("broker down")])
+
+    async def flaky_poll(timeout):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return await poll(timeout)
+
+    service.transport.poll = flaky_poll
+    attempts = []
+
+    async def callback(message):
+        attempts.append(message.get("retry", {}).get("attempt", 0))
+        if len(attempts) == 1:
+            raise ConnectionError("database restarting")
+
+    await service.produce_price_event({"symbol": "FLAKY", "price": 1.0})
+    await _consume_until(service, callback, lambda: len(attempts) == 2)
+
+    assert attempts == [0, 1]
+    assert service.stats["transport_errors"] == 1
+    assert service.stats["dead_lettered"] == 0
+    assert bus.topic(retry_topic(1)).lag() == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_moves_dead_letters_back_to_the_main_topic():
+    """Test replayed events lose their failure metadata and are processed again"""
+    bus = MemoryBus(partitions=1)
+    service = KafkaService(MemoryTransport(bus))
+    await service.dead_letter({"symbol": "DLQ", "price": 3.0}, "ValueError: bad tick", attempts=2)
+    parked_raw = {"symbol": "RAW", "raw": "not json", "dead_letter": {"reason": "Undecodable message"}}
+    await service.transport.publish(settings.KAFKA_TOPIC_DEAD_LETTER, b"RAW", json.dumps(parked_raw).encode())
+
+    replayed = await service.replay_dead_letters(idle=0.05)
+    assert replayed == {"ValueError: bad tick": 1, "Undecodable message": 1}
+
+    main = MemoryTransport(bus)
+    main.subscribe(settings.KAFKA_TOPIC_PRICE_EVENTS)
+    values = sorted([(await main.poll(0.1)).value for _ in range(2)])
+    assert values == [b"not json", b'{"symbol": "DLQ", "price": 3.0}']
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from app.api.dependencies import get_health_prober
+from app.main import app
+from app.services.health_prober import HealthProber
+from tests.conftest import engine
+
+
+@pytest.fixture
+def prober():
+    prober = HealthProber(engine=engine, interval=0.05, timeout=0.5)
+    app.dependency_overrides[get_health_prober] = lambda: prober
+    yield prober
+    app.dependency_overrides.pop(get_health_prober, None)
+
+
+def test_not_ready_before_first_probe(client, prober):
+    """Test readiness fails until a probe round has completed"""
+    assert client.get("/health/ready").status_code == 503
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health").json()["status"] == "starting"
+
+
+def test_endpoints_serve_cached_snapshot(client, prober):
+    """Test health endpoints report the snapshot from the last probe round"""
+    asyncio.run(prober.probe_once())
+
+    assert client.get("/health/ready").status_code == 200
+    details = client.get("/health/details").json()
+    assert details["status"] == "healthy"
+    assert details["dependencies"]["database"]["latency_ms"] >= 0
+    assert client.get("/health").json()["database"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_failed_and_slow_dependencies_are_reported(prober):
+    """Test failing or hanging checks mark the snapshot without blocking it"""
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def fail():
+        raise ConnectionError("refused")
+
+    prober._checks = lambda: {"database": prober._check_database, "kafka": hang, "redis": fail}
+    snapshot = await prober.probe_once()
+
+    assert snapshot["status"] == "degraded"
+    assert snapshot["ready"] is True
+    assert snapshot["dependencies"]["kafka"]["status"] == "unhealthy"
+    assert snapshot["dependencies"]["redis"]["error"] == "refused"
+
+
+@pytest.mark.asyncio
+async def test_background_loop_refreshes_snapshot(prober):
+    """Test the background task keeps the snapshot fresh and stops cleanly"""
+    prober.start()
+    await asyncio.sleep(0.2)
+    first = prober.last_probe_at
+    await asyncio.sleep(0.1)
+
+    assert prober.last_probe_at > first
+    assert prober.is_live()
+    await prober.stop()
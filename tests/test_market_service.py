@@ -21,4 +21,62 @@ def test_calculate_moving_average():
     prices = [100, 101, 99]
     result = service.calculate_moving_average(prices, period=5)
     expected = sum(prices) / len(prices)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+
+def test_duplicate_quote_is_stored_and_published_once(db, monkeypatch):
+    """Test repeated fetches of the same quote write one row and one event"""
+    import asyncio
+    import uuid
+    from datetime import datetime
+    from unittest.mock import AsyncMock
+    from app.models.market_data import PricePoint, Symbol
+    from app.services import market_service as market_service_module
+
+    quote_time = datetime(2024, 3, 20, 15, 30)
+
+    class FixedProvider:
+        async def get_latest_price(self, symbol):
+            return {"symbol": symbol, "price": 123.45, "timestamp": quote_time, "raw_data": {}}
+
+    monkeypatch.setattr(market_service_module, "get_provider", lambda name: FixedProvider())
+    kafka_service = AsyncMock()
+    service = MarketService(db, kafka_service)
+    symbol = f"dedup{uuid.uuid4().hex[:5]}"  # The quote time is fixed, so reruns need a new symbol
+
+    for _ in range(3):
+        result = asyncio.run(service.get_latest_price(symbol, "fixed"))
+        assert result["price"] == 123.45
+
+    rows = db.query(PricePoint).join(Symbol).filter(Symbol.ticker == symbol.upper()).all()
+    assert len(rows) == 1
+    assert kafka_service.produce_price_event.await_count == 1
+    message = kafka_service.produce_price_event.await_args.args[0]
+    assert message["event_id"] == str(rows[0].id)
+
+
+def test_record_moving_average_is_idempotent_per_event(db):
+    """Test the same event cannot record a moving average twice"""
+    import uuid
+
+    service = MarketService(db, None)
+    event_id = uuid.uuid4()
+    assert service.record_moving_average("IDEMP", 5, 10.0, event_id=event_id) is True
+    assert service.record_moving_average("IDEMP", 5, 11.0, event_id=event_id) is False
+
+
+def test_symbol_registry_interns_names_once(db):
+    """Test tickers map to stable IDs and unknown names are only created on request"""
+    import uuid
+    from app.services.symbol_registry import SymbolRegistry
+
+    ticker = f"INT{uuid.uuid4().hex[:5].upper()}"
+    registry = SymbolRegistry()
+    assert registry.symbol_id(db, ticker, create=False) is None
+
+    first = registry.symbol_id(db, ticker)
+    assert registry.symbol_id(db, ticker) == first
+    # A fresh cache finds the committed row instead of creating another
+    assert SymbolRegistry().symbol_id(db, ticker, create=False) == first
+    assert registry.tickers(db, [first]) == {first: ticker}
+    assert registry.provider_id(db, "test") == SymbolRegistry().provider_id(db, "test")
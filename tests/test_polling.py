@@ -0,0 +1,111 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+import pytest
+from app.core.config import settings
+from app.services import market_service as market_service_module
+from app.services.providers.base import BaseProvider
+from app.services.polling_scheduler import PollingScheduler
+from app.services.polling_service import PollingService, assign_shards, last_slot
+from tests.conftest import TestingSessionLocal
+
+T0 = datetime(2024, 6, 3, 14, 0)
+
+
+def test_assign_shards_splits_evenly_within_size():
+    """Test symbols are split into the fewest shards of near-equal size"""
+    shards = assign_shards(list(range(120)), 50)
+    sizes = [list(shards.values()).count(s) for s in range(3)]
+    assert sizes == [40, 40, 40]
+    # Shard k of n runs k/n of the way into each interval
+    assert last_slot(1, 3, 60, T0 + timedelta(seconds=25)) == T0 + timedelta(seconds=20)
+    assert last_slot(2, 3, 60, T0 + timedelta(seconds=25)) == T0 - timedelta(seconds=20)
+
+
+def test_bulk_create_update_pause_and_status(client, monkeypatch):
+    """Test jobs with thousands of symbols are sharded and managed in bulk"""
+    monkeypatch.setattr(settings, "POLL_SHARD_SIZE", 500)
+    symbols = [f"P{i:04d}" for i in range(3000)]
+    response = client.post(
+        "/prices/poll/bulk",
+        json=[{"symbols": symbols, "interval": 60}, {"symbols": ["AAPL"], "interval": 30}],
+    )
+    assert response.status_code == 202
+    big, small = response.json()
+    assert big["config"]["shards"] == 6
+
+    status = client.get(f"/prices/poll/{big['job_id']}").json()
+    assert status["symbols"] == 3000
+    assert [s["offset_seconds"] for s in status["shards"]] == [0, 10, 20, 30, 40, 50]
+    assert {s["status"] for s in status["shards"]} == {"pending"}
+
+    response = client.patch(
+        "/prices/poll/bulk", json=[{"job_id": big["job_id"], "symbols": symbols[:900]}]
+    )
+    assert response.status_code == 200
+    assert [s["symbols"] for s in response.json()[0]["shards"]] == [450, 450]
+
+    response = client.post(
+        "/prices/poll/pause", json={"job_ids": [big["job_id"], small["job_id"]]}
+    )
+    assert [job["status"] for job in response.json()] == ["paused", "paused"]
+    assert response.json()[0]["shards"][0]["status"] == "paused"
+
+    # Unknown IDs fail the whole request
+    response = client.post("/prices/poll/resume", json={"job_ids": [big["job_id"], "poll_nope"]})
+    assert response.status_code == 404
+    assert client.get(f"/prices/poll/{big['job_id']}").json()["status"] == "paused"
+
+
+def test_jobs_without_symbols_are_rejected(client, db):
+    """Test all-blank symbol lists are refused before anything is written"""
+    response = client.post("/prices/poll/bulk", json=[{"symbols": ["AAPL"]}, {"symbols": [" ", ""]}])
+    assert response.status_code == 422
+    assert client.post("/prices/poll", json={"symbols": [" "]}).status_code == 422
+    with pytest.raises(ValueError):
+        PollingService(db).create_jobs([{"symbols": [""], "interval": 60, "provider": "yfinance"}])
+
+
+def test_scheduler_polls_each_shard_at_its_slot(db, monkeypatch):
+    """Test shards run staggered across the interval and record their progress"""
+    fetched = []
+    # Jobs left active by earlier runs are polled too, so this run's symbols are unique
+    tag = uuid.uuid4().hex[:4].upper()
+    a1, a2, b3, b4 = (f"SC{tag}{n}" for n in ("A1", "A2", "B3", "B4"))
+
+    class RecordingProvider(BaseProvider):
+        def get_provider_name(self):
+            return "rec"
+
+        async def get_latest_price(self, symbol):
+            fetched.append(symbol)
+            if symbol == b3:
+                raise RuntimeError("upstream error")
+            return {"symbol": symbol, "price": 10.0, "timestamp": datetime.utcnow(), "raw_data": {}}
+
+    monkeypatch.setattr(market_service_module, "get_provider", lambda name: RecordingProvider())
+    monkeypatch.setattr(settings, "POLL_SHARD_SIZE", 2)
+    job = PollingService(db).create_jobs(
+        [{"symbols": [a1, a2, b3, b4], "interval": 60, "provider": "rec"}]
+    )[0]
+
+    async def scenario():
+        scheduler = PollingScheduler(session_factory=TestingSessionLocal, kafka_service=AsyncMock())
+        # Other jobs created by earlier tests are paused or polled too; only count ours
+        assert scheduler.run_once(T0 + timedelta(seconds=5)) == 0  # First sight: wait for next slot
+        scheduler.run_once(T0 + timedelta(seconds=31))  # Shard 1 (offset 30s) is due
+        await asyncio.gather(*scheduler._running.values())
+        assert sorted(s for s in fetched if s.startswith(f"SC{tag}")) == [b3, b4]
+        scheduler.run_once(T0 + timedelta(seconds=61))  # Shard 0 is due
+        await asyncio.gather(*scheduler._running.values())
+        scheduler.run_once(T0 + timedelta(seconds=62))
+        assert not any(task.done() for task in scheduler._running.values())  # Finished runs are dropped
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert sorted(s for s in fetched if s.startswith(f"SC{tag}")) == [a1, a2, b3, b4]
+
+    status = PollingService(db).get_job_status(job["job_id"], now=T0 + timedelta(seconds=62))
+    assert [s["status"] for s in status["shards"]] == ["ok", "error"]
+    assert [s["errors"] for s in status["shards"]] == [0, 1]
@@ -0,0 +1,110 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+import pandas as pd
+from app.core.config import settings
+from app.models.market_data import PriceBar
+from app.services.market_service import MarketService
+from app.services.providers.base import BaseProvider
+from app.services.providers.yfinance_provider import YFinanceProvider
+from app.services.providers import yfinance_provider as yfinance_module
+from app.tools.backfill import BatchWriter, Checkpoint, backfill_symbols
+from unittest.mock import AsyncMock
+
+T0 = datetime(2024, 6, 3, 14, 30)
+
+
+class CountingProvider(BaseProvider):
+    """Local provider tracking how many requests are in flight."""
+
+    def __init__(self):
+        self.in_flight = self.peak = 0
+
+    def get_provider_name(self):
+        return "counting"
+
+    async def get_latest_price(self, symbol):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if symbol == "BAD":
+            raise ConnectionError("upstream error")
+        return self.format_response(symbol=symbol, price=1.0, raw_data={}, timestamp=T0)
+
+
+def _download_fixture(symbols, index):
+    """Frame shaped like yf.download(group_by="ticker"): (ticker, field) columns."""
+    fields = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+    columns = pd.MultiIndex.from_product([symbols, fields])
+    frame = pd.DataFrame(index=index, columns=columns, dtype=float)
+    for i, symbol in enumerate(symbols):
+        frame.loc[:, symbol] = [[100.0 + i + n, 101.0 + i + n, 99.0 + i + n, 100.5 + i + n, 100.5 + i + n, 1000.0]
+                                for n in range(len(index))]
+    return frame
+
+
+def test_default_batch_fans_out_with_bounded_concurrency(monkeypatch):
+    """Test the default batch fetch limits requests in flight and keeps per-symbol errors"""
+    monkeypatch.setattr(settings, "PROVIDER_BATCH_CONCURRENCY", 3)
+    provider = CountingProvider()
+    symbols = [f"FAN{i}" for i in range(10)] + ["BAD", "fan0"]
+
+    results = asyncio.run(provider.get_latest_prices(symbols))
+
+    assert list(results) == [f"FAN{i}" for i in range(10)] + ["BAD"]
+    assert provider.peak == 3
+    assert isinstance(results["BAD"], ConnectionError)
+    assert results["FAN3"]["price"] == 1.0
+
+
+def test_yfinance_batch_parses_one_download(monkeypatch):
+    """Test latest prices and histories come from one download frame, with fallback for gaps"""
+    index = pd.date_range("2024-06-03 10:30", periods=3, freq="1min", tz="America/New_York")
+    downloads = []
+
+    def fake_download(tickers, **kwargs):
+        downloads.append((list(tickers), kwargs))
+        frame = _download_fixture(["AAA", "BBB"], index)
+        frame.loc[index[-1], ("BBB", "Close")] = float("nan")  # BBB has no bar in the last minute
+        return frame
+
+    monkeypatch.setattr(yfinance_module.yf, "download", fake_download)
+    provider = YFinanceProvider()
+    fallback = AsyncMock(return_value={"symbol": "CCC", "price": 5.0})
+    monkeypatch.setattr(provider, "get_latest_price", fallback)
+
+    prices = asyncio.run(provider.get_latest_prices(["aaa", "BBB", "CCC"]))
+    assert len(downloads) == 1 and downloads[0][1]["threads"] == settings.PROVIDER_BATCH_CONCURRENCY
+    assert prices["AAA"]["price"] == 102.5
+    assert prices["AAA"]["timestamp"] == datetime(2024, 6, 3, 14, 32)
+    assert prices["BBB"]["price"] == 102.5 and prices["BBB"]["timestamp"] == datetime(2024, 6, 3, 14, 31)
+    assert prices["CCC"]["price"] == 5.0
+    fallback.assert_awaited_once_with("CCC")
+
+    histories = asyncio.run(provider.get_histories(["AAA", "BBB", "CCC"], T0, T0 + timedelta(minutes=3), "1m"))
+    assert [len(histories[s]) for s in ("AAA", "BBB", "CCC")] == [3, 2, 0]
+    assert histories["BBB"][0] == {
+        "symbol": "BBB", "timestamp": T0, "open": 101.0, "high": 102.0, "low": 100.0, "close": 101.5, "volume": 1000.0
+    }
+
+
+def test_batch_callers_store_quotes_and_backfill_groups(db, tmp_path, monkeypatch):
+    """Test MarketService and the backfill use one batch call per symbol group"""
+    monkeypatch.setattr(settings, "SYNTHETIC_LATENCY", 0.0)
+    monkeypatch.setattr(settings, "SYNTHETIC_ERROR_RATE", 0.0)
+    # Backfilled bars are never overwritten, so reruns need new symbols
+    tag = uuid.uuid4().hex[:5].upper()
+    a, b = f"BA{tag}", f"BB{tag}"
+    prices = asyncio.run(MarketService(db, AsyncMock()).get_latest_prices([a, b.lower()], "synthetic"))
+    assert list(prices) == [a, b]
+    assert prices[b]["provider"] == "synthetic"
+
+    start = datetime(2000, 3, 1)
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    writer = BatchWriter(db.get_bind(), as_bars=True)
+    args = ("synthetic", start, start + timedelta(hours=3), "1h", writer, checkpoint, True, 1000)
+    inserted = asyncio.run(backfill_symbols([a, b], *args, asyncio.Semaphore(1)))
+    assert inserted == 6
+    assert checkpoint.get(f"synthetic:{b}:1h:bars") == (start + timedelta(hours=3)).isoformat()
+    assert db.query(PriceBar).filter(PriceBar.symbol.in_([a, b])).count() == 6
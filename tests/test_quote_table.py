@@ -0,0 +1,72 @@
+import multiprocessing
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.services import quote_table as quote_table_module
+from app.services.quote_table import QuoteTable, fresh_quote
+
+T0 = datetime(2024, 6, 3, 14, 30)
+
+
+@pytest.fixture
+def table():
+    table = QuoteTable(f"mqt_test_{uuid.uuid4().hex[:8]}", capacity=4)
+    yield table
+    table.unlink()
+    table.close()
+
+
+def _write_sequence(name, count):
+    """Child process: price i always goes with timestamp T0 + i microseconds."""
+    table = QuoteTable(name)
+    for i in range(1, count + 1):
+        table.put("SHMA", "yfinance", float(i), T0 + timedelta(microseconds=i))
+    table.close()
+
+
+def test_put_keeps_newest_quote_and_bounded_slots(table):
+    """Test late quotes are ignored and a full table rejects new symbols"""
+    table.put("shma", "yfinance", 10.0, T0 + timedelta(seconds=1))
+    table.put("SHMA", "yfinance", 9.0, T0)  # Older quote arriving late
+    quote = table.get("SHMA")
+    assert (quote.symbol, quote.provider, quote.price, quote.timestamp) == (
+        "SHMA", "yfinance", 10.0, T0 + timedelta(seconds=1)
+    )
+    assert table.get("NOPE") is None
+
+    for symbol in ["SHMB", "SHMC", "SHMD"]:
+        assert table.put(symbol, "yfinance", 1.0, T0)
+    assert not table.put("SHME", "yfinance", 1.0, T0)
+    assert table.get("SHMD").price == 1.0
+
+
+def test_readers_in_other_processes_never_see_torn_records(table):
+    """Test lock-free reads stay consistent while another process writes"""
+    writer = multiprocessing.get_context("fork").Process(target=_write_sequence, args=(table.name, 20_000))
+    writer.start()
+    reader = QuoteTable(table.name)
+    seen = 0
+    while writer.is_alive() or seen == 0:
+        quote = reader.get("SHMA")
+        if quote is not None:
+            assert quote.timestamp == T0 + timedelta(microseconds=int(quote.price))
+            seen += 1
+    writer.join()
+    assert reader.get("SHMA").price == 20_000.0
+    reader.close()
+
+
+def test_latest_endpoint_serves_fresh_shared_quote(client, table, monkeypatch):
+    """Test /prices/latest answers from the table while the quote is fresh"""
+    monkeypatch.setattr(quote_table_module, "_quote_table", table)
+    table.put("SHMA", "alpha_vantage", 42.5, T0)
+
+    assert fresh_quote("SHMA", "yfinance") is None  # Another provider's quote
+    assert fresh_quote("SHMA", "smart").price == 42.5
+    assert fresh_quote("SHMA", "alpha_vantage", max_age=-1) is None  # Stale
+
+    response = client.get("/prices/latest?symbol=shma&provider=alpha_vantage")
+    assert response.status_code == 200
+    assert response.json() == {
+        "symbol": "SHMA", "price": 42.5, "timestamp": T0.isoformat(), "provider": "alpha_vantage"
+    }
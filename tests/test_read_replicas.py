@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine
+from app.main import app
+from app.models import database as database_module
+from app.models.database import Base, ReplicaRouter, get_read_db
+from app.models.market_data import LatestMovingAverage
+
+
+def _sqlite_engine(path, value):
+    """SQLite file holding one latest moving average with the given value."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine, tables=[LatestMovingAverage.__table__])
+    with engine.begin() as conn:
+        conn.execute(
+            LatestMovingAverage.__table__.insert().values(symbol="RPLA", period=5, average_value=value)
+        )
+    return engine
+
+
+@pytest.fixture
+def router(tmp_path):
+    lags = {}
+    primary = _sqlite_engine(tmp_path / "primary.db", 1.0)
+    replica = _sqlite_engine(tmp_path / "replica.db", 2.0)
+    router = ReplicaRouter(
+        primary, [replica], max_lag=5.0, check_interval=0.0, lag_probe=lambda e: lags[e]
+    )
+    router.lags = lags
+    lags[replica] = 0.5
+    return router
+
+
+def test_reads_go_to_fresh_replica_and_fall_back_when_stale(router):
+    """Test the staleness bound decides between replica and primary"""
+    replica = router.replicas[0]
+    assert router.read_engine() is replica
+
+    router.lags[replica] = 30.0
+    assert router.read_engine() is router.primary
+
+    # A replica whose lag cannot be measured is treated as stale
+    del router.lags[replica]
+    assert router.read_engine() is router.primary
+
+
+def test_lag_is_measured_at_most_once_per_interval(router):
+    """Test routing reuses a recent lag measurement"""
+    calls = []
+    router.check_interval = 60.0
+    router.lag_probe = lambda engine: calls.append(engine) or 0.0
+    for _ in range(5):
+        router.read_engine()
+    assert len(calls) == 1
+
+
+def test_get_read_db_routes_endpoint_reads(client, router, monkeypatch):
+    """Test a read endpoint is served by the replica, then the primary when lag grows"""
+    monkeypatch.setattr(database_module, "_replica_router", router)
+    monkeypatch.delitem(app.dependency_overrides, get_read_db)
+
+    url = "/prices/moving-average?symbol=RPLA&period=5"
+    assert client.get(url).json()["average_value"] == 2.0
+
+    router.lags[router.replicas[0]] = 30.0
+    assert client.get(url).json()["average_value"] == 1.0
@@ -0,0 +1,119 @@
+from datetime import datetime
+import pytest
+from app.api.dependencies import get_kafka_service
+from app.core.config import settings
+from app.main import app
+from app.services import admission
+from app.services import providers as providers_module
+from app.services.providers.base import BaseProvider
+from app.services.response_cache import ResponseCache, encode_quote, etag_matches, get_response_cache
+from unittest.mock import AsyncMock
+
+T0 = datetime(2024, 6, 3, 14, 30, 0, 250000)
+
+
+class CountingProvider(BaseProvider):
+    """Local provider returning a fixed quote and counting calls."""
+
+    calls = 0
+
+    def get_provider_name(self):
+        return "counting"
+
+    async def get_latest_price(self, symbol):
+        CountingProvider.calls += 1
+        return self.format_response(symbol=symbol, price=42.5, raw_data={}, timestamp=T0)
+
+
+@pytest.fixture
+def counting_provider(monkeypatch):
+    monkeypatch.setitem(providers_module.PROVIDERS, "counting", CountingProvider)
+    monkeypatch.setattr(admission, "_limiters", {})
+    monkeypatch.setattr(CountingProvider, "calls", 0)
+    app.dependency_overrides[get_kafka_service] = lambda: AsyncMock()
+    get_response_cache().clear()
+    yield
+    get_response_cache().clear()
+    providers_module._provider_classes.pop("counting", None)
+    app.dependency_overrides.pop(get_kafka_service, None)
+
+
+def test_conditional_get_skips_provider_while_cached(client, counting_provider, monkeypatch):
+    """Test cached quotes are revalidated with 304 and served without a provider call"""
+    monkeypatch.setattr(settings, "HTTP_CACHE_MAX_AGES", "counting=60")
+
+    first = client.get("/prices/latest?symbol=etag&provider=counting")
+    assert first.status_code == 200
+    assert first.json() == {"symbol": "ETAG", "price": 42.5, "timestamp": T0.isoformat(), "provider": "counting"}
+    assert first.headers["Last-Modified"] == "Mon, 03 Jun 2024 14:30:00 GMT"
+    assert first.headers["Cache-Control"] in ("max-age=60", "max-age=59")
+    etag = first.headers["ETag"]
+
+    revalidated = client.get("/prices/latest?symbol=ETAG&provider=counting", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    again = client.get("/prices/latest?symbol=ETAG&provider=counting")
+    assert again.content == first.content
+    assert CountingProvider.calls == 1
+
+
+def test_uncached_provider_still_answers_304(client, counting_provider, monkeypatch):
+    """Test a zero max-age fetches every time but saves the body on a matching ETag"""
+    monkeypatch.setattr(settings, "HTTP_CACHE_MAX_AGES", "")
+    monkeypatch.setattr(settings, "HTTP_CACHE_MAX_AGE", 0)
+
+    first = client.get("/prices/latest?symbol=ETAG&provider=counting")
+    assert first.headers["Cache-Control"] == "max-age=0"
+    second = client.get(
+        "/prices/latest?symbol=ETAG&provider=counting", headers={"If-None-Match": f'W/{first.headers["ETag"]}'}
+    )
+    assert second.status_code == 304
+    assert CountingProvider.calls == 2
+
+
+def test_moving_average_etag_changes_with_new_value(client, db):
+    """Test moving averages revalidate against the stored row"""
+    from app.services.market_service import MarketService
+
+    MarketService(db, None).record_moving_average("ETAGMA", period=3, value=10.0)
+    first = client.get("/prices/moving-average?symbol=ETAGMA&period=3")
+    etag = first.headers["ETag"]
+    assert client.get(
+        "/prices/moving-average?symbol=ETAGMA&period=3", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+    MarketService(db, None).record_moving_average("ETAGMA", period=3, value=11.0)
+    changed = client.get("/prices/moving-average?symbol=ETAGMA&period=3", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["average_value"] == 11.0
+    assert changed.headers["ETag"] != etag
+
+
+def test_response_cache_evicts_least_recently_used(monkeypatch):
+    """Test entries expire, the LRU entry is evicted and If-None-Match parsing"""
+    monkeypatch.setattr(settings, "HTTP_CACHE_MAX_AGES", "fast=60,never=0")
+    cache = ResponseCache(max_entries=2)
+    for symbol in ["A", "B"]:
+        cache.put(symbol, "fast", encode_quote(symbol, 1.0, T0, "fast"))
+    cache.put("N", "never", encode_quote("N", 1.0, T0, "never"))
+    assert cache.get("N", "never") is None  # Not cacheable
+
+    assert cache.get("a", "fast") is not None
+    cache.put("C", "fast", encode_quote("C", 1.0, T0, "fast"))
+    assert cache.get("B", "fast") is None
+    assert cache.get("A", "fast") is not None
+
+    etag = cache.get("A", "fast").etag
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_corrected_quote_gets_a_new_etag():
+    """Test a revised price at the same timestamp does not revalidate against the old ETag"""
+    first = encode_quote("ETAG", 42.5, T0, "counting")
+    assert encode_quote("etag", 42.5, T0, "counting").etag == first.etag
+    assert encode_quote("ETAG", 42.75, T0, "counting").etag != first.etag
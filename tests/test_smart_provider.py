@@ -0,0 +1,94 @@
+import asyncio
+import time
+import pytest
+from app.services.providers.base import BaseProvider
+from app.services.providers.smart_provider import ProviderStats, SmartProvider
+
+
+class ScriptedProvider(BaseProvider):
+    """Local fake provider answering with scripted latencies/failures."""
+
+    def __init__(self, name, latencies, fail=False):
+        self.name = name
+        self.latencies = list(latencies)
+        self.fail = fail
+        self.calls = 0
+
+    def get_provider_name(self):
+        return self.name
+
+    async def get_latest_price(self, symbol):
+        latency = self.latencies[min(self.calls, len(self.latencies) - 1)]
+        self.calls += 1
+        await asyncio.sleep(latency)
+        if self.fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        return self.format_response(symbol=symbol, price=100.0, raw_data={})
+
+
+def _router(failure_threshold=3, **providers):
+    stats = {
+        name: ProviderStats(window=20, failure_threshold=failure_threshold, reset_timeout=0.2)
+        for name in providers
+    }
+    return SmartProvider(providers=providers, stats=stats)
+
+
+@pytest.mark.asyncio
+async def test_routes_to_fastest_provider():
+    """Test requests settle on the provider with the lowest latency"""
+    router = _router(slow=ScriptedProvider("slow", [0.05]), fast=ScriptedProvider("fast", [0.001]))
+
+    results = [await router.get_latest_price("AAPL") for _ in range(5)]
+
+    assert results[-1]["provider"] == "fast"
+    assert router.rank_providers()[0] == "fast"
+
+
+@pytest.mark.asyncio
+async def test_hedges_when_primary_exceeds_p95():
+    """Test a slow primary is hedged to the secondary after its p95 latency"""
+    primary = ScriptedProvider("primary", [0.01] * 10 + [2.0])
+    secondary = ScriptedProvider("secondary", [0.05])
+    router = _router(primary=primary, secondary=secondary)
+    router.stats["secondary"].record_success(0.05)
+    for _ in range(10):
+        await router.get_latest_price("AAPL")
+
+    started = time.monotonic()
+    result = await router.get_latest_price("AAPL")
+    elapsed = time.monotonic() - started
+
+    assert result["provider"] == "secondary"
+    assert elapsed < 0.5  # Did not wait for the 2s primary
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_trips_circuit_breaker():
+    """Test failing providers are failed over, then skipped once the breaker opens"""
+    broken = ScriptedProvider("broken", [0.0], fail=True)
+    backup = ScriptedProvider("backup", [0.01])
+    router = _router(failure_threshold=1, broken=broken, backup=backup)
+
+    assert (await router.get_latest_price("AAPL"))["provider"] == "backup"
+    assert router.stats["broken"].state == "open"
+
+    calls = broken.calls
+    await router.get_latest_price("AAPL")
+    assert broken.calls == calls  # Skipped while open
+
+    # After the reset timeout a single half-open trial is allowed
+    await asyncio.sleep(0.25)
+    broken.fail = False
+    broken.latencies = [0.0]
+    await router.get_latest_price("AAPL")
+    assert router.stats["broken"].state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_raises_when_all_providers_fail():
+    """Test an error is raised when no provider can answer"""
+    router = _router(a=ScriptedProvider("a", [0.0], fail=True), b=ScriptedProvider("b", [0.0], fail=True))
+
+    with pytest.raises(RuntimeError):
+        await router.get_latest_price("AAPL")
@@ -0,0 +1,81 @@
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import httpx
+
+# Budgets can be relaxed on slow CI runners via environment variables
+IMPORT_TIME_THRESHOLD_MS = float(os.getenv("IMPORT_TIME_THRESHOLD_MS", "2000"))
+COLD_START_THRESHOLD_MS = float(os.getenv("COLD_START_THRESHOLD_MS", "5000"))
+
+HEAVY_MODULES = ["yfinance", "pandas", "numpy", "confluent_kafka"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_import_does_not_load_heavy_modules():
+    """Test importing app.main leaves provider SDKs and Kafka client unloaded"""
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_under_threshold():
+    """Test `python -X importtime` cumulative time for app.main stays in budget"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like: "import time:  self [us] | cumulative | name"
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| app\.main$", result.stderr, re.M)
+    assert match, "app.main not found in importtime output"
+
+    cumulative_ms = int(match.group(1)) / 1000
+    assert cumulative_ms < IMPORT_TIME_THRESHOLD_MS, f"import took {cumulative_ms:.0f}ms"
+
+
+def test_cold_start_time_to_first_200():
+    """Test a fresh uvicorn process answers /health within budget"""
+    port = _free_port()
+    env = dict(os.environ)
+    if os.getenv("TEST_DATABASE_URL"):
+        env["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + COLD_START_THRESHOLD_MS / 1000
+        status = None
+        while time.perf_counter() < deadline:
+            try:
+                status = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code
+                if status == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert status == 200, f"no 200 from /health within {COLD_START_THRESHOLD_MS:.0f}ms"
+    assert elapsed_ms < COLD_START_THRESHOLD_MS
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from app.services.providers import get_provider
+from app.services.providers.synthetic_provider import SyntheticProvider
+
+T0 = datetime(2024, 1, 2, 9, 30)
+
+
+def test_paths_are_identical_across_processes():
+    """Test a fresh interpreter with another hash seed generates the same ticks"""
+    code = (
+        "from datetime import datetime;"
+        "from app.services.providers.synthetic_provider import SyntheticProvider;"
+        "print(SyntheticProvider(seed=7).price_at('AAPL', datetime(2024, 1, 2, 9, 30, 5)))"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": "12345"}
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == str(SyntheticProvider(seed=7).price_at("AAPL", T0 + timedelta(seconds=5)))
+    assert SyntheticProvider(seed=8).price_at("AAPL", T0) != SyntheticProvider(seed=7).price_at("AAPL", T0)
+
+
+def test_batch_ticks_match_single_ticks_and_bars():
+    """Test vectorized ticks agree with price_at and aggregate into consistent bars"""
+    provider = SyntheticProvider(seed=1, tick_rate=2.0)
+    timestamps, prices = provider.ticks("MSFT", T0, T0 + timedelta(hours=2))
+    assert len(prices) == 2 * 7200
+    assert np.all(np.diff(timestamps) == 500_000)
+    when = datetime(1970, 1, 1) + timedelta(microseconds=int(timestamps[9000]))
+    assert provider.price_at("MSFT", when + timedelta(milliseconds=100)) == (when, round(prices[9000], 4))
+
+    bars = asyncio.run(provider.get_history("MSFT", T0, T0 + timedelta(hours=2), "1h"))
+    assert [bar["timestamp"] for bar in bars] == [T0.replace(minute=0) + timedelta(hours=h) for h in (0, 1, 2)]
+    first = prices[: 2 * 1800]
+    assert (bars[0]["open"], bars[0]["high"], bars[0]["low"], bars[0]["close"], bars[0]["volume"]) == (
+        first[0], first.max(), first.min(), first[-1], 3600.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_registered_provider_injects_errors():
+    """Test the registry serves the provider and injected errors surface as ConnectionError"""
+    quote = await get_provider("synthetic").get_latest_price("aapl")
+    assert quote["symbol"] == "AAPL" and quote["provider"] == "synthetic" and quote["price"] > 0
+
+    with pytest.raises(ConnectionError):
+        await SyntheticProvider(error_rate=1.0).get_latest_price("AAPL")
+
+
+def test_ticks_stay_on_the_clock_when_the_rate_does_not_divide_a_day():
+    """Test a tick rate of 1/7 Hz keeps price_at and ticks() on the day they were asked for"""
+    provider = SyntheticProvider(seed=3, tick_rate=1 / 7)
+    noon = datetime(2026, 10, 19, 12, 0)
+    when, _ = provider.price_at("AAPL", noon)
+    assert noon - timedelta(seconds=7) < when <= noon
+
+    timestamps, prices = provider.ticks("AAPL", noon, noon + timedelta(minutes=1))
+    stamps = [datetime(1970, 1, 1) + timedelta(microseconds=int(t)) for t in timestamps]
+    assert len(stamps) in (8, 9) and noon <= stamps[0] and stamps[-1] < noon + timedelta(minutes=1)
+    assert all(provider.price_at("AAPL", s) == (s, round(p, 4)) for s, p in zip(stamps, prices))
+
+    # The day's last tick is 6 s before midnight; the next one starts the new day
+    midnight = datetime(2026, 10, 20)
+    assert provider.price_at("AAPL", midnight - timedelta(seconds=1))[0] == midnight - timedelta(seconds=6)
+    timestamps, _ = provider.ticks("AAPL", midnight - timedelta(seconds=10), midnight + timedelta(seconds=10))
+    assert [t - timestamps[0] for t in timestamps] == [0, 6_000_000, 13_000_000]
@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.models.market_data import PricePoint
+from app.services.symbol_registry import get_symbol_registry
+from app.services import market_service as market_service_module
+from app.services.market_service import MarketService
+from app.services.tick_store import TickStore
+
+T0 = datetime(2024, 3, 20, 15, 30)
+
+
+def _ticks(count, start=0):
+    return [(T0 + timedelta(seconds=i), 100.0 + i) for i in range(start, start + count)]
+
+
+def test_out_of_order_ticks_stay_sorted():
+    """Test late ticks are inserted in timestamp order and duplicates skipped"""
+    store = TickStore(capacity=100)
+    store.load("AAPL", [], complete_from=None)
+    for ts, price in [_ticks(3)[2], _ticks(3)[0], _ticks(3)[1], _ticks(3)[1]]:
+        store.add("AAPL", ts, price)
+
+    assert store.last("AAPL", 5) == _ticks(3)
+    assert store.range("AAPL", T0 + timedelta(seconds=1), T0 + timedelta(seconds=2)) == _ticks(2, start=1)
+
+
+def test_capacity_bounds_memory_and_coverage():
+    """Test compaction keeps the newest ticks and stops answering beyond them"""
+    store = TickStore(capacity=8)
+    store.load("AAPL", [], complete_from=None)
+    for ts, price in _ticks(100):
+        store.add("AAPL", ts, price)
+
+    assert len(store.series["AAPL"]) <= 10
+    assert store.last("AAPL", 8) == _ticks(8, start=92)
+    assert store.last("AAPL", 20) is None  # Older ticks were dropped
+    assert store.range("AAPL", T0, T0 + timedelta(seconds=99)) is None
+
+
+def test_live_ticks_alone_do_not_answer_queries():
+    """Test the store only answers once it knows nothing older is missing"""
+    store = TickStore(capacity=8)
+    store.add("AAPL", T0, 100.0)
+
+    assert store.last("AAPL", 1) is None
+    assert store.last("MSFT", 1) is None
+
+
+def test_recent_prices_fall_back_to_db_then_serve_from_memory(db, monkeypatch):
+    """Test a store miss reads price_points once and seeds the store"""
+    store = TickStore(capacity=16)
+    monkeypatch.setattr(market_service_module, "get_tick_store", lambda: store)
+    registry = get_symbol_registry()
+    symbol_id = registry.symbol_id(db, "TICK")
+    provider_id = registry.provider_id(db, "test")
+    for ts, price in _ticks(6):
+        db.add(PricePoint(symbol_id=symbol_id, price=price, timestamp=ts, provider_id=provider_id))
+    db.commit()
+    service = MarketService(db, None)
+
+    assert service.get_recent_prices("TICK", 5) == _ticks(5, start=1)
+
+    db.query(PricePoint).filter(PricePoint.symbol_id == symbol_id).delete()
+    db.commit()
+    assert service.get_recent_prices("TICK", 5) == _ticks(5, start=1)  # From memory
+    store.add("TICK", *_ticks(1, start=6)[0])
+    assert service.get_recent_prices("TICK", 5) == _ticks(5, start=2)
+
+
+def test_rows_written_without_events_show_up_after_the_ttl(db, monkeypatch):
+    """Test a backfill behind the store's back is read once its completeness claim expires"""
+    store = TickStore(capacity=16)
+    monkeypatch.setattr(market_service_module, "get_tick_store", lambda: store)
+    monkeypatch.setattr(settings, "TICK_STORE_VERIFY_TTL", 0.05)
+    registry = get_symbol_registry()
+    symbol_id = registry.symbol_id(db, "TICKBF")
+    provider_id = registry.provider_id(db, "test")
+
+    def write(ticks):
+        for ts, price in ticks:
+            db.add(PricePoint(symbol_id=symbol_id, price=price, timestamp=ts, provider_id=provider_id))
+        db.commit()
+
+    write(_ticks(3, start=3))
+    service = MarketService(db, None)
+    assert service.get_recent_prices("TICKBF", 5) == _ticks(3, start=3)  # Whole history, now cached
+    write(_ticks(3))  # Older ticks backfilled without events
+    time.sleep(0.06)
+    assert service.get_recent_prices("TICKBF", 5) == _ticks(5, start=1)
+    assert service.get_price_range("TICKBF", T0 + timedelta(seconds=1)) == _ticks(5, start=1)
+
+    db.query(PricePoint).filter(PricePoint.symbol_id == symbol_id).delete()
+    db.commit()
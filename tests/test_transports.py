@@ -0,0 +1,127 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.services.kafka_service import KafkaService
+from app.services.transports.kafka_transport import KafkaTransport
+from app.services.transports.log_transport import LogTransport
+from app.services.transports.memory_transport import MemoryBus, MemoryTransport
+
+
+async def _consume(service, count):
+    """Run the consume loop until count messages have been handled."""
+    received = []
+    done = asyncio.Event()
+
+    async def callback(message):
+        received.append(message)
+        if len(received) == count:
+            done.set()
+            await asyncio.sleep(3600)  # Hold the loop so nothing more is consumed
+
+    task = asyncio.create_task(service.consume_price_events(callback))
+    await asyncio.wait_for(done.wait(), timeout=5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return received
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_delivers_in_order_per_symbol():
+    """Test producer-to-consumer delivery through the in-memory bus"""
+    bus = MemoryBus(partitions=4)
+    producer = KafkaService(MemoryTransport(bus))
+    consumer = KafkaService(MemoryTransport(bus))
+
+    consuming = asyncio.create_task(_consume(consumer, 6))
+    await asyncio.sleep(0.01)  # Consumer is waiting before anything is published
+    for i in range(3):
+        for symbol in ("AAPL", "MSFT"):
+            await producer.produce_price_event({"symbol": symbol, "price": float(i)})
+    received = await consuming
+
+    for symbol in ("AAPL", "MSFT"):
+        assert [m["price"] for m in received if m["symbol"] == symbol] == [0.0, 1.0, 2.0]
+    assert consumer.get_consumer_lag() == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_drops_beyond_retention():
+    """Test a slow consumer skips messages evicted by the retention cap"""
+    bus = MemoryBus(partitions=1, retention=2)
+    transport = MemoryTransport(bus)
+    transport.subscribe("t")
+    for i in range(5):
+        await transport.publish("t", b"AAPL", str(i).encode())
+
+    event = await transport.poll(0.01)
+    assert (event.value, event.offset) == (b"3", 3)
+
+
+@pytest.mark.asyncio
+async def test_log_backend_survives_restart(tmp_path):
+    """Test the log backend redelivers nothing consumed and loses nothing published"""
+    producer = KafkaService(LogTransport(log_dir=str(tmp_path), partitions=2))
+    for i in range(4):
+        await producer.produce_price_event({"symbol": "AAPL", "price": float(i)})
+
+    # First run consumes two events then shuts down (committing offsets)
+    first = await _consume(KafkaService(LogTransport(log_dir=str(tmp_path), partitions=2)), 2)
+    await producer.produce_price_event({"symbol": "AAPL", "price": 4.0})
+
+    restarted = KafkaService(LogTransport(log_dir=str(tmp_path), partitions=2))
+    second = await _consume(restarted, 3)
+
+    assert [m["price"] for m in first + second] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    producer.close()
+
+
+class BlockingConsumer:
+    """Stands in for a confluent_kafka Consumer on an idle topic: poll blocks."""
+
+    def subscribe(self, topics, on_assign=None):
+        pass
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, 0.2))
+        return None
+
+    def close(self):
+        pass
+
+
+class BlockingKafkaTransport(KafkaTransport):
+    """KafkaTransport whose consumers block like real ones, recording their groups."""
+
+    groups = []
+
+    def get_consumer(self):
+        if not self.consumer:
+            self.consumer = BlockingConsumer()
+            BlockingKafkaTransport.groups.append(self.consumer_config["group.id"])
+        return self.consumer
+
+
+@pytest.mark.asyncio
+async def test_blocking_kafka_polls_leave_the_event_loop_free(monkeypatch):
+    """Test retry lanes run beside a blocking poll, each in its own consumer group"""
+    monkeypatch.setattr(settings, "EVENT_RETRY_DELAYS", "0.05,0.1")
+    monkeypatch.setattr(BlockingKafkaTransport, "groups", [])
+    service = KafkaService(BlockingKafkaTransport())
+
+    async def callback(message):
+        pass
+
+    task = asyncio.create_task(service.consume_price_events(callback))
+    start = time.monotonic()
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert elapsed < 0.15  # Three consumers each blocking 0.2s per poll would stall this
+    assert sorted(BlockingKafkaTransport.groups) == [
+        "market-data-consumers", "market-data-consumers.retry.1", "market-data-consumers.retry.2"
+    ]
+    assert service.transport.sibling("dlq-replay").consumer_config["group.id"] == "market-data-consumers.dlq-replay"